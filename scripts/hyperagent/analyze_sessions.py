@@ -2,19 +2,59 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import heapq
 import json
 import os
 import re
+import sqlite3
+import struct
 import sys
-from collections import Counter, defaultdict
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is always available
+    orjson = None
+
+HYPERAGENT_DIR = Path(__file__).resolve().parent
+if str(HYPERAGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(HYPERAGENT_DIR))
+
+from report_io import MINHASH_PERMUTATIONS, iter_store_partition  # noqa: E402
 
 
 SCHEMA_VERSION = "1"
+CACHE_VERSION = "6"
 DEFAULT_MIN_TURNS = 3
+DEFAULT_CACHE_PATH = "~/.claude/hyperagent/analyze-cache.json"
+DEFAULT_STORE_PATH = "~/.claude/hyperagent/signals"
+DEFAULT_INDEX_PATH = "~/.claude/hyperagent/session-index.sqlite"
+DEFAULT_HEADER_INDEX_PATH = "~/.claude/hyperagent/codex-headers.json"
+UNDATED_PARTITION = "undated"
+# Session id -> partition of its row, kept at the store root so a moved session leaves no stale row.
+STORE_SESSION_INDEX = "session-partitions.json"
+PREFILTER_PEEK_LINES = 20
+DEFAULT_REORDER_WINDOW = 256
+# Was 1 (only the previous turn) before the windowed engine; --repeat-window 1 restores that.
+DEFAULT_REPEAT_WINDOW = 5
+# Turns every session state remembers; --repeat-window picks any size up to it when counting.
+MAX_REPEAT_WINDOW = 20
+SIMILARITY_THRESHOLD = 0.6
+SIGNIFICANT_TOKEN = re.compile(r"[A-Za-z0-9가-힣_/-]{2,}")
+SIGNIFICANT_STOPWORDS = frozenset({"the", "and", "that", "this", "with", "그리고", "근데", "다시", "해주세요", "해줘"})
+MINHASH_PRIME = (1 << 61) - 1
+INSTRUCTION_MIN_TOKENS = 3
+MAX_SESSION_INSTRUCTIONS = 64
+INSTRUCTION_SNIPPET_CHARS = 120
+JSON_BACKENDS = ("auto", "json", "orjson")
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
 KNOWN_AGENTS = {
@@ -128,10 +168,19 @@ ROLLBACK_PATTERNS = [
 ]
 
 FILE_PATH_PATTERNS = [
-    re.compile(r"\b(?:[\w.-]+/)+[\w.-]+\.[A-Za-z0-9]+\b"),
-    re.compile(r"\b/[^\s:'\"`]+/[^\s:'\"`]+\b"),
+    re.compile(r"(?<![\w./-])(?:[\w.-]+/)+[\w.-]+\.[A-Za-z0-9]+\b"),
+    re.compile(r"(?<![\w.:/-])/[^\s:'\"`]+/[^\s:'\"`]+\b"),
 ]
 
+# Tool-call inputs: values under these keys are paths as-is, values under the
+# body keys are file contents and never scanned for paths.
+PATH_INPUT_KEYS = {"file_path", "path", "notebook_path"}
+BODY_INPUT_KEYS = {"content", "new_string", "old_string", "edits", "new_source"}
+PATCH_FILE_HEADER = re.compile(r"^\*\*\* (?:Add File|Update File|Delete File|Move to): (.+?)\s*$", re.MULTILINE)
+CALL_TEXT_SCAN_BUDGET = 4096
+# Tool outputs are classified in full but only scanned this far for file paths.
+RESULT_TEXT_SCAN_BUDGET = 4096
+
 TOOL_NAME_ALIASES = {
     "Bash": "Bash",
     "Edit": "Edit",
@@ -192,9 +241,17 @@ class ToolCall:
 
 @dataclass
 class ToolResult:
+    """Outcome of a tool call, classified when the row is parsed.
+
+    The output body itself is dropped; errors keep the first matching
+    ``TOOL_ERROR_PATTERNS`` entry, and the file paths named in the first
+    ``RESULT_TEXT_SCAN_BUDGET`` characters are kept for ``files_touched``.
+    """
+
     tool_use_id: str
-    content: str
     is_error: bool
+    error_pattern: str | None = None
+    paths: frozenset[str] = frozenset()
 
 
 @dataclass
@@ -231,6 +288,94 @@ class SessionAnalysis:
     files_touched: set[str]
     branch_switches: int
     complexity: dict[str, Any]
+    instruction_counts: Counter[str] = field(default_factory=Counter)
+    instruction_texts: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class InstructionWindow:
+    """The last few direct user turns as token sets, with an inverted index.
+
+    Each turn is tokenized once. A new turn is only compared with the window
+    entries it shares a token with, found through ``postings``, so the cost
+    follows the postings touched rather than window size times message length.
+    """
+
+    entries: dict[int, frozenset[str]] = field(default_factory=dict)
+    next_seq: int = 0
+    postings: dict[str, set[int]] = field(default_factory=dict, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for seq, tokens in self.entries.items():
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(seq)
+
+    def observe(self, tokens: frozenset[str], size: int = MAX_REPEAT_WINDOW) -> int:
+        """Append a turn; return how many turns back its nearest near-repeat in the window is, or 0."""
+        seq = self.next_seq
+        self.next_seq += 1
+        overlaps: dict[int, int] = {}
+        for token in tokens:
+            holders = self.postings.get(token)
+            if holders is None:
+                self.postings[token] = {seq}
+                continue
+            for other in holders:
+                overlaps[other] = overlaps.get(other, 0) + 1
+            holders.add(seq)
+        nearest = max(
+            (
+                other
+                for other, count in overlaps.items()
+                if count / max(len(self.entries[other]), len(tokens)) >= SIMILARITY_THRESHOLD
+            ),
+            default=None,
+        )
+        self.entries[seq] = tokens
+        while len(self.entries) > size:
+            oldest = next(iter(self.entries))
+            for token in self.entries.pop(oldest):
+                holders = self.postings[token]
+                holders.discard(oldest)
+                if not holders:
+                    del self.postings[token]
+        return seq - nearest if nearest is not None else 0
+
+
+@dataclass
+class SessionState:
+    """Running signal counters for one session file.
+
+    Folding messages into a state is order-dependent but resumable: a state
+    restored from the analysis cache can keep folding rows appended later.
+    """
+
+    message_count: int = 0
+    session_id: str = ""
+    first_ts: datetime | None = None
+    last_ts: datetime | None = None
+    turn_count: int = 0
+    user_corrections: int = 0
+    # Repeated turns by distance to the earlier turn they repeat; 0 for rollback requests.
+    repeat_distances: Counter[int] = field(default_factory=Counter)
+    positive_feedback: int = 0
+    tool_count: int = 0
+    branch_switches: int = 0
+    recent_instructions: InstructionWindow = field(default_factory=InstructionWindow)
+    previous_branch: str | None = None
+    tool_failures: Counter[str] = field(default_factory=Counter)
+    tool_failure_patterns: Counter[tuple[str, str]] = field(default_factory=Counter)
+    skill_invocations: Counter[str] = field(default_factory=Counter)
+    agent_dispatches: Counter[str] = field(default_factory=Counter)
+    unique_tools: set[str] = field(default_factory=set)
+    files_touched: set[str] = field(default_factory=set)
+    tool_name_by_id: dict[str, str] = field(default_factory=dict)
+    instruction_counts: Counter[str] = field(default_factory=Counter)
+    instruction_texts: dict[str, str] = field(default_factory=dict)
+
+    def repeated_instructions(self, window: int) -> int:
+        """Repeated turns counted with a ``window`` of earlier turns; rollback requests always count."""
+        return sum(count for distance, count in self.repeat_distances.items() if distance <= window)
 
 
 def warn(message: str) -> None:
@@ -314,7 +459,8 @@ def extract_text_from_content(content: Any) -> str:
                 chunks.append(item)
             elif isinstance(item, dict):
                 item_type = item.get("type")
-                if item_type in {"text", "tool_result"}:
+                # tool_result bodies are classified by parse_tool_results and never kept as message text.
+                if item_type == "text":
                     chunks.append(extract_text_from_content(item.get("text") or item.get("content")))
         return "\n".join(chunk for chunk in chunks if chunk)
     if isinstance(content, dict):
@@ -361,17 +507,27 @@ def parse_tool_results(content: Any) -> list[ToolResult]:
         if not isinstance(item, dict) or item.get("type") != "tool_result":
             continue
         text = extract_text_from_content(item.get("content"))
-        is_error = bool(item.get("is_error")) or matches_any(TOOL_ERROR_PATTERNS, text)
-        results.append(
-            ToolResult(
-                tool_use_id=str(item.get("tool_use_id") or ""),
-                content=text,
-                is_error=is_error,
-            )
-        )
+        pattern = TOOL_ERROR_MATCHER.search(text)
+        is_error = bool(item.get("is_error")) or pattern is not None
+        paths = frozenset(extract_file_paths(text[:RESULT_TEXT_SCAN_BUDGET]))
+        results.append(compact_tool_result(str(item.get("tool_use_id") or ""), is_error, pattern, paths))
     return results
 
 
+def compact_tool_result(
+    tool_use_id: str,
+    is_error: bool,
+    pattern: str | None,
+    paths: frozenset[str] = frozenset(),
+) -> ToolResult:
+    return ToolResult(
+        tool_use_id=tool_use_id,
+        is_error=is_error,
+        error_pattern=(pattern or "is_error") if is_error else None,
+        paths=paths,
+    )
+
+
 def normalize_message(raw: dict[str, Any]) -> StructuredMessage:
     message = raw.get("message")
     content: Any = raw.get("content")
@@ -398,27 +554,135 @@ def normalize_message(raw: dict[str, Any]) -> StructuredMessage:
     )
 
 
-def parse_jsonl(path: Path) -> tuple[list[StructuredMessage], int]:
-    messages: list[StructuredMessage] = []
-    skipped_rows = 0
-    with path.open("r", encoding="utf-8") as handle:
-        for line_number, line in enumerate(handle, 1):
+# ---------------------------------------------------------------------------
+# JSON row decoding
+# ---------------------------------------------------------------------------
+
+
+def _decode_row_stdlib(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _decode_row_orjson(data: bytes) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than json (NaN, >64-bit ints, lone surrogates);
+        # let the stdlib decide so both backends accept and reject the same rows.
+        return json.loads(data)
+
+
+def resolve_json_backend(name: str) -> str:
+    if name == "auto":
+        return "orjson" if orjson is not None else "json"
+    if name == "orjson" and orjson is None:
+        raise SystemExit("--json-backend orjson requested but the orjson package is not installed")
+    if name not in JSON_BACKENDS:
+        raise SystemExit(f"unknown JSON backend: {name}")
+    return name
+
+
+decode_row: Callable[[bytes], Any] = _decode_row_stdlib
+json_backend = "json"
+
+
+def set_json_backend(name: str) -> str:
+    """Select the decoder used for transcript rows; returns the resolved backend name."""
+    global decode_row, json_backend
+    json_backend = resolve_json_backend(name)
+    decode_row = _decode_row_orjson if json_backend == "orjson" else _decode_row_stdlib
+    return json_backend
+
+
+set_json_backend("auto")
+
+
+class JsonlCursor:
+    """Iterate JSONL lines from a byte offset and remember where reading stopped.
+
+    ``offset`` only advances past newline-terminated lines. A trailing row
+    without a newline is still yielded, but leaves ``offset`` short of the file
+    size so callers know the file cannot be resumed from that point.
+    """
+
+    def __init__(self, path: Path, offset: int = 0) -> None:
+        self.path = path
+        self.start = offset
+        self.offset = offset
+        self.lines = 0
+
+    def __iter__(self) -> Iterator[tuple[int, bytes]]:
+        with self.path.open("rb") as handle:
+            handle.seek(self.start)
+            for line_number, line in enumerate(handle, 1):
+                if line.endswith(b"\n"):
+                    self.offset += len(line)
+                self.lines = line_number
+                yield line_number, line
+
+    def location(self, line_number: int) -> str:
+        if self.start == 0:
+            return f"{self.path}:{line_number}"
+        return f"{self.path}:+{line_number} (from byte {self.start})"
+
+
+EARLIEST_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def message_sort_key(message: StructuredMessage) -> datetime:
+    return message.timestamp or EARLIEST_TIMESTAMP
+
+
+class ClaudeMessageReader:
+    """Yield normalized messages of a Claude JSONL file in file order."""
+
+    def __init__(self, path: Path, cursor: JsonlCursor | None = None) -> None:
+        self.rows = cursor or JsonlCursor(path)
+        self.skipped_rows = 0
+
+    @property
+    def meta(self) -> CodexMeta | None:
+        return None
+
+    def __iter__(self) -> Iterator[StructuredMessage]:
+        rows = self.rows
+        for line_number, line in rows:
             stripped = line.strip()
             if not stripped:
                 continue
             try:
-                raw = json.loads(stripped)
-            except json.JSONDecodeError as exc:
-                skipped_rows += 1
-                warn(f"{path}:{line_number}: skipped unparsable JSONL row: {exc}")
+                raw = decode_row(stripped)
+            except ValueError as exc:
+                self.skipped_rows += 1
+                warn(f"{rows.location(line_number)}: skipped unparsable JSONL row: {exc}")
                 continue
             if not isinstance(raw, dict):
-                skipped_rows += 1
-                warn(f"{path}:{line_number}: skipped non-object JSONL row")
+                self.skipped_rows += 1
+                warn(f"{rows.location(line_number)}: skipped non-object JSONL row")
                 continue
-            messages.append(normalize_message(raw))
-    messages.sort(key=lambda msg: msg.timestamp or datetime.min.replace(tzinfo=timezone.utc))
-    return messages, skipped_rows
+            yield normalize_message(raw)
+
+
+def parse_jsonl(path: Path, cursor: JsonlCursor | None = None) -> tuple[list[StructuredMessage], int]:
+    reader = ClaudeMessageReader(path, cursor)
+    messages = sorted(reader, key=message_sort_key)
+    return messages, reader.skipped_rows
+
+
+def reorder_by_timestamp(messages: Iterable[StructuredMessage], window: int) -> Iterator[StructuredMessage]:
+    """Re-sequence a nearly ordered stream through a bounded min-heap.
+
+    Holds at most ``window`` messages. The output equals a stable full sort as
+    long as no message arrives more than ``window`` rows after one it should
+    precede; beyond that the late row is folded in arrival order.
+    """
+    heap: list[tuple[datetime, int, StructuredMessage]] = []
+    for sequence, message in enumerate(messages):
+        heapq.heappush(heap, (message_sort_key(message), sequence, message))
+        if len(heap) > window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
 
 
 # ---------------------------------------------------------------------------
@@ -475,10 +739,8 @@ def _codex_tool_name(raw_name: str) -> str:
     return TOOL_NAME_ALIASES.get(raw_name, raw_name)
 
 
-def _codex_check_output_error(output: str) -> bool:
-    """Check if a Codex tool output indicates an error."""
-    if matches_any(TOOL_ERROR_PATTERNS, output):
-        return True
+def _codex_exit_code_failed(output: str) -> bool:
+    """Check if a Codex tool output reports a non-zero exit code."""
     try:
         parsed = json.loads(output)
         if isinstance(parsed, dict):
@@ -576,7 +838,8 @@ def normalize_codex_message(
     if payload_type in ("function_call_output", "custom_tool_call_output"):
         call_id = str(payload.get("call_id") or "")
         output = str(payload.get("output") or "")
-        is_error = _codex_check_output_error(output)
+        pattern = TOOL_ERROR_MATCHER.search(output)
+        is_error = pattern is not None or _codex_exit_code_failed(output)
 
         return StructuredMessage(
             uuid=f"codex-result-{call_id or id(raw)}",
@@ -585,13 +848,7 @@ def normalize_codex_message(
             session_id=session_id,
             msg_type="user",
             content_text="",
-            tool_results=[
-                ToolResult(
-                    tool_use_id=call_id,
-                    content=output,
-                    is_error=is_error,
-                )
-            ],
+            tool_results=[compact_tool_result(call_id, is_error, pattern)],
             is_meta=True,
             cwd=session_cwd,
         )
@@ -600,64 +857,200 @@ def normalize_codex_message(
     return None
 
 
-def parse_codex_jsonl(path: Path) -> tuple[list[StructuredMessage], int, CodexMeta]:
-    messages: list[StructuredMessage] = []
-    skipped_rows = 0
-    session_id = path.stem
-    session_cwd: str | None = None
-    agent_role: str | None = None
-    is_subagent = False
+CODEX_ROW_HEAD = re.compile(
+    rb'^\{\s*"timestamp"\s*:\s*"[^"\\]*"\s*,\s*"type"\s*:\s*"(\w+)"(?:\s*,\s*"payload"\s*:\s*\{\s*"type"\s*:\s*"(\w+)")?'
+)
+CODEX_DECODED_ROW_TYPES = {b"session_meta", b"response_item"}
+CODEX_DECODED_PAYLOAD_TYPES = {
+    b"message",
+    b"function_call",
+    b"custom_tool_call",
+    b"function_call_output",
+    b"custom_tool_call_output",
+}
+
+
+def codex_row_is_ignorable(line: bytes, header_known: bool = False) -> bool:
+    """Byte-level check for rollout rows that normalization would drop anyway.
+
+    Only rows in the writer's ``{"timestamp":..,"type":..,"payload":{"type":..``
+    layout are judged; anything else is decoded as usual. Requiring the closing
+    brace keeps truncated rows on the decode path, where they count as skipped.
+    With ``header_known`` the session already has a cwd, so ``session_meta``
+    rows cannot change anything either.
+    """
+    head = CODEX_ROW_HEAD.match(line)
+    if head is None or not line.endswith(b"}"):
+        return False
+    row_type, payload_type = head.group(1), head.group(2)
+    if row_type == b"session_meta":
+        return header_known
+    if row_type not in CODEX_DECODED_ROW_TYPES:
+        return True
+    return row_type == b"response_item" and payload_type is not None and payload_type not in CODEX_DECODED_PAYLOAD_TYPES
+
+
+def codex_meta_from_header(payload: dict[str, Any], default_session_id: str) -> CodexMeta:
+    source = payload.get("source")
+    return CodexMeta(
+        session_id=str(payload.get("id") or default_session_id),
+        cwd=payload.get("cwd") if isinstance(payload.get("cwd"), str) else None,
+        agent_role=payload.get("agent_role") if isinstance(payload.get("agent_role"), str) else None,
+        is_subagent=isinstance(source, dict) and "subagent" in source,
+    )
+
+
+def read_codex_header(path: Path) -> CodexMeta | None:
+    """The ``session_meta`` header on a rollout's first row, if it has one."""
+    try:
+        with path.open("rb") as handle:
+            for line in handle:
+                stripped = line.strip()
+                if not stripped:
+                    continue
+                raw = decode_row(stripped)
+                if not isinstance(raw, dict) or raw.get("type") != "session_meta":
+                    return None
+                payload = raw.get("payload")
+                return codex_meta_from_header(payload, path.stem) if isinstance(payload, dict) else None
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+class CodexMessageReader:
+    """Yield normalized messages of a Codex rollout in file order.
+
+    ``session_meta`` rows update the header as they stream past, so messages
+    after the header pick up its session id and cwd just like a full parse.
+    Rows that ``codex_row_is_ignorable`` recognises (event_msg, turn_context,
+    reasoning, ...) are skipped before decoding when ``prescreen`` is on.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        cursor: JsonlCursor | None = None,
+        meta: CodexMeta | None = None,
+        prescreen: bool = True,
+    ) -> None:
+        self.rows = cursor or JsonlCursor(path)
+        self.prescreen = prescreen
+        self.header_known = meta is not None and bool(meta.cwd)
+        self.skipped_rows = 0
+        self.session_id = meta.session_id if meta else path.stem
+        self.session_cwd: str | None = meta.cwd if meta else None
+        self.agent_role: str | None = meta.agent_role if meta else None
+        self.is_subagent = meta.is_subagent if meta else False
+
+    @property
+    def meta(self) -> CodexMeta:
+        return CodexMeta(
+            session_id=self.session_id,
+            cwd=self.session_cwd,
+            agent_role=self.agent_role,
+            is_subagent=self.is_subagent,
+        )
 
-    with path.open("r", encoding="utf-8") as handle:
-        for line_number, line in enumerate(handle, 1):
+    def __iter__(self) -> Iterator[StructuredMessage]:
+        for _, line in self.rows:
             stripped = line.strip()
-            if not stripped:
+            if not stripped or (self.prescreen and codex_row_is_ignorable(stripped, self.header_known)):
                 continue
             try:
-                raw = json.loads(stripped)
-            except json.JSONDecodeError:
-                skipped_rows += 1
+                raw = decode_row(stripped)
+            except ValueError:
+                self.skipped_rows += 1
                 continue
             if not isinstance(raw, dict):
-                skipped_rows += 1
+                self.skipped_rows += 1
                 continue
 
             entry_type = raw.get("type")
 
             if entry_type == "session_meta":
                 payload = raw.get("payload")
-                if isinstance(payload, dict):
-                    if not session_cwd:
-                        session_id = str(payload.get("id") or session_id)
-                        session_cwd = payload.get("cwd") if isinstance(payload.get("cwd"), str) else None
-                        agent_role = payload.get("agent_role") if isinstance(payload.get("agent_role"), str) else None
-                        source = payload.get("source")
-                        is_subagent = isinstance(source, dict) and "subagent" in source
+                if isinstance(payload, dict) and not self.session_cwd:
+                    header = codex_meta_from_header(payload, self.session_id)
+                    self.session_id = header.session_id
+                    self.session_cwd = header.cwd
+                    self.agent_role = header.agent_role
+                    self.is_subagent = header.is_subagent
                 continue
 
-            msg = normalize_codex_message(raw, session_id, session_cwd)
+            msg = normalize_codex_message(raw, self.session_id, self.session_cwd)
             if msg is not None:
-                messages.append(msg)
+                yield msg
+
+
+class SignalMatcher:
+    """A signal pattern list compiled once into a single alternation.
+
+    ``matches`` is one scan of the combined regex. ``search`` returns exactly
+    what a pattern-by-pattern ``re.search`` loop would: the first pattern in
+    list order that matches anywhere. The combined scan settles the common
+    no-match case; on a hit, the named-group alternation is anchored at the
+    leftmost match to name the pattern that fired there, and only patterns
+    listed before it are re-checked, since they may still match further right.
+
+    Named groups make sre save marks on every attempt, so the unanchored scan
+    deliberately uses the non-capturing form. Past ``LONG_TEXT`` characters
+    the per-pattern scans win again (each can use its own literal-prefix
+    search), so long tool outputs take the plain loop.
+    """
+
+    LONG_TEXT = 256
+
+    _GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.patterns = list(patterns)
+        self.compiled = [re.compile(pattern) for pattern in self.patterns]
+        scoped = [self._scoped(pattern) for pattern in self.patterns]
+        self.combined = re.compile("|".join(f"(?:{pattern})" for pattern in scoped)) if scoped else None
+        self.labeled = re.compile("|".join(f"(?P<p{index}>{pattern})" for index, pattern in enumerate(scoped))) if scoped else None
+
+    @classmethod
+    def _scoped(cls, pattern: str) -> str:
+        # Leading global flags such as (?i) are only legal at the start of the
+        # whole expression, so they become scoped groups inside the alternation.
+        match = cls._GLOBAL_FLAGS.match(pattern)
+        if not match:
+            return pattern
+        return f"(?{match.group(1)}:{pattern[match.end():]})"
 
-    messages.sort(key=lambda m: m.timestamp or datetime.min.replace(tzinfo=timezone.utc))
-    meta = CodexMeta(
-        session_id=session_id,
-        cwd=session_cwd,
-        agent_role=agent_role,
-        is_subagent=is_subagent,
-    )
-    return messages, skipped_rows, meta
+    def matches(self, text: str) -> bool:
+        if len(text) > self.LONG_TEXT:
+            return any(pattern.search(text) for pattern in self.compiled)
+        return self.combined is not None and self.combined.search(text) is not None
 
+    def search(self, text: str) -> str | None:
+        if len(text) > self.LONG_TEXT:
+            return next((raw for raw, pattern in zip(self.patterns, self.compiled) if pattern.search(text)), None)
+        if self.combined is None or self.labeled is None:
+            return None
+        match = self.combined.search(text)
+        if match is None:
+            return None
+        labeled = self.labeled.match(text, match.start())
+        fired = int(labeled.lastgroup[1:]) if labeled and labeled.lastgroup else len(self.patterns)
+        for index in range(min(fired, len(self.patterns))):
+            if self.compiled[index].search(text):
+                return self.patterns[index]
+        return self.patterns[fired] if fired < len(self.patterns) else None
 
-def matches_any(patterns: list[str], text: str) -> bool:
-    return matched_pattern(patterns, text) is not None
 
+@lru_cache(maxsize=None)
+def signal_matcher(patterns: tuple[str, ...]) -> SignalMatcher:
+    return SignalMatcher(list(patterns))
 
-def matched_pattern(patterns: list[str], text: str) -> str | None:
-    for pattern in patterns:
-        if re.search(pattern, text):
-            return pattern
-    return None
+
+NEGATION_MATCHER = signal_matcher(tuple(NEGATION_EXEMPTIONS))
+CORRECTION_MATCHER = signal_matcher(tuple(CORRECTION_PATTERNS))
+REJECTION_MATCHER = signal_matcher(tuple(REJECTION_PATTERNS))
+PRAISE_MATCHER = signal_matcher(tuple(PRAISE_PATTERNS))
+ROLLBACK_MATCHER = signal_matcher(tuple(ROLLBACK_PATTERNS))
+TOOL_ERROR_MATCHER = signal_matcher(tuple(TOOL_ERROR_PATTERNS))
 
 
 def detect_skill_invocations(message: StructuredMessage) -> list[str]:
@@ -700,31 +1093,108 @@ def extract_file_paths(text: str) -> set[str]:
     return paths
 
 
+def extract_call_paths(input_data: dict[str, Any], budget: int = CALL_TEXT_SCAN_BUDGET) -> set[str]:
+    """Paths named by a tool call's input, walked in place instead of re-serialized.
+
+    Known path keys are taken verbatim and apply_patch bodies contribute only
+    their file headers. Remaining string values are scanned with
+    ``FILE_PATH_PATTERNS`` until ``budget`` characters have been read.
+    """
+    paths: set[str] = set()
+    remaining = budget
+    pending: deque[Any] = deque([input_data])
+    while pending:
+        node = pending.popleft()
+        items = node.items() if isinstance(node, dict) else ((None, value) for value in node)
+        for key, value in items:
+            if key in BODY_INPUT_KEYS:
+                continue
+            if isinstance(value, (dict, list)):
+                pending.append(value)
+                continue
+            if not isinstance(value, str):
+                continue
+            if key in PATH_INPUT_KEYS:
+                candidate = value.strip()
+                if candidate and candidate not in {".", ".."}:
+                    paths.add(candidate)
+            elif "*** Begin Patch" in value:
+                paths.update(match.group(1) for match in PATCH_FILE_HEADER.finditer(value))
+            elif remaining > 0:
+                chunk = value[:remaining]
+                remaining -= len(chunk)
+                paths.update(extract_file_paths(chunk))
+    return paths
+
+
 def is_similar_instruction(previous: str, current: str) -> bool:
     prev_tokens = significant_tokens(previous)
     current_tokens = significant_tokens(current)
     if not prev_tokens or not current_tokens:
         return False
     overlap = len(prev_tokens & current_tokens)
-    return overlap / max(len(prev_tokens), len(current_tokens)) >= 0.6
+    return overlap / max(len(prev_tokens), len(current_tokens)) >= SIMILARITY_THRESHOLD
 
 
-def significant_tokens(text: str) -> set[str]:
-    lowered = text.lower()
-    tokens = re.findall(r"[A-Za-z0-9가-힣_/-]{2,}", lowered)
-    stopwords = {"the", "and", "that", "this", "with", "그리고", "근데", "다시", "해주세요", "해줘"}
-    return {token for token in tokens if token not in stopwords}
+def significant_tokens(text: str) -> frozenset[str]:
+    return frozenset(SIGNIFICANT_TOKEN.findall(text.lower())) - SIGNIFICANT_STOPWORDS
 
 
-def tool_name_for_result(tool_result: ToolResult, tool_call_by_id: dict[str, ToolCall]) -> str:
-    call = tool_call_by_id.get(tool_result.tool_use_id)
-    if not call:
+MINHASH_STRUCT = struct.Struct(f">{MINHASH_PERMUTATIONS}I")
+MINHASH_COEFFICIENTS = tuple(
+    (
+        int.from_bytes(digest[:8], "big") % (MINHASH_PRIME - 1) + 1,
+        int.from_bytes(digest[8:16], "big") % MINHASH_PRIME,
+    )
+    for digest in (hashlib.sha256(f"hyperagent-minhash-{index}".encode()).digest() for index in range(MINHASH_PERMUTATIONS))
+)
+
+
+@lru_cache(maxsize=65536)
+def _token_minhash_row(token: str) -> tuple[int, ...]:
+    value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+    return tuple((a * value + b) % MINHASH_PRIME & 0xFFFFFFFF for a, b in MINHASH_COEFFICIENTS)
+
+
+def instruction_signature(tokens: frozenset[str]) -> str:
+    """MinHash of an instruction's significant tokens as fixed-width hex.
+
+    Signatures are stable across runs and processes, so score.py can bucket
+    instructions from many sessions by LSH bands without comparing texts.
+    """
+    rows = [_token_minhash_row(token) for token in tokens]
+    return MINHASH_STRUCT.pack(*map(min, zip(*rows))).hex()
+
+
+repeat_window = DEFAULT_REPEAT_WINDOW
+
+
+def set_repeat_window(size: int) -> int:
+    """Set how many earlier user turns a new turn is checked against for repeats."""
+    global repeat_window
+    repeat_window = size
+    return repeat_window
+
+
+# Work done by this process since the last reset: files_parsed, files_resumed,
+# files_unchanged, rows_parsed and bytes_parsed. Pool workers ship theirs back per job.
+parse_counters: Counter[str] = Counter()
+
+
+def _init_worker(backend: str, window: int) -> None:
+    set_json_backend(backend)
+    set_repeat_window(window)
+
+
+def tool_name_for_result(tool_result: ToolResult, tool_name_by_id: dict[str, str]) -> str:
+    tool_name = tool_name_by_id.get(tool_result.tool_use_id)
+    if not tool_name:
         return "unknown"
-    return TOOL_NAME_ALIASES.get(call.tool_name, call.tool_name)
+    return TOOL_NAME_ALIASES.get(tool_name, tool_name)
 
 
 def error_pattern_for_result(tool_result: ToolResult) -> str:
-    return matched_pattern(TOOL_ERROR_PATTERNS, tool_result.content) or "is_error"
+    return tool_result.error_pattern or "is_error"
 
 
 def compute_complexity(
@@ -767,112 +1237,133 @@ def compute_complexity(
     }
 
 
-def analyze_session(
-    path: Path,
-    messages: list[StructuredMessage],
-    project_override: str | None = None,
-) -> SessionAnalysis | None:
-    if not messages:
-        return None
-
-    session_id = next((msg.session_id for msg in messages if msg.session_id), path.stem)
-    timestamped = [msg.timestamp for msg in messages if msg.timestamp is not None]
-    first_ts = min(timestamped) if timestamped else None
-    last_ts = max(timestamped) if timestamped else None
-    duration = int((last_ts - first_ts).total_seconds()) if first_ts and last_ts else 0
-
-    user_messages = [msg for msg in messages if msg.msg_type == "user" and not msg.is_meta]
-    direct_user_messages = [msg for msg in user_messages if msg.content_text and not msg.tool_results]
-    turn_count = len(direct_user_messages)
+def is_direct_user_message(message: StructuredMessage) -> bool:
+    """A typed user turn: not meta, has text, and is not a tool_result carrier."""
+    return message.msg_type == "user" and not message.is_meta and bool(message.content_text) and not message.tool_results
 
-    skill_invocations: Counter[str] = Counter()
-    agent_dispatches: Counter[str] = Counter()
-    tool_failures: Counter[str] = Counter()
-    tool_failure_patterns: Counter[tuple[str, str]] = Counter()
-    unique_tools: set[str] = set()
-    files_touched: set[str] = set()
-    tool_call_by_id: dict[str, ToolCall] = {}
-
-    user_corrections = 0
-    repeated_instructions = 0
-    positive_feedback = 0
-    previous_user_text = ""
-    previous_branch: str | None = None
-    branch_switches = 0
 
+def fold_messages(state: SessionState, messages: Iterable[StructuredMessage]) -> SessionState:
+    """Fold timestamp-ordered messages into ``state`` and return it."""
     for message in messages:
-        if message.git_branch and previous_branch and message.git_branch != previous_branch:
-            branch_switches += 1
+        state.message_count += 1
+        if not state.session_id and message.session_id:
+            state.session_id = message.session_id
+        if message.timestamp is not None:
+            if state.first_ts is None or message.timestamp < state.first_ts:
+                state.first_ts = message.timestamp
+            if state.last_ts is None or message.timestamp > state.last_ts:
+                state.last_ts = message.timestamp
+
+        if message.git_branch and state.previous_branch and message.git_branch != state.previous_branch:
+            state.branch_switches += 1
         if message.git_branch:
-            previous_branch = message.git_branch
+            state.previous_branch = message.git_branch
 
         for call in message.tool_calls:
-            unique_tools.add(TOOL_NAME_ALIASES.get(call.tool_name, call.tool_name))
+            state.tool_count += 1
+            state.unique_tools.add(TOOL_NAME_ALIASES.get(call.tool_name, call.tool_name))
             if call.tool_id:
-                tool_call_by_id[call.tool_id] = call
-            files_touched.update(extract_file_paths(json.dumps(call.input_data, ensure_ascii=False)))
+                state.tool_name_by_id[call.tool_id] = call.tool_name
+            state.files_touched.update(extract_call_paths(call.input_data))
 
         if message.content_text:
-            files_touched.update(extract_file_paths(message.content_text))
+            state.files_touched.update(extract_file_paths(message.content_text))
 
         for skill in detect_skill_invocations(message):
-            skill_invocations[skill] += 1
+            state.skill_invocations[skill] += 1
         for agent in detect_agent_dispatches(message):
-            agent_dispatches[agent] += 1
+            state.agent_dispatches[agent] += 1
 
         for result in message.tool_results:
+            state.files_touched.update(result.paths)
             if not result.is_error:
                 continue
-            tool_name = tool_name_for_result(result, tool_call_by_id)
+            tool_name = tool_name_for_result(result, state.tool_name_by_id)
             pattern = error_pattern_for_result(result)
-            tool_failures[tool_name] += 1
-            tool_failure_patterns[(tool_name, pattern)] += 1
+            state.tool_failures[tool_name] += 1
+            state.tool_failure_patterns[(tool_name, pattern)] += 1
 
-        if message not in direct_user_messages:
+        if not is_direct_user_message(message):
             continue
+        state.turn_count += 1
         text = message.content_text
-        if not matches_any(NEGATION_EXEMPTIONS, text):
-            if matches_any(CORRECTION_PATTERNS, text) or matches_any(REJECTION_PATTERNS, text):
-                user_corrections += 1
-        if matches_any(PRAISE_PATTERNS, text):
-            positive_feedback += 1
-        if previous_user_text and (
-            is_similar_instruction(previous_user_text, text) or matches_any(ROLLBACK_PATTERNS, text)
-        ):
-            repeated_instructions += 1
-        previous_user_text = text
+        if not NEGATION_MATCHER.matches(text):
+            if CORRECTION_MATCHER.matches(text) or REJECTION_MATCHER.matches(text):
+                state.user_corrections += 1
+        praised = PRAISE_MATCHER.matches(text)
+        if praised:
+            state.positive_feedback += 1
+        tokens = significant_tokens(text)
+        window = state.recent_instructions
+        had_previous = bool(window.entries)
+        distance = window.observe(tokens)
+        if had_previous and ROLLBACK_MATCHER.matches(text):
+            state.repeat_distances[0] += 1
+        elif distance:
+            state.repeat_distances[distance] += 1
+        if not praised and len(tokens) >= INSTRUCTION_MIN_TOKENS:
+            signature = instruction_signature(tokens)
+            if signature in state.instruction_counts or len(state.instruction_counts) < MAX_SESSION_INSTRUCTIONS:
+                state.instruction_counts[signature] += 1
+                state.instruction_texts.setdefault(signature, text[:INSTRUCTION_SNIPPET_CHARS])
+    return state
+
+
+def finalize_session(
+    state: SessionState,
+    path: Path,
+    project_override: str | None = None,
+) -> SessionAnalysis | None:
+    if state.message_count == 0:
+        return None
 
-    entity_count = len(skill_invocations) + len(agent_dispatches)
+    session_id = state.session_id or path.stem
+    first_ts = state.first_ts
+    last_ts = state.last_ts
+    duration = int((last_ts - first_ts).total_seconds()) if first_ts and last_ts else 0
+    entity_count = len(state.skill_invocations) + len(state.agent_dispatches)
     complexity = compute_complexity(
         session_id=session_id,
-        turn_count=turn_count,
-        unique_tools=unique_tools,
+        turn_count=state.turn_count,
+        unique_tools=state.unique_tools,
         entity_count=entity_count,
-        files_touched=files_touched,
-        branch_switches=branch_switches,
+        files_touched=state.files_touched,
+        branch_switches=state.branch_switches,
     )
 
     return SessionAnalysis(
         session_id=session_id,
         project=project_override or path.parent.name,
         timestamp=first_ts,
-        turn_count=turn_count,
+        turn_count=state.turn_count,
         session_duration_seconds=duration,
-        user_corrections=user_corrections,
-        repeated_instructions=repeated_instructions,
-        tool_failures=tool_failures,
-        tool_failure_patterns=tool_failure_patterns,
-        positive_feedback=positive_feedback,
-        skill_invocations=skill_invocations,
-        agent_dispatches=agent_dispatches,
-        tool_count=sum(1 for msg in messages for _ in msg.tool_calls),
-        unique_tools=unique_tools,
-        files_touched=files_touched,
-        branch_switches=branch_switches,
+        user_corrections=state.user_corrections,
+        repeated_instructions=state.repeated_instructions(repeat_window),
+        tool_failures=Counter(state.tool_failures),
+        tool_failure_patterns=Counter(state.tool_failure_patterns),
+        positive_feedback=state.positive_feedback,
+        skill_invocations=Counter(state.skill_invocations),
+        agent_dispatches=Counter(state.agent_dispatches),
+        tool_count=state.tool_count,
+        unique_tools=set(state.unique_tools),
+        files_touched=set(state.files_touched),
+        branch_switches=state.branch_switches,
         complexity=complexity,
+        instruction_counts=Counter(state.instruction_counts),
+        instruction_texts=dict(state.instruction_texts),
     )
 
 
+def analyze_session(
+    path: Path,
+    messages: list[StructuredMessage],
+    project_override: str | None = None,
+) -> SessionAnalysis | None:
+    if not messages:
+        return None
+    return finalize_session(fold_messages(SessionState(), messages), path, project_override)
+
+
 def in_date_range(session: SessionAnalysis, start: date, end: date) -> bool:
     if session.timestamp is None:
         return False
@@ -880,6 +1371,48 @@ def in_date_range(session: SessionAnalysis, start: date, end: date) -> bool:
     return start <= session_date <= end
 
 
+def first_row_timestamp(path: Path, max_lines: int = PREFILTER_PEEK_LINES) -> datetime | None:
+    """Timestamp of the first row that carries one, looking at most ``max_lines`` rows deep."""
+    try:
+        with path.open("rb") as handle:
+            for line_number, line in enumerate(handle, 1):
+                if line_number > max_lines:
+                    break
+                stripped = line.strip()
+                if not stripped or b'"timestamp"' not in stripped:
+                    continue
+                try:
+                    raw = decode_row(stripped)
+                except ValueError:
+                    continue
+                if isinstance(raw, dict):
+                    timestamp = parse_timestamp(raw.get("timestamp"))
+                    if timestamp is not None:
+                        return timestamp
+    except OSError:
+        return None
+    return None
+
+
+def session_file_may_overlap(path: Path, start: date) -> bool:
+    """Cheap pre-parse check that a Claude session file can pass ``in_date_range``.
+
+    A session is dated by its earliest timestamp, and both the file mtime and the
+    first timestamped row are upper bounds for it. If either falls before
+    ``start`` the file cannot overlap the range. Only the lower bound can be
+    decided without a full parse. The mtime check allows one day of slack for
+    timestamps recorded with a local UTC offset.
+    """
+    try:
+        modified = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).date()
+    except OSError:
+        return True
+    if modified < start - timedelta(days=1):
+        return False
+    first = first_row_timestamp(path)
+    return first is None or first.date() >= start
+
+
 def find_session_files(args: argparse.Namespace) -> tuple[list[Path], list[str]]:
     invalid: list[str] = []
     if args.sessions:
@@ -896,67 +1429,231 @@ def find_session_files(args: argparse.Namespace) -> tuple[list[Path], list[str]]
         project_dir = projects_root / project_to_slug(args.project)
         if not project_dir.exists() or not project_dir.is_dir():
             return [], [str(project_dir)]
-        return sorted(project_dir.glob("*.jsonl")), []
+        paths = sorted(project_dir.glob("*.jsonl"))
+    else:
+        paths = sorted(projects_root.glob("*/*.jsonl"))
+
+    if args.date_range_dates:
+        start, _ = args.date_range_dates
+        candidates = len(paths)
+        paths = [path for path in paths if session_file_may_overlap(path, start)]
+        # Rejected files are never parsed, so their rows cannot count toward sessions_skipped.
+        parse_counters["files_prefiltered"] += candidates - len(paths)
+    return paths, []
 
-    return sorted(projects_root.glob("*/*.jsonl")), []
 
+ARCHIVE_DIR_DATE = re.compile(r"(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?")
+ARCHIVE_MTIME_SLACK = timedelta(days=1)
 
-def _codex_active_paths_for_range(start: date, end: date) -> list[Path]:
+
+def _scandir_entries(directory: Path) -> list[tuple[str, bool]]:
+    """``(name, is_dir)`` for each entry of ``directory``; empty when it cannot be listed."""
+    try:
+        with os.scandir(directory) as entries:
+            return [(entry.name, entry.is_dir()) for entry in entries]
+    except OSError:
+        return []
+
+
+def _list_directories(directories: list[Path], threads: int = 1) -> list[list[tuple[str, bool]]]:
+    """``_scandir_entries`` for each directory, in order, fanned out over ``threads``."""
+    if threads <= 1 or len(directories) <= 1:
+        return [_scandir_entries(directory) for directory in directories]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(_scandir_entries, directories))
+
+
+def _canonical_number(name: str, width: int) -> int | None:
+    if len(name) != width or not name.isascii() or not name.isdigit():
+        return None
+    return int(name)
+
+
+def _codex_active_paths_for_range(start: date, end: date, threads: int = 1) -> list[Path]:
+    """Rollouts under ``sessions/YYYY/MM/DD`` for days in ``[start, end]``.
+
+    Years and months outside the range are pruned from their names before
+    anything below them is listed.
+    """
     base = codex_home() / "sessions"
     if not base.is_dir():
         return []
+    years = [
+        base / name
+        for name, is_dir in _scandir_entries(base)
+        if is_dir and (year := _canonical_number(name, 4)) is not None and start.year <= year <= end.year
+    ]
+    months: list[Path] = []
+    for year_dir, listing in zip(years, _list_directories(years, threads)):
+        year = int(year_dir.name)
+        for name, is_dir in listing:
+            month = _canonical_number(name, 2) if is_dir else None
+            if month is not None and (start.year, start.month) <= (year, month) <= (end.year, end.month):
+                months.append(year_dir / name)
+    days: list[tuple[date, Path]] = []
+    for month_dir, listing in zip(months, _list_directories(months, threads)):
+        for name, is_dir in listing:
+            day = _canonical_number(name, 2) if is_dir else None
+            if day is None:
+                continue
+            try:
+                current = date(int(month_dir.parent.name), int(month_dir.name), day)
+            except ValueError:
+                continue
+            if start <= current <= end:
+                days.append((current, month_dir / name))
+    days.sort()
+    day_dirs = [day_dir for _, day_dir in days]
     paths: list[Path] = []
-    current = start
-    while current <= end:
-        day_dir = base / str(current.year) / f"{current.month:02d}" / f"{current.day:02d}"
-        if day_dir.is_dir():
-            paths.extend(sorted(day_dir.glob("rollout-*.jsonl")))
-        current += timedelta(days=1)
+    for day_dir, listing in zip(day_dirs, _list_directories(day_dirs, threads)):
+        names = sorted(
+            name for name, is_dir in listing if not is_dir and name.startswith("rollout-") and name.endswith(".jsonl")
+        )
+        paths.extend(day_dir / name for name in names)
     return paths
 
 
-def _codex_archived_paths_for_range(start: date, end: date) -> list[Path]:
+def _archive_dir_may_overlap(directory: Path, name: str, start: date) -> bool:
+    """Whether an archive directory can hold rollouts dated on or after ``start``.
+
+    A rollout is archived after its session started, so both a date-shaped
+    directory name and the directory's mtime bound its rollouts' dates from
+    above. The mtime check allows a day of slack for local-time filenames.
+    """
+    match = ARCHIVE_DIR_DATE.fullmatch(name)
+    if match:
+        year, month, day = (int(part) if part else None for part in match.groups())
+        try:
+            first = date(year, month or 1, day or 1)
+        except ValueError:
+            first = None
+        if first is not None:
+            if day is not None:
+                latest = first
+            elif month is not None:
+                latest = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+            else:
+                latest = first.replace(month=12, day=31)
+            if latest < start:
+                return False
+    try:
+        mtime = datetime.fromtimestamp(directory.stat().st_mtime, tz=timezone.utc).date()
+    except (OSError, OverflowError, ValueError):
+        return True
+    return mtime + ARCHIVE_MTIME_SLACK >= start
+
+
+def _codex_archived_paths_for_range(start: date, end: date, threads: int = 1) -> list[Path]:
+    """Rollouts under ``archived_sessions/*/`` whose filename date is in ``[start, end]``."""
     base = codex_home() / "archived_sessions"
     if not base.is_dir():
         return []
+    children = [
+        base / name
+        for name, is_dir in sorted(_scandir_entries(base))
+        if is_dir and _archive_dir_may_overlap(base / name, name, start)
+    ]
     paths: list[Path] = []
-    for child in sorted(base.iterdir()):
-        if not child.is_dir():
-            continue
-        for f in sorted(child.glob("*.jsonl")):
-            date_str = f.stem.removeprefix("rollout-")[:10]
+    for child, listing in zip(children, _list_directories(children, threads)):
+        for name in sorted(name for name, is_dir in listing if not is_dir and name.endswith(".jsonl")):
             try:
-                file_date = date.fromisoformat(date_str)
+                file_date = date.fromisoformat(name.removeprefix("rollout-")[:10])
             except ValueError:
                 continue
             if start <= file_date <= end:
-                paths.append(f)
+                paths.append(child / name)
     return paths
 
 
-def _codex_match_project(path: Path, project: str) -> bool:
+def _codex_match_project(path: Path, project: str, headers: CodexHeaderIndex | None = None) -> bool:
     """Check if a Codex session file's cwd matches the project filter."""
-    try:
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                raw = json.loads(stripped)
-                if not isinstance(raw, dict) or raw.get("type") != "session_meta":
-                    break
-                payload = raw.get("payload")
-                if isinstance(payload, dict):
-                    cwd = payload.get("cwd")
-                    if isinstance(cwd, str):
-                        return project_from_cwd(cwd) == project or project in cwd
-                break
-    except (json.JSONDecodeError, OSError):
-        pass
-    return False
-
-
-def find_codex_session_files(args: argparse.Namespace) -> tuple[list[Path], list[str]]:
+    header = headers.get(path) if headers is not None else read_codex_header(path)
+    cwd = header.cwd if header else None
+    return cwd is not None and (project_from_cwd(cwd) == project or project in cwd)
+
+
+class CodexHeaderIndex:
+    """Persistent rollout path -> ``session_meta`` header map.
+
+    Indexed files are filtered by project without being opened, and their
+    full parse starts from the known header instead of decoding
+    ``session_meta`` rows again. An entry is used only while the file's size
+    and mtime match the ones recorded with it, so a rollout replaced or
+    appended to under the same path is read again. ``save`` keeps only the
+    paths consulted during this run.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.seen: set[str] = set()
+        self.dirty = False
+        self.reads = 0
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            warn(f"ignoring unreadable codex header index {path}: {exc}")
+            return
+        if isinstance(data, dict) and isinstance(data.get("entries"), dict):
+            self.entries = data["entries"]
+
+    def cached(self, path: Path) -> CodexMeta | None:
+        key = os.path.abspath(path)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+        if stat is None or [entry.get("size"), entry.get("mtime_ns")] != [stat.st_size, stat.st_mtime_ns]:
+            del self.entries[key]
+            self.dirty = True
+            return None
+        return codex_meta_from_json(entry)
+
+    def get(self, path: Path) -> CodexMeta | None:
+        header = self.cached(path)
+        if header is not None:
+            return header
+        header = read_codex_header(path)
+        self.reads += 1
+        if header is not None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return header
+            self.entries[os.path.abspath(path)] = {
+                **codex_meta_to_json(header),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            self.dirty = True
+        return header
+
+    def save(self) -> None:
+        unseen = self.entries.keys() - self.seen
+        for key in unseen:
+            del self.entries[key]
+        if self.path is None or not (self.dirty or unseen):
+            return
+        data = {"updated_at": utc_now_iso(), "entries": self.entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            warn(f"could not write codex header index {self.path}: {exc}")
+
+
+def find_codex_session_files(
+    args: argparse.Namespace,
+    headers: CodexHeaderIndex | None = None,
+) -> tuple[list[Path], list[str]]:
     if args.sessions:
         return [], []
 
@@ -964,15 +1661,558 @@ def find_codex_session_files(args: argparse.Namespace) -> tuple[list[Path], list
         return [], []
 
     start, end = args.date_range_dates
-    paths = _codex_active_paths_for_range(start, end)
-    paths.extend(_codex_archived_paths_for_range(start, end))
+    threads = args.discovery_threads
+    paths = _codex_active_paths_for_range(start, end, threads)
+    paths.extend(_codex_archived_paths_for_range(start, end, threads))
 
     if args.project:
-        paths = [p for p in paths if _codex_match_project(p, args.project)]
+        paths = [p for p in paths if _codex_match_project(p, args.project, headers)]
 
     return paths, []
 
 
+# ---------------------------------------------------------------------------
+# Incremental analysis cache
+# ---------------------------------------------------------------------------
+
+
+def analysis_signature() -> str:
+    """Fingerprint of everything that shapes cached counters besides the file itself."""
+    material = json.dumps(
+        [
+            CACHE_VERSION,
+            NEGATION_EXEMPTIONS,
+            CORRECTION_PATTERNS,
+            REJECTION_PATTERNS,
+            PRAISE_PATTERNS,
+            TOOL_ERROR_PATTERNS,
+            ROLLBACK_PATTERNS,
+            [pattern.pattern for pattern in FILE_PATH_PATTERNS],
+            sorted(PATH_INPUT_KEYS),
+            sorted(BODY_INPUT_KEYS),
+            PATCH_FILE_HEADER.pattern,
+            CALL_TEXT_SCAN_BUDGET,
+            RESULT_TEXT_SCAN_BUDGET,
+            SIGNIFICANT_TOKEN.pattern,
+            sorted(SIGNIFICANT_STOPWORDS),
+            SIMILARITY_THRESHOLD,
+            MAX_REPEAT_WINDOW,
+            MINHASH_PERMUTATIONS,
+            INSTRUCTION_MIN_TOKENS,
+            MAX_SESSION_INSTRUCTIONS,
+            INSTRUCTION_SNIPPET_CHARS,
+            sorted(KNOWN_SKILLS),
+            sorted(KNOWN_AGENTS),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def state_to_json(state: SessionState) -> dict[str, Any]:
+    # Counters are stored as ordered pairs: most_common() breaks ties by insertion order.
+    return {
+        "message_count": state.message_count,
+        "session_id": state.session_id,
+        "first_ts": state.first_ts.isoformat() if state.first_ts else None,
+        "last_ts": state.last_ts.isoformat() if state.last_ts else None,
+        "turn_count": state.turn_count,
+        "user_corrections": state.user_corrections,
+        "repeat_distances": sorted(state.repeat_distances.items()),
+        "positive_feedback": state.positive_feedback,
+        "tool_count": state.tool_count,
+        "branch_switches": state.branch_switches,
+        "recent_instructions": {
+            "next_seq": state.recent_instructions.next_seq,
+            "entries": [[seq, sorted(tokens)] for seq, tokens in state.recent_instructions.entries.items()],
+        },
+        "previous_branch": state.previous_branch,
+        "tool_failures": list(state.tool_failures.items()),
+        "tool_failure_patterns": [[tool, pattern, count] for (tool, pattern), count in state.tool_failure_patterns.items()],
+        "skill_invocations": list(state.skill_invocations.items()),
+        "agent_dispatches": list(state.agent_dispatches.items()),
+        "unique_tools": sorted(state.unique_tools),
+        "files_touched": sorted(state.files_touched),
+        "tool_name_by_id": state.tool_name_by_id,
+        "instructions": [
+            [signature, count, state.instruction_texts.get(signature, "")]
+            for signature, count in state.instruction_counts.items()
+        ],
+    }
+
+
+def state_from_json(data: dict[str, Any]) -> SessionState:
+    return SessionState(
+        message_count=int(data["message_count"]),
+        session_id=str(data["session_id"]),
+        first_ts=parse_timestamp(data.get("first_ts")),
+        last_ts=parse_timestamp(data.get("last_ts")),
+        turn_count=int(data["turn_count"]),
+        user_corrections=int(data["user_corrections"]),
+        repeat_distances=Counter({int(distance): count for distance, count in data["repeat_distances"]}),
+        positive_feedback=int(data["positive_feedback"]),
+        tool_count=int(data["tool_count"]),
+        branch_switches=int(data["branch_switches"]),
+        recent_instructions=InstructionWindow(
+            entries={int(seq): frozenset(tokens) for seq, tokens in data["recent_instructions"]["entries"]},
+            next_seq=int(data["recent_instructions"]["next_seq"]),
+        ),
+        previous_branch=data.get("previous_branch"),
+        tool_failures=Counter(dict(data["tool_failures"])),
+        tool_failure_patterns=Counter({(tool, pattern): count for tool, pattern, count in data["tool_failure_patterns"]}),
+        skill_invocations=Counter(dict(data["skill_invocations"])),
+        agent_dispatches=Counter(dict(data["agent_dispatches"])),
+        unique_tools=set(data["unique_tools"]),
+        files_touched=set(data["files_touched"]),
+        tool_name_by_id=dict(data["tool_name_by_id"]),
+        instruction_counts=Counter({signature: count for signature, count, _ in data["instructions"]}),
+        instruction_texts={signature: text for signature, _, text in data["instructions"]},
+    )
+
+
+def codex_meta_to_json(meta: CodexMeta) -> dict[str, Any]:
+    return {
+        "session_id": meta.session_id,
+        "cwd": meta.cwd,
+        "agent_role": meta.agent_role,
+        "is_subagent": meta.is_subagent,
+    }
+
+
+def codex_meta_from_json(data: dict[str, Any]) -> CodexMeta:
+    return CodexMeta(
+        session_id=str(data["session_id"]),
+        cwd=data.get("cwd"),
+        agent_role=data.get("agent_role"),
+        is_subagent=bool(data.get("is_subagent")),
+    )
+
+
+class AnalysisCache:
+    """Per-file session state keyed by path, size, mtime and last parsed byte offset.
+
+    Entries whose size and mtime are unchanged are reused as-is. A file that
+    only grew is resumed from its cached offset; anything else (truncation,
+    rewrite, pattern changes) falls back to a full parse.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.signature = analysis_signature()
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.resumed = 0
+        self.misses = 0
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            warn(f"ignoring unreadable analysis cache {path}: {exc}")
+            return
+        if isinstance(data, dict) and data.get("signature") == self.signature and isinstance(data.get("entries"), dict):
+            self.entries = data["entries"]
+
+    @classmethod
+    def detached(cls, entries: dict[str, dict[str, Any]]) -> AnalysisCache:
+        """In-memory cache holding only ``entries``, for shipping to worker processes."""
+        cache = cls(None)
+        cache.entries = entries
+        return cache
+
+    @staticmethod
+    def key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    def merge_from(self, other: AnalysisCache) -> None:
+        if other.dirty:
+            self.entries.update(other.entries)
+            self.dirty = True
+        self.hits += other.hits
+        self.resumed += other.resumed
+        self.misses += other.misses
+
+    def lookup(self, path: Path, stat: os.stat_result) -> tuple[str, dict[str, Any] | None]:
+        """Return ("hit" | "grown" | "miss", entry) for the file's current stat."""
+        entry = self.entries.get(self.key(path))
+        if entry is None:
+            return "miss", None
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return "hit", entry
+        if entry["resumable"] and stat.st_size > entry["offset"] and stat.st_mtime_ns >= entry["mtime_ns"]:
+            return "grown", entry
+        return "miss", None
+
+    def store(self, path: Path, entry: dict[str, Any]) -> None:
+        self.entries[self.key(path)] = entry
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        data = {
+            "cache_version": CACHE_VERSION,
+            "signature": self.signature,
+            "updated_at": utc_now_iso(),
+            "entries": self.entries,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            warn(f"could not write analysis cache {self.path}: {exc}")
+
+
+def collect_session_state(
+    path: Path,
+    source: str,
+    cache: AnalysisCache | None = None,
+    reorder_window: int | None = None,
+    header: CodexMeta | None = None,
+) -> tuple[SessionState, int, CodexMeta | None]:
+    """Parse and fold one session file, reusing cached state where possible.
+
+    Returns the folded state, the cumulative count of skipped JSONL rows and,
+    for Codex rollouts, the session header. With ``reorder_window`` rows are
+    folded as they are read through a bounded reorder buffer instead of being
+    collected and fully sorted first. A known Codex ``header`` seeds a full
+    parse so its ``session_meta`` rows need not be decoded.
+    """
+    stat = path.stat() if cache is not None else None
+    status, entry = cache.lookup(path, stat) if cache is not None and stat is not None else ("miss", None)
+
+    if status == "hit" and entry is not None and cache is not None:
+        cache.hits += 1
+        parse_counters["files_unchanged"] += 1
+        meta = codex_meta_from_json(entry["codex_meta"]) if entry.get("codex_meta") else None
+        return state_from_json(entry["state"]), int(entry["skipped_rows"]), meta
+
+    if status == "grown" and entry is not None:
+        state = state_from_json(entry["state"])
+        skipped_rows = int(entry["skipped_rows"])
+        meta = codex_meta_from_json(entry["codex_meta"]) if entry.get("codex_meta") else None
+        cursor = JsonlCursor(path, int(entry["offset"]))
+    else:
+        state = SessionState()
+        skipped_rows = 0
+        meta = header if source == "codex" and header is not None and header.cwd else None
+        cursor = JsonlCursor(path)
+
+    reader = CodexMessageReader(path, cursor, meta) if source == "codex" else ClaudeMessageReader(path, cursor)
+    if reorder_window is None:
+        fold_messages(state, sorted(reader, key=message_sort_key))
+    else:
+        fold_messages(state, reorder_by_timestamp(reader, reorder_window))
+    skipped_rows += reader.skipped_rows
+    meta = reader.meta
+    parse_counters["files_resumed" if status == "grown" else "files_parsed"] += 1
+    parse_counters["rows_parsed"] += cursor.lines
+    parse_counters["bytes_parsed"] += cursor.offset - cursor.start
+
+    if cache is not None and stat is not None:
+        if status == "grown":
+            cache.resumed += 1
+        else:
+            cache.misses += 1
+        cache.store(
+            path,
+            {
+                "source": source,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "offset": cursor.offset,
+                "resumable": cursor.offset >= stat.st_size,
+                "skipped_rows": skipped_rows,
+                "state": state_to_json(state),
+                "codex_meta": codex_meta_to_json(meta) if meta else None,
+            },
+        )
+    return state, skipped_rows, meta
+
+
+def analyze_session_file(
+    path: Path,
+    source: str,
+    cache: AnalysisCache | None = None,
+    reorder_window: int | None = None,
+    header: CodexMeta | None = None,
+) -> tuple[SessionAnalysis | None, int]:
+    """Parse and analyze one Claude or Codex session file.
+
+    Returns the analysis (``None`` for files without messages) and the number
+    of skipped JSONL rows.
+    """
+    state, skipped_rows, meta = collect_session_state(path, source, cache, reorder_window, header)
+    return analysis_from_state(state, path, source, meta), skipped_rows
+
+
+def analysis_from_state(
+    state: SessionState,
+    path: Path,
+    source: str,
+    meta: CodexMeta | None = None,
+) -> SessionAnalysis | None:
+    if source != "codex":
+        return finalize_session(state, path)
+    analysis = finalize_session(state, path, project_override=project_from_cwd(meta.cwd if meta else None))
+    if analysis is not None and meta and meta.is_subagent and meta.agent_role:
+        analysis.agent_dispatches[meta.agent_role] += 1
+    return analysis
+
+
+def _analyze_session_file_job(
+    job: tuple[Path, str, dict[str, dict[str, Any]] | None, int | None, CodexMeta | None],
+) -> tuple[SessionAnalysis | None, int, AnalysisCache | None, Counter[str]]:
+    path, source, cache_entries, reorder_window, header = job
+    cache = AnalysisCache.detached(cache_entries) if cache_entries is not None else None
+    parse_counters.clear()
+    analysis, skipped_rows = analyze_session_file(path, source, cache, reorder_window, header)
+    return analysis, skipped_rows, cache, Counter(parse_counters)
+
+
+def iter_session_file_analyses(
+    jobs: list[tuple[Path, str]],
+    cache: AnalysisCache | None = None,
+    workers: int = 1,
+    reorder_window: int | None = None,
+    headers: CodexHeaderIndex | None = None,
+) -> Iterator[tuple[SessionAnalysis | None, int]]:
+    """Yield ``analyze_session_file`` results in job order.
+
+    With ``workers > 1`` files are parsed in a process pool; results are still
+    streamed back in the original order so downstream accounting is identical
+    to the serial path. Headers already in ``headers`` seed Codex parses; the
+    index is only consulted here, never filled.
+    """
+
+    def header_for(path: Path, source: str) -> CodexMeta | None:
+        return headers.cached(path) if headers is not None and source == "codex" else None
+
+    if workers <= 1 or len(jobs) <= 1:
+        for path, source in jobs:
+            yield analyze_session_file(path, source, cache, reorder_window, header_for(path, source))
+        return
+
+    def job_payload(
+        path: Path, source: str
+    ) -> tuple[Path, str, dict[str, dict[str, Any]] | None, int | None, CodexMeta | None]:
+        header = header_for(path, source)
+        if cache is None:
+            return path, source, None, reorder_window, header
+        key = AnalysisCache.key(path)
+        return path, source, {key: cache.entries[key]} if key in cache.entries else {}, reorder_window, header
+
+    payloads = [job_payload(path, source) for path, source in jobs]
+    chunksize = max(1, len(payloads) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(json_backend, repeat_window)) as executor:
+        try:
+            for analysis, skipped_rows, worker_cache, counters in executor.map(
+                _analyze_session_file_job, payloads, chunksize=chunksize
+            ):
+                if cache is not None and worker_cache is not None:
+                    cache.merge_from(worker_cache)
+                parse_counters.update(counters)
+                yield analysis, skipped_rows
+        except GeneratorExit:
+            # Closed early: drop the jobs no worker has picked up yet. Leaving
+            # the with block still waits for the ones already running.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+# ---------------------------------------------------------------------------
+# SQLite session index
+# ---------------------------------------------------------------------------
+
+
+class SessionIndex:
+    """SQLite index of session files, kept current by the ``ingest`` subcommand.
+
+    Each row holds the file's stat, the lookup columns queries filter on
+    (project, cwd, first day) and the per-session signal counters. The
+    ``entry`` column is the same per-file record ``AnalysisCache`` keeps, so
+    ingest resumes grown files from their last offset and queries rebuild
+    ``SessionAnalysis`` objects without re-parsing. The ``repeated_instructions``
+    column is counted with the ingest's ``--repeat-window``; queries recount it
+    from ``entry`` with their own.
+
+    Only ``ingest`` opens the index for writing and rebuilds it when the
+    analysis signature changed; ``read_only`` query runs refuse a missing or
+    stale index instead of touching it.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS sessions (
+            path TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            session_id TEXT,
+            project TEXT,
+            cwd TEXT,
+            first_ts TEXT,
+            last_ts TEXT,
+            first_day TEXT,
+            turn_count INTEGER NOT NULL DEFAULT 0,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            skipped_rows INTEGER NOT NULL DEFAULT 0,
+            user_corrections INTEGER NOT NULL DEFAULT 0,
+            repeated_instructions INTEGER NOT NULL DEFAULT 0,
+            positive_feedback INTEGER NOT NULL DEFAULT 0,
+            tool_failures INTEGER NOT NULL DEFAULT 0,
+            tool_count INTEGER NOT NULL DEFAULT 0,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sessions_first_day ON sessions (first_day);
+        CREATE INDEX IF NOT EXISTS sessions_project_day ON sessions (project, first_day);
+    """
+
+    def __init__(self, path: Path, read_only: bool = False) -> None:
+        self.path = path
+        if read_only and not path.is_file():
+            self._refuse(f"session index not found: {path}")
+        try:
+            if read_only:
+                self.connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self.connection = sqlite3.connect(path)
+                self.connection.executescript(self.SCHEMA)
+            signature = analysis_signature()
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        except (OSError, sqlite3.Error) as exc:
+            raise SystemExit(f"could not open session index {path}: {exc}") from None
+        if row is None or row[0] != signature:
+            if read_only:
+                self.connection.close()
+                self._refuse(f"session index {path} was built with different analysis settings")
+            # Counters from other signal patterns cannot be reused; this ingest rebuilds them.
+            with self.connection:
+                self.connection.execute("DELETE FROM sessions")
+                self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+
+    @staticmethod
+    def _refuse(reason: str) -> None:
+        print(f"{reason}; run 'analyze_sessions.py ingest' to (re)build it", file=sys.stderr)
+        raise SystemExit(2)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def cache_entries(self) -> dict[str, dict[str, Any]]:
+        entries = {}
+        for path, source, size, mtime_ns, skipped_rows, entry in self.connection.execute(
+            "SELECT path, source, size, mtime_ns, skipped_rows, entry FROM sessions"
+        ):
+            record = json.loads(entry)
+            record.update({"source": source, "size": size, "mtime_ns": mtime_ns, "skipped_rows": skipped_rows})
+            entries[path] = record
+        return entries
+
+    def upsert(self, key: str, entry: dict[str, Any], analysis: SessionAnalysis | None) -> None:
+        meta = entry.get("codex_meta") or {}
+        stored = {name: entry[name] for name in ("offset", "resumable", "state", "codex_meta")}
+        self.connection.execute(
+            """
+            INSERT OR REPLACE INTO sessions (
+                path, source, session_id, project, cwd, first_ts, last_ts, first_day, turn_count, size, mtime_ns,
+                skipped_rows, user_corrections, repeated_instructions, positive_feedback, tool_failures, tool_count, entry
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                entry["source"],
+                analysis.session_id if analysis else None,
+                analysis.project if analysis else None,
+                meta.get("cwd"),
+                display_iso(analysis.timestamp) if analysis else None,
+                entry["state"].get("last_ts"),
+                analysis.timestamp.date().isoformat() if analysis and analysis.timestamp else None,
+                analysis.turn_count if analysis else 0,
+                entry["size"],
+                entry["mtime_ns"],
+                entry["skipped_rows"],
+                analysis.user_corrections if analysis else 0,
+                analysis.repeated_instructions if analysis else 0,
+                analysis.positive_feedback if analysis else 0,
+                sum(analysis.tool_failures.values()) if analysis else 0,
+                analysis.tool_count if analysis else 0,
+                json.dumps(stored, ensure_ascii=False, sort_keys=True),
+            ),
+        )
+
+    def prune(self, keep: set[str]) -> int:
+        stale = [path for (path,) in self.connection.execute("SELECT path FROM sessions") if path not in keep]
+        self.connection.executemany("DELETE FROM sessions WHERE path = ?", [(path,) for path in stale])
+        return len(stale)
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def count(self) -> int:
+        return int(self.connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0])
+
+    def query(self, start: date, end: date, project: str | None = None) -> Iterator[tuple[SessionAnalysis | None, int]]:
+        """Sessions whose first message falls in [start, end], optionally for one project.
+
+        The project filter mirrors the directory scan: Claude rows match the
+        project's slug directory, Codex rows match the cwd-derived project
+        name or a cwd containing ``project``.
+        """
+        sql = "SELECT path, source, skipped_rows, entry FROM sessions WHERE first_day BETWEEN ? AND ?"
+        params: list[Any] = [start.isoformat(), end.isoformat()]
+        if project:
+            sql += " AND ((source = 'claude' AND project = ?) OR (source = 'codex' AND (project = ? OR instr(cwd, ?) > 0)))"
+            params.extend([project_to_slug(project), project, project])
+        sql += " ORDER BY source = 'codex', path"
+        for path, source, skipped_rows, entry in self.connection.execute(sql, params):
+            record = json.loads(entry)
+            meta = codex_meta_from_json(record["codex_meta"]) if record.get("codex_meta") else None
+            yield analysis_from_state(state_from_json(record["state"]), Path(path), source, meta), skipped_rows
+
+
+def discover_all_session_files() -> list[tuple[Path, str]]:
+    """Every Claude project transcript and Codex rollout, for ``ingest``."""
+    jobs: list[tuple[Path, str]] = []
+    projects_root = claude_home() / "projects"
+    if projects_root.is_dir():
+        jobs.extend((path, "claude") for path in sorted(projects_root.glob("*/*.jsonl")))
+    sessions_root = codex_home() / "sessions"
+    if sessions_root.is_dir():
+        jobs.extend((path, "codex") for path in sorted(sessions_root.glob("*/*/*/rollout-*.jsonl")))
+    archived_root = codex_home() / "archived_sessions"
+    if archived_root.is_dir():
+        jobs.extend((path, "codex") for path in sorted(archived_root.glob("*/*.jsonl")))
+    return jobs
+
+
+def ingest_sessions(index: SessionIndex, jobs: list[tuple[Path, str]], workers: int = 1) -> dict[str, int]:
+    """Bring ``index`` up to date with ``jobs``: re-parse changed files, drop vanished ones."""
+    cache = AnalysisCache.detached(index.cache_entries())
+    previous = {key: (entry["size"], entry["mtime_ns"]) for key, entry in cache.entries.items()}
+    updated = 0
+    for (path, _), (analysis, _) in zip(jobs, iter_session_file_analyses(jobs, cache, workers)):
+        key = AnalysisCache.key(path)
+        entry = cache.entries.get(key)
+        if entry is not None and previous.get(key) != (entry["size"], entry["mtime_ns"]):
+            index.upsert(key, entry, analysis)
+            updated += 1
+    removed = index.prune({AnalysisCache.key(path) for path, _ in jobs})
+    index.commit()
+    return {
+        "files": len(jobs),
+        "updated": updated,
+        "unchanged": cache.hits,
+        "resumed": cache.resumed,
+        "reparsed": cache.misses,
+        "removed": removed,
+        "indexed": index.count(),
+    }
+
+
 def counter_items(counter: Counter[str], key_name: str, value_name: str) -> list[dict[str, Any]]:
     return [{key_name: key, value_name: value} for key, value in counter.most_common()]
 
@@ -997,6 +2237,11 @@ def session_to_json(analysis: SessionAnalysis) -> dict[str, Any]:
         "positive_feedback": analysis.positive_feedback,
         "skill_invocations": counter_items(analysis.skill_invocations, "skill", "count"),
         "agent_dispatches": counter_items(analysis.agent_dispatches, "agent", "count"),
+        "files_touched": sorted(analysis.files_touched),
+        "instructions": [
+            {"signature": signature, "count": count, "text": analysis.instruction_texts.get(signature, "")}
+            for signature, count in analysis.instruction_counts.items()
+        ],
         "complexity": analysis.complexity,
     }
 
@@ -1097,18 +2342,107 @@ def build_report(
     analyses: list[SessionAnalysis],
     sessions_skipped: int,
     date_range: tuple[str, str] | None,
+    store: dict[str, Any] | None = None,
+    diagnostics: dict[str, int] | None = None,
+    degradations: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
-    return {
+    signals: dict[str, Any] = {"aggregated": aggregate(analyses)}
+    if store is None:
+        signals["by_session"] = [session_to_json(analysis) for analysis in analyses]
+    else:
+        signals["store"] = store
+    report = {
         "schema_version": SCHEMA_VERSION,
         "generated_at": utc_now_iso(),
         "date_range": {"start": date_range[0], "end": date_range[1]} if date_range else None,
         "sessions_analyzed": len(analyses),
         "sessions_skipped": sessions_skipped,
-        "signals": {
-            "by_session": [session_to_json(analysis) for analysis in analyses],
-            "aggregated": aggregate(analyses),
-        },
+        "signals": signals,
     }
+    if diagnostics is not None:
+        report["diagnostics"] = diagnostics
+    if degradations is not None:
+        report["degradations"] = degradations
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Sharded signal store
+# ---------------------------------------------------------------------------
+
+
+def store_partition_for(analysis: SessionAnalysis) -> str:
+    """Partition path relative to the store root: ``<start day>/<project>.jsonl``."""
+    day = analysis.timestamp.date().isoformat() if analysis.timestamp else UNDATED_PARTITION
+    project = re.sub(r"[^\w.-]+", "-", analysis.project).strip(".-") or "unknown"
+    return f"{day}/{project}.jsonl"
+
+
+def read_store_partition(path: Path) -> list[dict[str, Any]]:
+    return list(iter_store_partition(path, decode_row))
+
+
+def load_store_session_index(root: Path) -> dict[str, str]:
+    """Partition of every stored session; rebuilt by scanning the partitions when the index is missing or unreadable."""
+    path = root / STORE_SESSION_INDEX
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            warn(f"{path}: rebuilding unreadable store session index: {exc}")
+        else:
+            if isinstance(data, dict) and all(isinstance(value, str) for value in data.values()):
+                return data
+            warn(f"{path}: rebuilding malformed store session index")
+    index: dict[str, str] = {}
+    for partition_path in sorted(root.glob("*/*.jsonl")):
+        partition = partition_path.relative_to(root).as_posix()
+        index.update((row["session_id"], partition) for row in iter_store_partition(partition_path, decode_row))
+    return index
+
+
+def write_signal_store(root: Path, analyses: list[SessionAnalysis]) -> list[str]:
+    """Upsert ``session_to_json`` rows into their partitions; returns the partitions touched.
+
+    Rows are keyed by session id, so re-analyzing a day replaces its sessions
+    and leaves sessions from other runs (other projects, earlier files) alone.
+    A session whose partition changed (it gained a timestamp, or its start
+    moved) is removed from the partition ``STORE_SESSION_INDEX`` last put it in.
+    """
+    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    moved: dict[str, set[str]] = defaultdict(set)
+    try:
+        index = load_store_session_index(root)
+        for analysis in analyses:
+            partition = store_partition_for(analysis)
+            grouped[partition].append(session_to_json(analysis))
+            previous = index.get(analysis.session_id)
+            if previous is not None and previous != partition:
+                moved[previous].add(analysis.session_id)
+            index[analysis.session_id] = partition
+        for partition in sorted(set(grouped) | set(moved)):
+            path = root / partition
+            stale = moved.get(partition, set())
+            merged = {row["session_id"]: row for row in read_store_partition(path) if row["session_id"] not in stale}
+            merged.update((row["session_id"], row) for row in grouped.get(partition, []))
+            if not merged:
+                path.unlink(missing_ok=True)
+                continue
+            ordered = sorted(merged.values(), key=lambda row: (row.get("timestamp") or "", row["session_id"]))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            with tmp.open("w", encoding="utf-8") as handle:
+                for row in ordered:
+                    handle.write(json.dumps(row, ensure_ascii=False, sort_keys=True) + "\n")
+            tmp.replace(path)
+        if grouped:
+            index_path = root / STORE_SESSION_INDEX
+            tmp = index_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(index, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+            tmp.replace(index_path)
+    except OSError as exc:
+        raise SystemExit(f"could not write signal store {root}: {exc}") from None
+    return sorted(grouped)
 
 
 def print_text_report(report: dict[str, Any]) -> None:
@@ -1122,6 +2456,9 @@ def print_text_report(report: dict[str, Any]) -> None:
     print(f"Tool failures: {aggregated['total_tool_failures']}")
     print(f"Positive feedback: {aggregated['total_positive_feedback']}")
     print(f"Correction rate: {aggregated['correction_rate']}")
+    store = report["signals"].get("store")
+    if store:
+        print(f"Signal store: {store['path']} ({len(store['partitions'])} partitions)")
 
 
 def parse_date(value: str) -> date:
@@ -1132,16 +2469,112 @@ def parse_date(value: str) -> date:
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Analyze Claude session JSONL files for HyperAgent signals.")
+    parser = argparse.ArgumentParser(
+        description="Analyze Claude session JSONL files for HyperAgent signals.",
+        epilog="Run 'analyze_sessions.py ingest --help' to build or refresh the SQLite session index used by --index.",
+    )
     source = parser.add_mutually_exclusive_group(required=True)
     source.add_argument("--sessions", nargs="+", help="Session JSONL paths to analyze.")
     source.add_argument("--date-range", nargs=2, metavar=("START", "END"), help="Inclusive ISO date range.")
     parser.add_argument("--project", help="Project path or slug to filter when using --date-range.")
     parser.add_argument("--json", action="store_true", help="Print structured JSON to stdout.")
     parser.add_argument("--min-turns", type=int, default=DEFAULT_MIN_TURNS, help="Minimum user turns to analyze.")
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=DEFAULT_CACHE_PATH,
+        help=f"Reuse per-file analysis state across runs. Defaults to {DEFAULT_CACHE_PATH} when given without PATH.",
+    )
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        const=DEFAULT_INDEX_PATH,
+        help=(
+            "Answer --date-range/--project from the SQLite session index written by 'ingest' instead of scanning "
+            f"and parsing session files. Defaults to {DEFAULT_INDEX_PATH} when given without PATH."
+        ),
+    )
+    parser.add_argument(
+        "--header-index",
+        nargs="?",
+        const=DEFAULT_HEADER_INDEX_PATH,
+        help=(
+            "Remember Codex session_meta headers so --project filtering does not reopen rollouts. "
+            f"Defaults to {DEFAULT_HEADER_INDEX_PATH} when given without PATH."
+        ),
+    )
+    parser.add_argument(
+        "--store",
+        nargs="?",
+        const=DEFAULT_STORE_PATH,
+        help=(
+            "Write per-session rows to day/project JSONL partitions under PATH and print only a pointer "
+            f"to them instead of signals.by_session. Defaults to {DEFAULT_STORE_PATH} when given without PATH."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse and analyze session files in N worker processes. Output matches the serial run.",
+    )
+    parser.add_argument(
+        "--discovery-threads",
+        type=int,
+        default=1,
+        help="List Codex session directories on N threads.",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=JSON_BACKENDS,
+        default="auto",
+        help="Decoder for transcript rows. auto uses orjson when it is installed.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Fold rows as they are read instead of loading and sorting each whole session.",
+    )
+    parser.add_argument(
+        "--reorder-window",
+        type=int,
+        default=DEFAULT_REORDER_WINDOW,
+        help="Rows held back to re-sequence out-of-order timestamps in --stream mode.",
+    )
+    parser.add_argument(
+        "--repeat-window",
+        type=int,
+        default=DEFAULT_REPEAT_WINDOW,
+        help=(
+            "Earlier user turns a turn is compared with when counting repeated instructions, "
+            f"up to {MAX_REPEAT_WINDOW}. 1 compares only the previous turn."
+        ),
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Stop starting new session files after SECONDS and report the sessions analyzed so far.",
+    )
     args = parser.parse_args(argv)
     if args.min_turns < 0:
         parser.error("--min-turns must be >= 0")
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if args.reorder_window < 1:
+        parser.error("--reorder-window must be >= 1")
+    if args.discovery_threads < 1:
+        parser.error("--discovery-threads must be >= 1")
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be > 0")
+    if not 1 <= args.repeat_window <= MAX_REPEAT_WINDOW:
+        parser.error(f"--repeat-window must be between 1 and {MAX_REPEAT_WINDOW}")
+    if args.index and not args.date_range:
+        parser.error("--index requires --date-range")
+    if args.index and args.cache:
+        parser.error("--index cannot be combined with --cache; the index already holds per-file state")
+    if args.index and args.workers != 1:
+        parser.error("--index cannot be combined with --workers; queries do not parse session files")
     if args.date_range:
         start = parse_date(args.date_range[0])
         end = parse_date(args.date_range[1])
@@ -1153,31 +2586,129 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     return args
 
 
-def run(argv: list[str]) -> int:
-    args = parse_args(argv)
+def parse_ingest_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="analyze_sessions.py ingest",
+        description="Incrementally update the SQLite session index from all Claude and Codex session files.",
+    )
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="SQLite index path.")
+    parser.add_argument("--workers", type=int, default=1, help="Parse changed session files in N worker processes.")
+    parser.add_argument("--json-backend", choices=JSON_BACKENDS, default="auto", help="Decoder for transcript rows.")
+    parser.add_argument(
+        "--repeat-window",
+        type=int,
+        default=DEFAULT_REPEAT_WINDOW,
+        help="Earlier user turns a turn is compared with when counting repeated instructions.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print structured JSON to stdout.")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if not 1 <= args.repeat_window <= MAX_REPEAT_WINDOW:
+        parser.error(f"--repeat-window must be between 1 and {MAX_REPEAT_WINDOW}")
+    return args
+
+
+def run_ingest(argv: list[str]) -> int:
+    args = parse_ingest_args(argv)
+    set_json_backend(args.json_backend)
+    set_repeat_window(args.repeat_window)
+    index = SessionIndex(expand_input_path(args.index))
+    try:
+        stats = ingest_sessions(index, discover_all_session_files(), args.workers)
+    finally:
+        index.close()
+    output = {"schema_version": SCHEMA_VERSION, "generated_at": utc_now_iso(), "index": str(index.path), **stats}
+    if args.json:
+        print(json.dumps(output, ensure_ascii=False, indent=2, sort_keys=True))
+    else:
+        print(f"Session index: {output['index']}")
+        print(f"Files: {stats['files']} (updated {stats['updated']}, removed {stats['removed']})")
+        print(f"Indexed sessions: {stats['indexed']}")
+    return 0
+
+
+def analysis_inputs_fingerprint(args: argparse.Namespace) -> str:
+    """Digest of what a report for ``args`` would read: analysis settings plus
+    the path, size and mtime of every session file (or the index) in scope.
+
+    Runs discovery only, so callers can tell whether a previous report is
+    still current without re-parsing any session.
+    """
+    set_repeat_window(args.repeat_window)
+    files: list[Path]
+    if args.index:
+        files = [expand_input_path(args.index)]
+    else:
+        headers = CodexHeaderIndex(expand_input_path(args.header_index)) if args.header_index else None
+        session_files, _ = find_session_files(args)
+        codex_files, _ = find_codex_session_files(args, headers)
+        files = session_files + codex_files
+    digest = hashlib.sha256(f"{analysis_signature()}\0{repeat_window}".encode("utf-8"))
+    for path in files:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        digest.update(f"\0{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
 
-    # Claude sessions
-    session_files, invalid_paths = find_session_files(args)
-    if invalid_paths:
-        print("invalid session path(s):", file=sys.stderr)
-        for path in invalid_paths:
-            print(f"  {path}", file=sys.stderr)
-        return 1
+def build_analysis_report(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the analysis described by parsed CLI ``args`` and return the report.
 
-    # Codex sessions
-    codex_files, codex_invalid = find_codex_session_files(args)
-    if codex_invalid:
-        for path in codex_invalid:
-            warn(f"invalid codex session path: {path}")
+    Exits like the CLI when explicit session paths are invalid.
+    """
+    deadline = time.monotonic() + args.time_budget if args.time_budget else None
+    set_json_backend(args.json_backend)
+    set_repeat_window(args.repeat_window)
+    parse_counters.clear()
 
+    cache = AnalysisCache(expand_input_path(args.cache)) if args.cache else None
     analyses: list[SessionAnalysis] = []
     sessions_skipped = 0
 
-    # Parse Claude sessions
-    for path in session_files:
-        messages, skipped_rows = parse_jsonl(path)
+    index = SessionIndex(expand_input_path(args.index), read_only=True) if args.index else None
+    headers = CodexHeaderIndex(expand_input_path(args.header_index)) if args.header_index and index is None else None
+    files_total: int | None = None
+    if index is not None:
+        start, end = args.date_range_dates
+        results: Iterator[tuple[SessionAnalysis | None, int]] = index.query(start, end, args.project)
+    else:
+        # Claude sessions
+        session_files, invalid_paths = find_session_files(args)
+        if invalid_paths:
+            raise SystemExit("\n".join(["invalid session path(s):", *(f"  {path}" for path in invalid_paths)]))
+
+        # Codex sessions
+        codex_files, codex_invalid = find_codex_session_files(args, headers)
+        if codex_invalid:
+            for path in codex_invalid:
+                warn(f"invalid codex session path: {path}")
+
+        jobs = [(path, "claude") for path in session_files] + [(path, "codex") for path in codex_files]
+        files_total = len(jobs)
+        reorder_window = args.reorder_window if args.stream else None
+        results = iter_session_file_analyses(jobs, cache, args.workers, reorder_window, headers)
+
+    files_scanned = 0
+    degradations: list[dict[str, Any]] = []
+    for analysis, skipped_rows in results:
+        if deadline is not None and time.monotonic() >= deadline:
+            degradations.append(
+                {
+                    "stage": "analyze",
+                    "kind": "session_cap",
+                    "detail": f"time budget of {args.time_budget:g}s ran out; analyzed the first {files_scanned} session files",
+                    "files_scanned": files_scanned,
+                    "files_total": files_total,
+                }
+            )
+            # Cancels worker jobs not yet started, then waits for running ones; files already cached still save below.
+            getattr(results, "close", lambda: None)()
+            break
+        files_scanned += 1
         sessions_skipped += skipped_rows
-        analysis = analyze_session(path, messages)
         if analysis is None:
             sessions_skipped += 1
             continue
@@ -1188,30 +2719,36 @@ def run(argv: list[str]) -> int:
             continue
         analyses.append(analysis)
 
-    # Parse Codex sessions
-    for path in codex_files:
-        messages, skipped_rows, meta = parse_codex_jsonl(path)
-        sessions_skipped += skipped_rows
-        if not messages:
-            sessions_skipped += 1
-            continue
-        project = project_from_cwd(meta.cwd)
-        analysis = analyze_session(path, messages, project_override=project)
-        if analysis is None:
-            sessions_skipped += 1
-            continue
-        if meta.is_subagent and meta.agent_role:
-            analysis.agent_dispatches[meta.agent_role] += 1
-        if args.date_range_dates and not in_date_range(analysis, *args.date_range_dates):
-            continue
-        if analysis.turn_count < args.min_turns:
-            sessions_skipped += 1
-            continue
-        analyses.append(analysis)
+    if cache is not None:
+        cache.save()
+    if headers is not None:
+        headers.save()
+    if index is not None:
+        index.close()
 
     analyses.sort(key=lambda item: (item.timestamp or datetime.min.replace(tzinfo=timezone.utc), item.session_id))
     date_range = tuple(args.date_range) if args.date_range else None
-    report = build_report(analyses, sessions_skipped, date_range)
+    store = None
+    if args.store:
+        store_root = expand_input_path(args.store)
+        partitions = write_signal_store(store_root, analyses)
+        store = {
+            "path": str(store_root),
+            "partitions": partitions,
+            "sessions": len(analyses),
+            # Partitions also hold rows from other runs; readers keep only these.
+            "session_ids": sorted({analysis.session_id for analysis in analyses}),
+        }
+    counters = ("files_prefiltered", "files_parsed", "files_resumed", "files_unchanged", "rows_parsed", "bytes_parsed")
+    diagnostics = {"files_scanned": files_scanned, **{name: parse_counters[name] for name in counters}}
+    return build_report(analyses, sessions_skipped, date_range, store, diagnostics, degradations)
+
+
+def run(argv: list[str]) -> int:
+    if argv[:1] == ["ingest"]:
+        return run_ingest(argv[1:])
+    args = parse_args(argv)
+    report = build_analysis_report(args)
     if args.json:
         print(json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True))
     else:
@@ -0,0 +1,1166 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+HYPERAGENT_DIR = Path(__file__).resolve().parent
+if str(HYPERAGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(HYPERAGENT_DIR))
+
+import analyze_sessions  # noqa: E402
+import score  # noqa: E402
+
+
+SCHEMA_VERSION = "1"
+DEFAULT_SEED = 20260413
+
+KOREAN_FRAGMENTS = [
+    "이 부분이 틀렸어",
+    "여기서 에러 나",
+    "아니 근데 이건 뭐야",
+    "다시 해줘",
+    "처음부터 다시",
+    "좋아 완벽해",
+    "고마워",
+    "ㅋㅋㅋ 대박",
+    "ㅇㅋ",
+    "왜 자꾸 같은 실수를 해",
+    "원래대로 되돌려줘",
+    "롤백해줘",
+    "계속 진행해",
+    "맞긴 한데 빠진 게 있어",
+    "테스트 코드도 같이 수정해줘",
+    "스킬 문서를 정리해줘",
+    "컴포넌트를 분리해줘",
+]
+
+ENGLISH_FRAGMENTS = [
+    "that is wrong",
+    "this doesn't work",
+    "try again",
+    "please cancel",
+    "looks good",
+    "thanks",
+    "perfect",
+    "refactor the parser",
+    "add a regression test",
+    "update scripts/hyperagent/score.py",
+    "run git revert HEAD",
+    "explain the error handling",
+]
+
+TOOL_SUCCESS_FRAGMENTS = [
+    "ok",
+    "3 passed in 0.42s",
+    "compiled successfully",
+    "Updated 2 files",
+    "On branch main, nothing to commit",
+    "src/app.py:12: def handler(event):",
+    "Wrote 148 lines to docs/README.md",
+]
+
+TOOL_ERROR_FRAGMENTS = [
+    "Traceback (most recent call last): ValueError",
+    "command failed with exit code 1",
+    "Permission denied",
+    "file not found: src/app.py",
+    "REDIRECT DETECTED",
+    "InputValidationError: missing field",
+    "Timeout waiting for server",
+]
+
+
+def synthetic_corpus(size: int, seed: int, fragments: list[str], max_parts: int = 4) -> list[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        parts = [rng.choice(fragments) for _ in range(rng.randint(1, max_parts))]
+        corpus.append(" ".join(parts))
+    return corpus
+
+
+def synthetic_tool_outputs(size: int, seed: int, error_rate: float) -> list[str]:
+    rng = random.Random(seed)
+    outputs = []
+    for _ in range(size):
+        parts = [rng.choice(TOOL_SUCCESS_FRAGMENTS) for _ in range(rng.randint(1, 3))]
+        if rng.random() < error_rate:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(TOOL_ERROR_FRAGMENTS))
+        outputs.append("\n".join(parts))
+    return outputs
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> tuple[float, Any]:
+    best = float("inf")
+    result: Any = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def legacy_matched_pattern(patterns: list[str], text: str) -> str | None:
+    for pattern in patterns:
+        if re.search(pattern, text):
+            return pattern
+    return None
+
+
+def classify_messages_legacy(messages: list[str]) -> list[tuple[bool, bool, str | None]]:
+    rows = []
+    for text in messages:
+        correction = legacy_matched_pattern(analyze_sessions.NEGATION_EXEMPTIONS, text) is None and (
+            legacy_matched_pattern(analyze_sessions.CORRECTION_PATTERNS, text) is not None
+            or legacy_matched_pattern(analyze_sessions.REJECTION_PATTERNS, text) is not None
+        )
+        praise = legacy_matched_pattern(analyze_sessions.PRAISE_PATTERNS, text) is not None
+        rollback = legacy_matched_pattern(analyze_sessions.ROLLBACK_PATTERNS, text)
+        rows.append((correction, praise, rollback))
+    return rows
+
+
+def classify_messages_engine(messages: list[str]) -> list[tuple[bool, bool, str | None]]:
+    rows = []
+    for text in messages:
+        correction = not analyze_sessions.NEGATION_MATCHER.matches(text) and (
+            analyze_sessions.CORRECTION_MATCHER.matches(text) or analyze_sessions.REJECTION_MATCHER.matches(text)
+        )
+        praise = analyze_sessions.PRAISE_MATCHER.matches(text)
+        rollback = analyze_sessions.ROLLBACK_MATCHER.search(text)
+        rows.append((correction, praise, rollback))
+    return rows
+
+
+def classify_outputs_legacy(outputs: list[str]) -> list[str | None]:
+    return [legacy_matched_pattern(analyze_sessions.TOOL_ERROR_PATTERNS, text) for text in outputs]
+
+
+def classify_outputs_engine(outputs: list[str]) -> list[str | None]:
+    return [analyze_sessions.TOOL_ERROR_MATCHER.search(text) for text in outputs]
+
+
+def bench_signal_matcher(args: argparse.Namespace) -> dict[str, Any]:
+    messages = synthetic_corpus(args.messages, args.seed, KOREAN_FRAGMENTS + ENGLISH_FRAGMENTS)
+    outputs = synthetic_tool_outputs(args.messages, args.seed + 1, args.error_rate)
+
+    legacy_seconds, legacy_rows = best_of(args.repeat, lambda: classify_messages_legacy(messages))
+    engine_seconds, engine_rows = best_of(args.repeat, lambda: classify_messages_engine(messages))
+    legacy_error_seconds, legacy_errors = best_of(args.repeat, lambda: classify_outputs_legacy(outputs))
+    engine_error_seconds, engine_errors = best_of(args.repeat, lambda: classify_outputs_engine(outputs))
+
+    return {
+        "benchmark": "signal-matcher",
+        "messages": len(messages),
+        "tool_outputs": len(outputs),
+        "results_match": legacy_rows == engine_rows and legacy_errors == engine_errors,
+        "user_messages": timing_row(legacy_seconds, engine_seconds),
+        "tool_outputs_timing": timing_row(legacy_error_seconds, engine_error_seconds),
+    }
+
+
+def synthetic_session(size: int, seed: int) -> list[analyze_sessions.StructuredMessage]:
+    """A user -> tool call -> tool result -> assistant cycle repeated up to ``size`` messages."""
+    rng = random.Random(seed)
+    started = datetime(2026, 4, 13, tzinfo=timezone.utc)
+    messages: list[analyze_sessions.StructuredMessage] = []
+    for index in range(size):
+        phase = index % 4
+        tool_id = f"tool-{index // 4}"
+        common = {
+            "uuid": f"msg-{index}",
+            "parent_uuid": f"msg-{index - 1}" if index else None,
+            "timestamp": started + timedelta(seconds=index),
+            "session_id": "bench-session",
+            "git_branch": "main",
+        }
+        if phase == 0:
+            text = " ".join(rng.choice(KOREAN_FRAGMENTS + ENGLISH_FRAGMENTS) for _ in range(rng.randint(1, 3)))
+            messages.append(analyze_sessions.StructuredMessage(msg_type="user", content_text=text, **common))
+        elif phase == 1:
+            call = analyze_sessions.ToolCall(tool_id=tool_id, tool_name="Read", input_data={"file_path": f"src/module_{index % 50}.py"})
+            messages.append(analyze_sessions.StructuredMessage(msg_type="assistant", content_text="", tool_calls=[call], **common))
+        elif phase == 2:
+            is_error = rng.random() < 0.1
+            content = rng.choice(TOOL_ERROR_FRAGMENTS if is_error else TOOL_SUCCESS_FRAGMENTS)
+            pattern = analyze_sessions.TOOL_ERROR_MATCHER.search(content)
+            result = analyze_sessions.compact_tool_result(tool_id, is_error or pattern is not None, pattern)
+            messages.append(analyze_sessions.StructuredMessage(msg_type="user", content_text="", tool_results=[result], **common))
+        else:
+            messages.append(analyze_sessions.StructuredMessage(msg_type="assistant", content_text="Done.", **common))
+    return messages
+
+
+def legacy_direct_membership(messages: list[analyze_sessions.StructuredMessage]) -> int:
+    # The pre-linear signal pass: list membership with dataclass __eq__ per message.
+    direct_user_messages = [
+        msg for msg in messages if msg.msg_type == "user" and not msg.is_meta and msg.content_text and not msg.tool_results
+    ]
+    return sum(1 for message in messages if message in direct_user_messages)
+
+
+def bench_scaling(args: argparse.Namespace) -> dict[str, Any]:
+    path = Path("bench-session.jsonl")
+    rows = []
+    for size in args.sizes:
+        messages = synthetic_session(size, args.seed)
+        seconds, analysis = best_of(args.repeat, lambda: analyze_sessions.analyze_session(path, messages))
+        row: dict[str, Any] = {
+            "messages": size,
+            "turn_count": analysis.turn_count if analysis else 0,
+            "seconds": round(seconds, 6),
+            "microseconds_per_message": round(seconds / size * 1_000_000, 3) if size else 0.0,
+        }
+        if size <= args.reference_max:
+            legacy_seconds, legacy_turns = best_of(1, lambda: legacy_direct_membership(messages))
+            row["legacy_membership_seconds"] = round(legacy_seconds, 6)
+            row["legacy_turn_count_match"] = legacy_turns == row["turn_count"]
+        rows.append(row)
+
+    per_message = [row["microseconds_per_message"] for row in rows if row["messages"]]
+    return {
+        "benchmark": "scaling",
+        "sizes": rows,
+        "per_message_growth": round(per_message[-1] / per_message[0], 2) if len(per_message) > 1 and per_message[0] else 1.0,
+        "results_match": all(row.get("legacy_turn_count_match", True) for row in rows),
+    }
+
+
+def write_synthetic_session_file(path: Path, rows: int, output_bytes: int, seed: int) -> None:
+    rng = random.Random(seed)
+    started = datetime(2026, 4, 13, tzinfo=timezone.utc)
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(rows):
+            # Jitter timestamps so the reorder buffer has real work to do.
+            timestamp = (started + timedelta(seconds=index + rng.randint(-3, 3))).isoformat().replace("+00:00", "Z")
+            if index % 2 == 0:
+                content: Any = rng.choice(KOREAN_FRAGMENTS + ENGLISH_FRAGMENTS)
+            else:
+                content = [{"type": "tool_result", "tool_use_id": f"tool-{index}", "content": "x" * output_bytes}]
+            row = {"type": "user", "sessionId": "bench", "timestamp": timestamp, "message": {"content": content}}
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def measure_peak(func: Callable[[], Any]) -> tuple[float, int, Any]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def bench_stream(args: argparse.Namespace) -> dict[str, Any]:
+    rows = []
+    results_match = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.rows:
+            path = Path(tmpdir) / f"session-{size}.jsonl"
+            write_synthetic_session_file(path, size, args.output_bytes, args.seed)
+            sorted_seconds, sorted_peak, (sorted_state, _, _) = measure_peak(
+                lambda: analyze_sessions.collect_session_state(path, "claude")
+            )
+            stream_seconds, stream_peak, (stream_state, _, _) = measure_peak(
+                lambda: analyze_sessions.collect_session_state(path, "claude", reorder_window=args.reorder_window)
+            )
+            results_match = results_match and stream_state == sorted_state
+            rows.append(
+                {
+                    "rows": size,
+                    "file_bytes": path.stat().st_size,
+                    "sorted_peak_bytes": sorted_peak,
+                    "stream_peak_bytes": stream_peak,
+                    "sorted_seconds": round(sorted_seconds, 6),
+                    "stream_seconds": round(stream_seconds, 6),
+                }
+            )
+    return {
+        "benchmark": "stream",
+        "reorder_window": args.reorder_window,
+        "sizes": rows,
+        "results_match": results_match,
+    }
+
+
+def write_synthetic_codex_file(path: Path, rows: int, output_bytes: int, seed: int) -> None:
+    """Compact rollout rows in the Codex writer layout, with bulky event_msg/reasoning rows mixed in."""
+    rng = random.Random(seed)
+    started = datetime(2026, 4, 13, tzinfo=timezone.utc)
+
+    def dump(index: int, row_type: str, payload: dict[str, Any]) -> str:
+        timestamp = (started + timedelta(seconds=index)).isoformat().replace("+00:00", "Z")
+        row = {"timestamp": timestamp, "type": row_type, "payload": payload}
+        return json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write(dump(0, "session_meta", {"id": "bench", "cwd": "/work/bench", "source": "cli"}))
+        for index in range(1, rows):
+            phase = index % 5
+            if phase == 0:
+                text = rng.choice(KOREAN_FRAGMENTS + ENGLISH_FRAGMENTS)
+                payload = {"type": "message", "role": "user", "content": [{"type": "input_text", "text": text}]}
+                handle.write(dump(index, "response_item", payload))
+            elif phase == 1:
+                arguments = json.dumps({"cmd": f"cat src/module_{index % 50}.py"})
+                payload = {"type": "function_call", "name": "exec_command", "call_id": f"c{index}", "arguments": arguments}
+                handle.write(dump(index, "response_item", payload))
+            elif phase == 2:
+                output = rng.choice(TOOL_SUCCESS_FRAGMENTS) + "\n" + "x" * output_bytes
+                payload = {"type": "function_call_output", "call_id": f"c{index - 1}", "output": output}
+                handle.write(dump(index, "response_item", payload))
+            elif phase == 3:
+                payload = {"type": "exec_command_end", "stdout": "x" * output_bytes, "exit_code": 0}
+                handle.write(dump(index, "event_msg", payload))
+            else:
+                payload = {"type": "reasoning", "summary": [], "encrypted_content": "x" * output_bytes}
+                handle.write(dump(index, "response_item", payload))
+
+
+def fold_file(path: Path, source: str, prescreen: bool = True) -> analyze_sessions.SessionState:
+    if source == "codex":
+        reader: Any = analyze_sessions.CodexMessageReader(path, prescreen=prescreen)
+    else:
+        reader = analyze_sessions.ClaudeMessageReader(path)
+    messages = sorted(reader, key=analyze_sessions.message_sort_key)
+    return analyze_sessions.fold_messages(analyze_sessions.SessionState(), messages)
+
+
+def decode_file(path: Path, source: str, prescreen: bool = True) -> int:
+    decoded = 0
+    for _, line in analyze_sessions.JsonlCursor(path):
+        stripped = line.strip()
+        if source == "codex" and prescreen and analyze_sessions.codex_row_is_ignorable(stripped):
+            continue
+        analyze_sessions.decode_row(stripped)
+        decoded += 1
+    return decoded
+
+
+def bench_json_backend(args: argparse.Namespace) -> dict[str, Any]:
+    backends = ["json"] + (["orjson"] if analyze_sessions.orjson is not None else [])
+    previous_backend = analyze_sessions.json_backend
+    rows = []
+    states: dict[str, list[analyze_sessions.SessionState]] = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claude_path = Path(tmpdir) / "claude.jsonl"
+            codex_path = Path(tmpdir) / "codex.jsonl"
+            write_synthetic_session_file(claude_path, args.rows, args.output_bytes, args.seed)
+            write_synthetic_codex_file(codex_path, args.rows, args.output_bytes, args.seed)
+            cases = [("claude", claude_path, True), ("codex", codex_path, False), ("codex", codex_path, True)]
+            for backend in backends:
+                analyze_sessions.set_json_backend(backend)
+                for source, path, prescreen in cases:
+                    decode_seconds, _ = best_of(args.repeat, lambda: decode_file(path, source, prescreen))
+                    seconds, state = best_of(args.repeat, lambda: fold_file(path, source, prescreen))
+                    states.setdefault(source, []).append(state)
+                    rows.append(
+                        {
+                            "backend": backend,
+                            "source": source,
+                            "prescreen": prescreen if source == "codex" else None,
+                            "rows": args.rows,
+                            "decode_rows_per_second": round(args.rows / decode_seconds) if decode_seconds > 0 else 0,
+                            "analyze_rows_per_second": round(args.rows / seconds) if seconds > 0 else 0,
+                        }
+                    )
+    finally:
+        analyze_sessions.set_json_backend(previous_backend)
+    return {
+        "benchmark": "json-backend",
+        "available_backends": backends,
+        "results": rows,
+        "results_match": all(all(state == group[0] for state in group) for group in states.values()),
+    }
+
+
+def legacy_repeat_count(texts: list[str], window: int) -> int:
+    # Pairwise is_similar_instruction against each earlier turn, re-tokenizing both sides every time.
+    count = 0
+    for index, text in enumerate(texts):
+        earlier = texts[max(0, index - window) : index]
+        if any(analyze_sessions.is_similar_instruction(previous, text) for previous in earlier):
+            count += 1
+    return count
+
+
+def engine_repeat_count(texts: list[str], window: int) -> int:
+    recent = analyze_sessions.InstructionWindow()
+    return sum(recent.observe(analyze_sessions.significant_tokens(text), window) > 0 for text in texts)
+
+
+def bench_repeats(args: argparse.Namespace) -> dict[str, Any]:
+    texts = synthetic_corpus(args.messages, args.seed, KOREAN_FRAGMENTS + ENGLISH_FRAGMENTS, max_parts=6)
+    rows = []
+    results_match = True
+    for window in args.windows:
+        legacy_seconds, legacy_count = best_of(args.repeat, lambda: legacy_repeat_count(texts, window))
+        engine_seconds, engine_count = best_of(args.repeat, lambda: engine_repeat_count(texts, window))
+        results_match = results_match and legacy_count == engine_count
+        rows.append({"window": window, "repeats": engine_count, **timing_row(legacy_seconds, engine_seconds)})
+    return {
+        "benchmark": "repeats",
+        "messages": args.messages,
+        "windows": rows,
+        "results_match": results_match,
+    }
+
+
+def write_synthetic_codex_tree(root: Path, files: int, seed: int, active_share: float = 0.3) -> None:
+    """Empty rollouts spread over a year of sessions/YYYY/MM/DD and monthly archived_sessions dirs."""
+    rng = random.Random(seed)
+    first_day = date(2025, 5, 1)
+    archived_dirs: dict[str, date] = {}
+    for index in range(files):
+        day = first_day + timedelta(days=rng.randrange(365))
+        name = f"rollout-{day.isoformat()}T{rng.randrange(24):02d}-00-00-{index:06d}.jsonl"
+        if rng.random() < active_share:
+            directory = root / "sessions" / f"{day.year:04d}" / f"{day.month:02d}" / f"{day.day:02d}"
+        else:
+            month = f"{day.year:04d}-{day.month:02d}"
+            directory = root / "archived_sessions" / month
+            archived_dirs[month] = max(day, archived_dirs.get(month, day))
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / name).touch()
+    for month, latest in archived_dirs.items():
+        stamp = datetime(latest.year, latest.month, latest.day, 23, tzinfo=timezone.utc).timestamp()
+        os.utime(root / "archived_sessions" / month, (stamp, stamp))
+
+
+def legacy_codex_paths_for_range(start: date, end: date) -> list[Path]:
+    # Discovery before scandir: is_dir + glob per day, then every archived file.
+    home = analyze_sessions.codex_home()
+    paths: list[Path] = []
+    current = start
+    while current <= end:
+        day_dir = home / "sessions" / str(current.year) / f"{current.month:02d}" / f"{current.day:02d}"
+        if day_dir.is_dir():
+            paths.extend(sorted(day_dir.glob("rollout-*.jsonl")))
+        current += timedelta(days=1)
+    archived = home / "archived_sessions"
+    for child in sorted(archived.iterdir()) if archived.is_dir() else []:
+        if not child.is_dir():
+            continue
+        for f in sorted(child.glob("*.jsonl")):
+            try:
+                file_date = date.fromisoformat(f.stem.removeprefix("rollout-")[:10])
+            except ValueError:
+                continue
+            if start <= file_date <= end:
+                paths.append(f)
+    return paths
+
+
+def scandir_codex_paths_for_range(start: date, end: date, threads: int) -> list[Path]:
+    paths = analyze_sessions._codex_active_paths_for_range(start, end, threads)
+    paths.extend(analyze_sessions._codex_archived_paths_for_range(start, end, threads))
+    return paths
+
+
+def bench_discovery(args: argparse.Namespace) -> dict[str, Any]:
+    ranges = {
+        "one-day": (date(2026, 4, 13), date(2026, 4, 13)),
+        "one-month": (date(2026, 3, 14), date(2026, 4, 13)),
+        "full-year": (date(2025, 5, 1), date(2026, 4, 30)),
+    }
+    rows = []
+    results_match = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "codex"
+        write_synthetic_codex_tree(root, args.files, args.seed)
+        with patch.dict(os.environ, {"CODEX_HOME": str(root)}):
+            for label, (start, end) in ranges.items():
+                legacy_seconds, expected = best_of(args.repeat, lambda: legacy_codex_paths_for_range(start, end))
+                row: dict[str, Any] = {"range": label, "files_found": len(expected), "legacy_seconds": round(legacy_seconds, 6)}
+                for threads in args.threads:
+                    seconds, found = best_of(args.repeat, lambda: scandir_codex_paths_for_range(start, end, threads))
+                    results_match = results_match and found == expected
+                    row[f"scandir_threads_{threads}"] = timing_row(legacy_seconds, seconds)
+                rows.append(row)
+    return {
+        "benchmark": "discovery",
+        "files": args.files,
+        "ranges": rows,
+        "results_match": results_match,
+    }
+
+
+EVOLVE_SCRIPT = HYPERAGENT_DIR / "evolve.py"
+EVOLVE_VOLATILE = re.compile(r"\d{4}-\d{2}-\d{2}T[\d:.]+Z|v-\d{8}-\d{6}|/[^\s\"]*hyperagent-evolve-[^/\"]+|report_source\": \"[^\"]+")
+SYNTHETIC_TOOLS = ["Bash", "Read", "Edit", "Skill", "Agent"]
+
+
+def write_synthetic_claude_corpus(root: Path, sessions: int, turns: int, seed: int, projects: int = 20) -> None:
+    """Claude project transcripts with user turns, tool calls, tool results and praise/correction text."""
+    rng = random.Random(seed)
+    started = datetime(2026, 4, 13, tzinfo=timezone.utc)
+    for session in range(sessions):
+        project_dir = root / "projects" / f"-bench-proj-{session % projects}"
+        project_dir.mkdir(parents=True, exist_ok=True)
+        session_id = f"bench-{session}"
+        rows = []
+        for turn in range(turns):
+            timestamp = (started + timedelta(seconds=session + turn * 4)).isoformat().replace("+00:00", "Z")
+            tool_id = f"{session_id}-tool-{turn}"
+            tool = rng.choice(SYNTHETIC_TOOLS)
+            text = " ".join(rng.choice(KOREAN_FRAGMENTS + ENGLISH_FRAGMENTS) for _ in range(rng.randint(1, 3)))
+            call_input = {"command": "pytest tests", "file_path": f"src/module_{turn % 50}.py"}
+            if tool == "Skill":
+                call_input["skill"] = rng.choice(["commit", "review", "plan"])
+            if tool == "Agent":
+                call_input["subagent_type"] = rng.choice(["verification-worker", "explorer"])
+            is_error = rng.random() < 0.1
+            output = rng.choice(TOOL_ERROR_FRAGMENTS if is_error else TOOL_SUCCESS_FRAGMENTS)
+            common = {"sessionId": session_id, "timestamp": timestamp, "cwd": f"/bench-proj-{session % projects}"}
+            rows.append({"type": "user", **common, "message": {"content": text}})
+            rows.append(
+                {
+                    "type": "assistant",
+                    **common,
+                    "message": {"content": [{"type": "tool_use", "id": tool_id, "name": tool, "input": call_input}]},
+                }
+            )
+            rows.append(
+                {
+                    "type": "user",
+                    **common,
+                    "message": {"content": [{"type": "tool_result", "tool_use_id": tool_id, "is_error": is_error, "content": output}]},
+                }
+            )
+        with (project_dir / f"{session_id}.jsonl").open("w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def run_evolve_child(home: Path, claude_root: Path, in_process: bool) -> tuple[float, int, dict[str, Any]]:
+    """Run one dry-run evolve cycle in a fresh child and return wall seconds, peak RSS bytes and its JSON output.
+
+    ``wait4`` reports the largest resident set of the child or any step it waited on,
+    so subprocess mode is charged for its heaviest step interpreter.
+    """
+    command = [sys.executable, str(EVOLVE_SCRIPT), "--dry-run", "--json", "--date-range", "2026-04-13", "2026-04-13"]
+    if in_process:
+        command.append("--in-process")
+    env = {**os.environ, "HOME": str(home), "CLAUDE_HOME": str(claude_root), "CODEX_HOME": str(home / ".codex")}
+    with tempfile.TemporaryFile() as stdout:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, stdout=stdout, stderr=subprocess.DEVNULL, env=env)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+        stdout.seek(0)
+        output = json.loads(stdout.read())
+    if process.returncode != 0 or output.get("status") != "success":
+        raise SystemExit(f"evolve benchmark run failed: {output.get('error')}")
+    # ru_maxrss is in bytes on macOS and KiB on Linux.
+    return seconds, usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024, output
+
+
+def normalized_evolve_output(output: dict[str, Any]) -> str:
+    comparable = {"outputs": output["outputs"], "steps": [step.get("output_summary") for step in output["pipeline_steps"]]}
+    return EVOLVE_VOLATILE.sub("<volatile>", json.dumps(comparable, ensure_ascii=False, sort_keys=True))
+
+
+def bench_evolve(args: argparse.Namespace) -> dict[str, Any]:
+    modes = {"subprocess": False, "in_process": True}
+    measured: dict[str, dict[str, Any]] = {}
+    normalized: dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        corpus = Path(tmpdir) / "corpus"
+        write_synthetic_claude_corpus(corpus, args.sessions, args.turns, args.seed)
+        for label, in_process in modes.items():
+            best: tuple[float, int] | None = None
+            for attempt in range(args.repeat):
+                # Analyze and score keep their state under CLAUDE_HOME, so every run gets its own copy of the corpus.
+                run_root = Path(tmpdir) / f"run-{label}-{attempt}"
+                claude_root = run_root / "claude"
+                shutil.copytree(corpus, claude_root)
+                seconds, peak, output = run_evolve_child(run_root / "home", claude_root, in_process)
+                best = (seconds, peak) if best is None else (min(best[0], seconds), min(best[1], peak))
+                result = normalized_evolve_output(output).replace(str(run_root), "<run>")
+                if normalized.setdefault(label, result) != result:
+                    raise SystemExit(f"evolve benchmark: {label} runs produced different outputs")
+            assert best is not None
+            measured[label] = {"seconds": round(best[0], 6), "peak_rss_bytes": best[1]}
+    if normalized["subprocess"] != normalized["in_process"]:
+        raise SystemExit("evolve benchmark: subprocess and in-process runs produced different outputs")
+    return {
+        "benchmark": "evolve",
+        "sessions": args.sessions,
+        "turns": args.turns,
+        "modes": measured,
+        "wall_time": timing_row(measured["subprocess"]["seconds"], measured["in_process"]["seconds"]),
+        "results_match": True,
+    }
+
+
+def synthetic_adoption_report(sessions: int, seed: int, files_per_session: int = 6) -> dict[str, Any]:
+    """An analysis report whose sessions touch random tracked files of this repo."""
+    tracked = subprocess.run(
+        ["git", "ls-files"], cwd=score.REPO_ROOT, text=True, stdout=subprocess.PIPE, check=True
+    ).stdout.split()
+    rng = random.Random(seed)
+    rows = []
+    for index in range(sessions):
+        rows.append(
+            {
+                "session_id": f"bench-{index}",
+                "timestamp": f"2026-04-{1 + index % 28:02d}T00:00:00Z",
+                "turn_count": 6,
+                "skill_invocations": [{"skill": rng.choice(["commit", "review", "plan", "build"]), "count": 1}],
+                "agent_dispatches": [{"agent": rng.choice(["verification-worker", "explorer"]), "count": 1}],
+                "files_touched": rng.sample(tracked, min(files_per_session, len(tracked))),
+            }
+        )
+    return {"schema_version": "1", "signals": {"by_session": rows, "aggregated": {}}}
+
+
+def legacy_commit_adoption_rate(files: set[str], repo_path: Path) -> tuple[int, int]:
+    """One git blame per touched file, repeated for every entity that touched it."""
+    committed_lines = 0
+    total_lines = 0
+    for raw_file in sorted(files):
+        path = Path(raw_file)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(repo_path.resolve())
+            except ValueError:
+                continue
+        if not (repo_path / path).is_file():
+            continue
+        result = subprocess.run(
+            ["git", "blame", "--line-porcelain", "--", str(path)],
+            cwd=repo_path,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        if result.returncode == 0:
+            committed, total = score.blame_line_counts(result.stdout)
+            committed_lines += committed
+            total_lines += total
+    return committed_lines, total_lines
+
+
+def entity_files(samples: list[score.SessionSample]) -> dict[tuple[str, str], set[str]]:
+    files: dict[tuple[str, str], set[str]] = {}
+    for sample in samples:
+        files.setdefault((sample.entity_type, sample.entity_id), set()).update(sample.touched_files)
+    return files
+
+
+def adoption_line_counts(adoption: score.CommitAdoption, files: dict[tuple[str, str], set[str]]) -> dict[tuple[str, str], tuple[int, int]]:
+    adoption.prepare({path for touched in files.values() for path in touched})
+    counts = {}
+    for key, touched in files.items():
+        rate = adoption.rate(key[1], touched)
+        counts[key] = (rate.get("committed_lines", 0), rate.get("total_lines", 0))
+    return counts
+
+
+def bench_blame(args: argparse.Namespace) -> dict[str, Any]:
+    files = entity_files(score.build_samples(synthetic_adoption_report(args.sessions, args.seed)))
+    unique_files = len({path for touched in files.values() for path in touched})
+    legacy_seconds, expected = best_of(
+        args.repeat, lambda: {key: legacy_commit_adoption_rate(touched, score.REPO_ROOT) for key, touched in files.items()}
+    )
+    row: dict[str, Any] = {"legacy_seconds": round(legacy_seconds, 6)}
+    results_match = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "blame-cache.json"
+        for workers in args.workers:
+
+            def cold() -> dict[tuple[str, str], tuple[int, int]]:
+                cache_path.unlink(missing_ok=True)
+                adoption = score.CommitAdoption(score.REPO_ROOT, cache_path, workers, engine="blame")
+                counts = adoption_line_counts(adoption, files)
+                adoption.save()
+                return counts
+
+            seconds, found = best_of(args.repeat, cold)
+            results_match = results_match and found == expected
+            row[f"cold_workers_{workers}"] = timing_row(legacy_seconds, seconds)
+        seconds, found = best_of(
+            args.repeat, lambda: adoption_line_counts(score.CommitAdoption(score.REPO_ROOT, cache_path), files)
+        )
+        results_match = results_match and found == expected
+        row["warm_cache"] = timing_row(legacy_seconds, seconds)
+    return {
+        "benchmark": "blame",
+        "sessions": args.sessions,
+        "entities": len(files),
+        "unique_files": unique_files,
+        "timings": row,
+        "results_match": results_match,
+    }
+
+
+def git_fixture(root: Path, *args: str) -> None:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Bench Fixture Author",
+        "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+        "GIT_COMMITTER_NAME": "Bench Fixture Author",
+        "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+    }
+    subprocess.run(["git", *args], cwd=root, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def write_adoption_repo(root: Path, files: int, lines: int, commits: int, seed: int) -> list[str]:
+    """A git repo of large text files with history and uncommitted edits; returns the file paths."""
+    rng = random.Random(seed)
+    paths = [f"src/module_{index:04d}.py" for index in range(files)]
+    contents = {path: [f"line {index} of {path}" for index in range(lines)] for path in paths}
+    git_fixture(root, "init", "-q")
+    for commit in range(commits):
+        for path in paths:
+            if commit:
+                for index in rng.sample(range(len(contents[path])), max(len(contents[path]) // 50, 1)):
+                    contents[path][index] = f"rev {commit}: {rng.random():.6f}"
+            target = root / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text("\n".join(contents[path]) + "\n", encoding="utf-8")
+        git_fixture(root, "add", "-A")
+        git_fixture(root, "commit", "-q", "-m", f"revision {commit}")
+    # Uncommitted work: edited, appended, truncated, unterminated, staged-new, untracked and binary files.
+    for path in rng.sample(paths, max(files // 3, 1)):
+        body = contents[path]
+        for index in rng.sample(range(len(body)), max(len(body) // 20, 1)):
+            body[index] = f"edit {rng.random():.6f}"
+        kind = rng.randrange(3)
+        if kind == 0:
+            body.extend(f"appended {index}" for index in range(rng.randrange(1, 40)))
+        elif kind == 1:
+            del body[rng.randrange(len(body)) :]
+        (root / path).write_text("\n".join(body) + ("" if kind == 2 else "\n"), encoding="utf-8")
+    (root / "src" / "blob.bin").write_bytes(bytes(rng.randrange(256) for _ in range(4096)))
+    git_fixture(root, "add", "src/blob.bin")
+    git_fixture(root, "commit", "-q", "-m", "binary")
+    (root / "src" / "blob.bin").write_bytes(bytes(rng.randrange(256) for _ in range(4096)))
+    (root / "src" / "staged_new.py").write_text("new = 1\nnewer = 2\n", encoding="utf-8")
+    git_fixture(root, "add", "src/staged_new.py")
+    (root / "src" / "untracked.py").write_text("scratch = 1\n", encoding="utf-8")
+    return [*paths, "src/staged_new.py", "src/untracked.py", "src/blob.bin"]
+
+
+def adoption_file_counts(root: Path, paths: list[str], engine: str, workers: int) -> dict[str, tuple[int, int] | None]:
+    adoption = score.CommitAdoption(root, workers=workers, engine=engine)
+    adoption.prepare(paths)
+    return {path: adoption.counts.get(path) for path in paths}
+
+
+def bench_adoption(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        paths = write_adoption_repo(root, args.files, args.lines, args.commits, args.seed)
+        blame_seconds, expected = best_of(args.repeat, lambda: adoption_file_counts(root, paths, "blame", args.workers))
+        score_counters_before = score.score_counters["git_blame_calls"]
+        plumbing_seconds, found = best_of(args.repeat, lambda: adoption_file_counts(root, paths, "plumbing", args.workers))
+        fallback_blames = (score.score_counters["git_blame_calls"] - score_counters_before) // max(args.repeat, 1)
+    return {
+        "benchmark": "adoption",
+        "files": len(paths),
+        "lines_per_file": args.lines,
+        "commits": args.commits,
+        "workers": args.workers,
+        "fallback_blames": fallback_blames,
+        "timings": timing_row(blame_seconds, plumbing_seconds),
+        "results_match": found == expected,
+    }
+
+
+SYNTHETIC_DIMENSIONS = {
+    "skill": ["acceptance_rate", "modification_freq", "completion_rate", "rework_rate", "usage_frequency"],
+    "agent": ["accuracy", "relevance", "false_positive_rate", "usage_frequency"],
+    "orchestration": ["dispatch_accuracy", "fanout_efficiency", "routing_relevance"],
+}
+
+
+def synthetic_samples(size: int, entities: int, seed: int) -> list[score.SessionSample]:
+    rng = random.Random(seed)
+    start = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    types = list(SYNTHETIC_DIMENSIONS)
+    samples = []
+    for index in range(size):
+        entity_type = types[index % len(types)]
+        session = index // len(types)
+        samples.append(
+            score.SessionSample(
+                entity_type=entity_type,
+                entity_id=f"{entity_type}-{rng.randrange(entities)}",
+                session_id=f"s-{session}",
+                timestamp=start + timedelta(minutes=session % 43200),
+                count=rng.randrange(1, 4),
+                turn_count=rng.randrange(1, 60),
+                complexity_score=0.0,
+                negative_factor=1.0,
+                dimensions={name: rng.random() for name in SYNTHETIC_DIMENSIONS[entity_type]},
+                composite=rng.random(),
+                negative_total=0.0,
+            )
+        )
+    return samples
+
+
+def store_from_samples(samples: list[score.SessionSample]) -> score.SampleStore:
+    """The same samples in a SampleStore, one session per distinct session id."""
+    store = score.SampleStore()
+    sessions: dict[str, int] = {}
+    for sample in samples:
+        session = sessions.get(sample.session_id)
+        if session is None:
+            session = sessions[sample.session_id] = store.add_session(sample.session_id, sample.timestamp, sample.touched_files)
+        store.add(
+            session,
+            entity_type=sample.entity_type,
+            entity_id=sample.entity_id,
+            count=sample.count,
+            turn_count=sample.turn_count,
+            complexity_score=sample.complexity_score,
+            negative_factor=sample.negative_factor,
+            dimensions=sample.dimensions,
+            composite=sample.composite,
+            negative_total=sample.negative_total,
+        )
+    return store
+
+
+def legacy_weighted_average(rows: list[tuple[float, float]]) -> float:
+    """Per-dimension weighted average as score computed it before ``dimension_sums``."""
+    total_weight = score.ordered_sum(weight for _, weight in rows)
+    if total_weight <= 0:
+        return 0.0
+    return score.ordered_sum(value * weight for value, weight in rows) / total_weight
+
+
+def legacy_entity_aggregates(samples: list[score.SessionSample], reference: datetime, half_life_days: int) -> dict[str, Any]:
+    """Per-(dimension, sample) weights and repeated session sets, as aggregate_entity_scores did before."""
+    grouped: dict[str, list[score.SessionSample]] = {}
+    for sample in samples:
+        grouped.setdefault(score.entity_key(sample.entity_type, sample.entity_id), []).append(sample)
+    rows = {}
+    for key, entity_samples in sorted(grouped.items()):
+        dimension_names = sorted({name for sample in entity_samples for name in sample.dimensions})
+        dimensions = {
+            name: legacy_weighted_average(
+                [
+                    (
+                        sample.dimensions.get(name, 0.0),
+                        score.session_weight(sample.turn_count)
+                        * score.decay_weight(sample.timestamp, reference, half_life_days)
+                        * max(sample.count, 1),
+                    )
+                    for sample in entity_samples
+                ]
+            )
+            for name in dimension_names
+        }
+        unique_sessions = len({sample.session_id for sample in entity_samples})
+        rows[key] = (
+            {name: score.rounded(value) for name, value in dimensions.items()},
+            len({sample.session_id for sample in entity_samples}),
+            sorted({sample.session_id for sample in entity_samples}),
+            unique_sessions,
+        )
+    # establish_missing_baselines regrouped the same samples.
+    regrouped: dict[str, list[score.SessionSample]] = {}
+    for sample in samples:
+        regrouped.setdefault(score.entity_key(sample.entity_type, sample.entity_id), []).append(sample)
+    for key, entity_samples in sorted(regrouped.items()):
+        sorted({sample.session_id for sample in entity_samples})
+    return {key: row[:3] for key, row in rows.items()}
+
+
+def single_pass_entity_aggregates(samples: score.SampleStore, reference: datetime, half_life_days: int) -> dict[str, Any]:
+    grouped = samples.groups()
+    averages = score.dimension_averages(samples, reference, half_life_days, grouped)
+    rows = {}
+    for key, indices in grouped.items():
+        session_ids = sorted({samples.session_ids[session] for session in samples.sessions_of(indices)})
+        rows[key] = ({name: score.rounded(value) for name, value in averages[key].items()}, len(session_ids), session_ids)
+    return rows
+
+
+def bench_aggregate(args: argparse.Namespace) -> dict[str, Any]:
+    samples = synthetic_samples(args.samples, args.entities, args.seed)
+    store = store_from_samples(samples)
+    reference = max(sample.timestamp for sample in samples if sample.timestamp is not None)
+    legacy_seconds, expected = best_of(args.repeat, lambda: legacy_entity_aggregates(samples, reference, 7))
+    timings: dict[str, Any] = {"legacy_seconds": round(legacy_seconds, 6)}
+    results_match = True
+    backends = {"python": None, "numpy": score.numpy} if score.numpy is not None else {"python": None}
+    for name, backend in backends.items():
+        with patch.object(score, "numpy", backend):
+            seconds, found = best_of(args.repeat, lambda: single_pass_entity_aggregates(store, reference, 7))
+        results_match = results_match and found == expected
+        timings[name] = timing_row(legacy_seconds, seconds)
+    return {
+        "benchmark": "aggregate",
+        "samples": len(samples),
+        "entities": len(expected),
+        "numpy_available": score.numpy is not None,
+        "timings": timings,
+        "results_match": results_match,
+    }
+
+
+def legacy_build_samples(report: dict[str, Any]) -> list[score.SessionSample]:
+    """One SessionSample per (session, entity), as build_samples returned before SampleStore."""
+    samples = []
+    for session in report["signals"]["by_session"]:
+        session_id = score.session_id_for(session)
+        timestamp = score.parse_timestamp(session.get("timestamp"))
+        turn_count = max(int(session.get("turn_count") or 0), 0)
+        complexity_score, negative_factor = score.complexity_values(session)
+        files = score.touched_files(session)
+        rows = [("skill", skill, count, score.skill_dimensions(session, count)) for skill, count in score.entity_rows(session, "skill_invocations", "count")]
+        agent_counts = score.entity_rows(session, "agent_dispatches", "count")
+        rows.extend(("agent", agent, count, score.agent_dimensions(session, count)) for agent, count in agent_counts)
+        if agent_counts:
+            total = sum(count for _, count in agent_counts)
+            rows.append(("orchestration", "global", total, score.orchestration_dimensions(session, total)))
+        for entity_type, entity_id, count, (dimensions, composite, negative_total) in rows:
+            samples.append(
+                score.SessionSample(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    session_id=session_id,
+                    timestamp=timestamp,
+                    count=count,
+                    turn_count=turn_count,
+                    complexity_score=complexity_score,
+                    negative_factor=negative_factor,
+                    dimensions=dimensions,
+                    composite=composite,
+                    negative_total=negative_total,
+                    touched_files=files,
+                )
+            )
+    return samples
+
+
+def bench_samples(args: argparse.Namespace) -> dict[str, Any]:
+    report = synthetic_adoption_report(args.sessions, args.seed)
+    for index, row in enumerate(report["signals"]["by_session"]):
+        row["agent_dispatches"].append({"agent": f"agent-{index % 40}", "count": 2})
+        row["user_corrections"] = index % 3
+    legacy_seconds, legacy_peak, _ = measure_peak(lambda: legacy_build_samples(report))
+    store_seconds, store_peak, store = measure_peak(lambda: score.build_samples(report))
+    legacy = legacy_build_samples(report)
+    results_match = legacy == list(store)
+
+    reference = max(timestamp for timestamp in store.session_timestamps if timestamp is not None)
+    adoption = score.CommitAdoption(score.REPO_ROOT)
+    aggregate_seconds, scores = best_of(
+        args.repeat, lambda: score.aggregate_entity_scores(store, {"entities": {}}, reference, 7, 0.15, adoption)
+    )
+    # The same samples one session each: what per-sample file sets cost the store.
+    unshared = score.SampleStore()
+    for sample in legacy:
+        unshared.append(sample)
+    del legacy
+    results_match = results_match and scores == score.aggregate_entity_scores(unshared, {"entities": {}}, reference, 7, 0.15, adoption)
+    return {
+        "benchmark": "samples",
+        "sessions": args.sessions,
+        "samples": len(store),
+        "build": timing_row(legacy_seconds, store_seconds),
+        "peak_bytes": {"legacy": legacy_peak, "store": store_peak, "ratio": round(legacy_peak / max(store_peak, 1), 2)},
+        "aggregate_seconds": round(aggregate_seconds, 6),
+        "results_match": results_match,
+    }
+
+
+def synthetic_analysis_report(sessions: int, seed: int) -> dict[str, Any]:
+    """An adoption report whose rows also carry corrections, repeats and instruction signatures like analyzer output."""
+    report = synthetic_adoption_report(sessions, seed)
+    rng = random.Random(seed)
+    width = score.INSTRUCTION_LSH_BANDS * score.INSTRUCTION_LSH_ROWS
+    signatures = [
+        score.INSTRUCTION_SIGNATURE.pack(*(rng.getrandbits(32) for _ in range(width))).hex() for _ in range(50)
+    ]
+    for index, row in enumerate(report["signals"]["by_session"]):
+        row["agent_dispatches"].append({"agent": f"agent-{index % 40}", "count": 2})
+        row["user_corrections"] = index % 3
+        row["repeated_instructions"] = index % 4
+        row["instructions"] = [
+            {"signature": signature, "count": 1, "text": f"{rng.choice(KOREAN_FRAGMENTS)} {signature[:8]}"}
+            for signature in rng.sample(signatures, 3)
+        ]
+    return report
+
+
+def loaded_report_ingest(path: Path) -> tuple[score.SampleStore, dict[str, Any]]:
+    """What score.py did before streaming: decode the whole report, then build samples and gaps from it."""
+    report = json.loads(path.read_text(encoding="utf-8"))
+    return score.build_samples(report), score.gap_analysis_for_report(report)
+
+
+def streamed_report_ingest(path: Path) -> tuple[score.SampleStore, dict[str, Any]]:
+    samples = score.SampleStore()
+    gaps = score.GapAnalysis()
+
+    def ingest(session: Any) -> None:
+        score.add_session_samples(samples, session)
+        gaps.add(session)
+
+    score.load_report(argparse.Namespace(input=str(path), report=None), ingest)
+    return samples, gaps.result()
+
+
+def bench_report_stream(args: argparse.Namespace) -> dict[str, Any]:
+    results = []
+    results_match = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "analysis-report.json"
+        for sessions in args.sessions:
+            path.write_text(
+                json.dumps(synthetic_analysis_report(sessions, args.seed), ensure_ascii=False, indent=2, sort_keys=True),
+                encoding="utf-8",
+            )
+            loaded_seconds, loaded_peak, (loaded_samples, loaded_gaps) = measure_peak(lambda: loaded_report_ingest(path))
+            streamed_seconds, streamed_peak, (streamed_samples, streamed_gaps) = measure_peak(
+                lambda: streamed_report_ingest(path)
+            )
+            results_match = results_match and list(loaded_samples) == list(streamed_samples) and loaded_gaps == streamed_gaps
+            results.append(
+                {
+                    "sessions": sessions,
+                    "report_bytes": path.stat().st_size,
+                    "ingest": timing_row(loaded_seconds, streamed_seconds),
+                    "peak_bytes": {
+                        "loaded": loaded_peak,
+                        "streamed": streamed_peak,
+                        "ratio": round(loaded_peak / max(streamed_peak, 1), 2),
+                    },
+                }
+            )
+    return {"benchmark": "report-stream", "results": results, "results_match": results_match}
+
+
+def timing_row(reference_seconds: float, candidate_seconds: float) -> dict[str, float]:
+    return {
+        "reference_seconds": round(reference_seconds, 6),
+        "candidate_seconds": round(candidate_seconds, 6),
+        "speedup": round(reference_seconds / candidate_seconds, 2) if candidate_seconds > 0 else 0.0,
+    }
+
+
+def print_text_report(output: dict[str, Any]) -> None:
+    print(f"HyperAgent benchmark: {output['benchmark']}")
+    for key, value in output.items():
+        if key == "benchmark":
+            continue
+        print(f"- {key}: {json.dumps(value, ensure_ascii=False, sort_keys=True)}")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for HyperAgent analysis hot paths on synthetic data.")
+    parser.add_argument("--json", action="store_true", help="Print structured JSON to stdout.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the synthetic workload.")
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N timed runs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    signal = subparsers.add_parser("signal-matcher", help="Per-pattern re.search loop vs compiled SignalMatcher.")
+    signal.add_argument("--messages", type=int, default=20000, help="Synthetic Korean/English messages to classify.")
+    signal.add_argument("--error-rate", type=float, default=0.1, help="Share of synthetic tool outputs that carry an error line.")
+    signal.set_defaults(handler=bench_signal_matcher)
+
+    scaling = subparsers.add_parser("scaling", help="analyze_session runtime across session lengths.")
+    scaling.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Messages per synthetic session.")
+    scaling.add_argument(
+        "--reference-max",
+        type=int,
+        default=10000,
+        help="Also time the quadratic list-membership pass for sessions up to this size.",
+    )
+    scaling.set_defaults(handler=bench_scaling)
+
+    stream = subparsers.add_parser("stream", help="Peak traced memory of sorted vs streaming session folding.")
+    stream.add_argument("--rows", type=int, nargs="+", default=[2000, 10000], help="Rows per synthetic session file.")
+    stream.add_argument("--output-bytes", type=int, default=4096, help="Size of each synthetic tool output.")
+    stream.add_argument("--reorder-window", type=int, default=analyze_sessions.DEFAULT_REORDER_WINDOW)
+    stream.set_defaults(handler=bench_stream)
+
+    backend = subparsers.add_parser("json-backend", help="Rows/sec per JSON backend, with and without the Codex pre-screen.")
+    backend.add_argument("--rows", type=int, default=20000, help="Rows per synthetic session file.")
+    backend.add_argument("--output-bytes", type=int, default=4096, help="Size of each bulky payload.")
+    backend.set_defaults(handler=bench_json_backend)
+
+    repeats = subparsers.add_parser("repeats", help="Pairwise re-tokenizing repeat check vs the windowed InstructionWindow.")
+    repeats.add_argument("--messages", type=int, default=20000, help="Synthetic user turns.")
+    repeats.add_argument("--windows", type=int, nargs="+", default=[1, 5, 20], help="Repeat windows to time.")
+    repeats.set_defaults(handler=bench_repeats)
+
+    discovery = subparsers.add_parser("discovery", help="Codex session discovery: per-day glob vs pruned scandir.")
+    discovery.add_argument("--files", type=int, default=50000, help="Rollout files in the synthetic Codex tree.")
+    discovery.add_argument("--threads", type=int, nargs="+", default=[1, 8], help="Directory listing thread counts to time.")
+    discovery.set_defaults(handler=bench_discovery)
+
+    blame = subparsers.add_parser("blame", help="Commit adoption: git blame per entity and file vs batched, cached CommitAdoption.")
+    blame.add_argument("--sessions", type=int, default=200, help="Synthetic sessions touching tracked repo files.")
+    blame.add_argument("--workers", type=int, nargs="+", default=[1, 8], help="Blame worker counts to time.")
+    blame.set_defaults(handler=bench_blame)
+
+    adoption = subparsers.add_parser("adoption", help="Commit adoption engines on a large fixture repo: git blame vs cat-file + diff --numstat.")
+    adoption.add_argument("--files", type=int, default=200, help="Tracked text files in the fixture repo.")
+    adoption.add_argument("--lines", type=int, default=2000, help="Lines per fixture file.")
+    adoption.add_argument("--commits", type=int, default=5, help="Commits of history behind each file.")
+    adoption.add_argument("--workers", type=int, default=score.DEFAULT_BLAME_WORKERS, help="Blame worker count for both engines.")
+    adoption.set_defaults(handler=bench_adoption)
+
+    aggregate = subparsers.add_parser("aggregate", help="Entity aggregation: per-dimension weights vs single-pass dimension_averages.")
+    aggregate.add_argument("--samples", type=int, default=1_000_000, help="Synthetic session samples.")
+    aggregate.add_argument("--entities", type=int, default=100, help="Entities per entity type.")
+    aggregate.set_defaults(handler=bench_aggregate)
+
+    samples = subparsers.add_parser("samples", help="Per-sample SessionSample objects vs the columnar SampleStore: build time and peak memory.")
+    samples.add_argument("--sessions", type=int, default=200_000, help="Synthetic sessions; each yields three samples.")
+    samples.set_defaults(handler=bench_samples)
+
+    report_stream = subparsers.add_parser(
+        "report-stream", help="score.py report ingestion: json.loads then build vs streaming by_session rows: peak memory."
+    )
+    report_stream.add_argument("--sessions", type=int, nargs="+", default=[2000, 20_000], help="Session rows per synthetic report.")
+    report_stream.set_defaults(handler=bench_report_stream)
+
+    evolve = subparsers.add_parser("evolve", help="Dry-run evolve cycle: subprocess steps vs --in-process steps.")
+    evolve.add_argument("--sessions", type=int, default=2000, help="Synthetic Claude session files.")
+    evolve.add_argument("--turns", type=int, default=40, help="User turns per synthetic session.")
+    evolve.set_defaults(handler=bench_evolve)
+
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be >= 1")
+    return args
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    output = {"schema_version": SCHEMA_VERSION, **args.handler(args)}
+    if args.json:
+        print(json.dumps(output, ensure_ascii=False, indent=2, sort_keys=True))
+    else:
+        print_text_report(output)
+    return 0 if output.get("results_match", True) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(run(sys.argv[1:]))
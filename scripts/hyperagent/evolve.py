@@ -2,13 +2,28 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
+import importlib
+import io
 import json
+import os
+import resource
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from types import ModuleType
+from typing import Any, Callable
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: fall back to the built-in cycle timeout
+    tomllib = None
 
 
 SCHEMA_VERSION = "1"
@@ -19,6 +34,33 @@ SCORE_SCRIPT = HYPERAGENT_DIR / "score.py"
 GENERATE_SCRIPT = HYPERAGENT_DIR / "generate_variant.py"
 ARCHIVE_SCRIPT = HYPERAGENT_DIR / "archive.py"
 APPLY_SCRIPT = HYPERAGENT_DIR / "apply.py"
+POLICY_PATH = REPO_ROOT / "policy" / "hyperagent.toml"
+DEFAULT_CYCLE_TIMEOUT_SECONDS = 600.0
+# Share of the remaining cycle budget each stage may use; time a stage leaves
+# unused carries over to the stages after it.
+STAGE_BUDGET_SHARES = {"analyze": 0.55, "score": 0.25, "generate": 0.1, "archive": 0.05, "apply": 0.05}
+# Steps get this fraction of their allotment as a cooperative --time-budget so they
+# can degrade and still report before the hard timeout kills them.
+SOFT_BUDGET_RATIO = 0.8
+MIN_STAGE_SECONDS = 1.0
+STEP_MODULES = {
+    "analyze": "analyze_sessions",
+    "score": "score",
+    "generate": "generate_variant",
+    "archive": "archive",
+    "apply": "apply",
+}
+DEFAULT_CHECKPOINT_DIR = "~/.claude/hyperagent/checkpoints"
+DEFAULT_BASELINE_PATH = "~/.claude/hyperagent/baseline.json"
+MAX_STAGE_CHECKPOINTS = 5
+DEFAULT_METRICS_LOG = "~/.claude/hyperagent/metrics.jsonl"
+STEP_COUNTERS = {
+    "analyze": ("files_scanned", "files_prefiltered", "files_parsed", "files_resumed", "files_unchanged", "rows_parsed", "bytes_parsed"),
+    "score": ("samples_built", "scored_entities", "git_blame_calls", "blame_cache_hits", "plumbing_files", "commit_adoption_skipped"),
+    "generate": ("candidate_count", "proposal_count"),
+    "archive": ("record_count",),
+    "apply": ("plan_count",),
+}
 
 
 class PipelineError(Exception):
@@ -27,6 +69,48 @@ class PipelineError(Exception):
         self.step = step
 
 
+class BudgetExhausted(Exception):
+    def __init__(self, stage: str, seconds: float) -> None:
+        super().__init__(f"{stage}: cycle budget exhausted")
+        self.stage = stage
+        self.seconds = seconds
+
+
+def policy_cycle_timeout(path: Path = POLICY_PATH) -> float:
+    """``trigger.cycle_timeout_seconds`` from the HyperAgent policy, or the built-in default."""
+    if tomllib is None:
+        return DEFAULT_CYCLE_TIMEOUT_SECONDS
+    try:
+        policy = tomllib.loads(path.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError):
+        return DEFAULT_CYCLE_TIMEOUT_SECONDS
+    trigger = policy.get("trigger") if isinstance(policy.get("trigger"), dict) else {}
+    value = trigger.get("cycle_timeout_seconds")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    return DEFAULT_CYCLE_TIMEOUT_SECONDS
+
+
+class CycleBudget:
+    """Wall-clock budget for one evolve cycle, handed out stage by stage.
+
+    Each stage is allotted its share of whatever time is left, relative to the
+    shares of the stages still to come.
+    """
+
+    def __init__(self, total_seconds: float) -> None:
+        self.total_seconds = total_seconds
+        self.deadline = time.monotonic() + total_seconds
+        self.pending = dict(STAGE_BUDGET_SHARES)
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def allot(self, stage: str) -> float:
+        share = self.pending.pop(stage)
+        return self.remaining() * share / (share + sum(self.pending.values()))
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
@@ -79,41 +163,250 @@ def parse_json_output(step_name: str, stdout: str) -> dict[str, Any]:
     return output
 
 
+def rss_bytes(maxrss: int) -> int:
+    """``ru_maxrss`` in bytes: macOS reports bytes, Linux KiB."""
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def step_counters(name: str, output: dict[str, Any]) -> dict[str, int]:
+    """Domain counters a step reports, from its ``diagnostics`` or top-level fields."""
+    diagnostics = output.get("diagnostics") if isinstance(output.get("diagnostics"), dict) else {}
+    counters = {}
+    for key in STEP_COUNTERS.get(name, ()):
+        value = diagnostics.get(key, output.get(key))
+        if isinstance(value, int) and not isinstance(value, bool):
+            counters[key] = value
+    return counters
+
+
+def step_metrics(
+    name: str,
+    output: dict[str, Any],
+    *,
+    wall_seconds: float,
+    cpu_seconds: float,
+    peak_rss_bytes: int,
+    input_bytes: int | None = None,
+    output_bytes: int | None = None,
+) -> dict[str, Any]:
+    return {
+        "wall_seconds": round(wall_seconds, 6),
+        "cpu_seconds": round(cpu_seconds, 6),
+        "peak_rss_bytes": peak_rss_bytes,
+        "input_bytes": input_bytes,
+        "output_bytes": output_bytes,
+        "counters": step_counters(name, output),
+    }
+
+
+class StepMeter:
+    """Wall and CPU time spent by this process, and the children it waited for, since construction.
+
+    Peak RSS is this process's high-water mark so far, so for in-process steps
+    it covers every earlier step too.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.cpu_started = self.cpu_seconds()
+
+    @staticmethod
+    def cpu_seconds() -> float:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return time.process_time() + children.ru_utime + children.ru_stime
+
+    def metrics(self, name: str, output: dict[str, Any]) -> dict[str, Any]:
+        return step_metrics(
+            name,
+            output,
+            wall_seconds=time.perf_counter() - self.started,
+            cpu_seconds=self.cpu_seconds() - self.cpu_started,
+            peak_rss_bytes=rss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+        )
+
+
+def combine_metrics(name: str, steps: list[dict[str, Any]], output: dict[str, Any]) -> dict[str, Any]:
+    """Metrics of a stage that ran one command per variant: times and bytes add up, RSS is the largest."""
+    metrics = [step["metrics"] for step in steps]
+
+    def total(key: str) -> int | None:
+        values = [row[key] for row in metrics]
+        return None if any(value is None for value in values) else sum(values)
+
+    return step_metrics(
+        name,
+        output,
+        wall_seconds=sum(row["wall_seconds"] for row in metrics),
+        cpu_seconds=sum(row["cpu_seconds"] for row in metrics),
+        peak_rss_bytes=max((row["peak_rss_bytes"] for row in metrics), default=0),
+        input_bytes=total("input_bytes"),
+        output_bytes=total("output_bytes"),
+    )
+
+
 def run_json_step(
     name: str,
     command: list[str],
     *,
     input_json: dict[str, Any] | None = None,
+    timeout: float | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
-    input_text = json.dumps(input_json, ensure_ascii=False) if input_json is not None else None
-    result = subprocess.run(
-        command,
-        cwd=REPO_ROOT,
-        input=input_text,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=False,
-    )
+    input_data = json.dumps(input_json, ensure_ascii=False).encode("utf-8") if input_json is not None else None
+    # Output goes to files and the child is reaped with wait4 so its own CPU time
+    # and peak RSS can be read back; subprocess.run discards that rusage.
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            command,
+            cwd=REPO_ROOT,
+            stdin=subprocess.PIPE if input_data is not None else None,
+            stdout=stdout_file,
+            stderr=stderr_file,
+        )
+        expired = threading.Event()
+
+        def expire() -> None:
+            expired.set()
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(process.pid, signal.SIGKILL)
+
+        timer = threading.Timer(timeout, expire) if timeout is not None else None
+        if timer is not None:
+            timer.start()
+        try:
+            if process.stdin is not None:
+                try:
+                    process.stdin.write(input_data or b"")
+                except BrokenPipeError:
+                    pass
+                finally:
+                    process.stdin.close()
+            _, status, usage = os.wait4(process.pid, 0)
+        finally:
+            if timer is not None:
+                timer.cancel()
+        process.returncode = os.waitstatus_to_exitcode(status)
+        timed_out = expired.is_set() and os.WIFSIGNALED(status)
+        wall_seconds = time.perf_counter() - started
+        stdout_file.seek(0)
+        stdout_data = stdout_file.read()
+        stderr_file.seek(0)
+        stderr_text = stderr_file.read().decode("utf-8", errors="replace")
+    stdout_text = stdout_data.decode("utf-8", errors="replace")
+
+    def metrics(output: dict[str, Any]) -> dict[str, Any]:
+        return step_metrics(
+            name,
+            output,
+            wall_seconds=wall_seconds,
+            cpu_seconds=usage.ru_utime + usage.ru_stime,
+            peak_rss_bytes=rss_bytes(usage.ru_maxrss),
+            input_bytes=len(input_data) if input_data is not None else 0,
+            output_bytes=len(stdout_data),
+        )
+
     step = {
         "name": name,
-        "status": "success" if result.returncode == 0 else "failed",
+        "status": "success" if process.returncode == 0 else "failed",
         "command": command,
-        "returncode": result.returncode,
-        "stderr": result.stderr.strip(),
+        "returncode": process.returncode,
+        "stderr": stderr_text.strip(),
     }
-    if result.returncode != 0:
-        step["stdout"] = result.stdout.strip()
-        step["error"] = step["stderr"] or step["stdout"] or f"{name} failed"
+    if timed_out:
+        step["timed_out"] = True
+        step["error"] = f"{name} timed out after {timeout:.1f}s"
+    if process.returncode != 0:
+        step["stdout"] = stdout_text.strip()
+        step.setdefault("error", step["stderr"] or step["stdout"] or f"{name} failed")
+        step["metrics"] = metrics({})
         raise PipelineError(step)
 
-    output = parse_json_output(name, result.stdout)
+    output = parse_json_output(name, stdout_text)
     step["output_summary"] = summarize_output(name, output)
+    step["metrics"] = metrics(output)
     if step["stderr"]:
         step["warnings"] = step["stderr"]
     return step, output
 
 
+def load_step_module(name: str) -> ModuleType:
+    if str(HYPERAGENT_DIR) not in sys.path:
+        sys.path.insert(0, str(HYPERAGENT_DIR))
+    return importlib.import_module(STEP_MODULES[name])
+
+
+def call_step_module(name: str, module: ModuleType, argv: list[str], input_json: dict[str, Any] | None) -> Any:
+    args = module.parse_args(argv)
+    if name == "analyze":
+        return module.build_analysis_report(args)
+    if name == "score":
+        return module.score_report(args, input_json)
+    if name == "generate":
+        return module.generate_from_scores(args, input_json)
+    if name == "archive":
+        return args.func(args)
+    return module.execute(args)
+
+
+def run_inprocess_step(
+    name: str,
+    command: list[str],
+    *,
+    input_json: dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """``run_json_step`` without a child interpreter.
+
+    The step module is imported and called with the same arguments the
+    subprocess would get, and ``input_json`` is handed over as the object
+    itself. Exit codes and error exceptions become the same failed step
+    records; stderr output is captured the same way. ``timeout`` cannot be
+    enforced on code running in this process, so only the step's own
+    ``--time-budget`` bounds it.
+    """
+    stderr = io.StringIO()
+    returncode = 0
+    error: str | None = None
+    meter = StepMeter()
+    try:
+        with contextlib.redirect_stderr(stderr):
+            output = call_step_module(name, load_step_module(name), command[2:], input_json)
+    except SystemExit as exc:
+        # Even a zero exit is a failure here: the step produced no output object.
+        returncode = exc.code if isinstance(exc.code, int) and exc.code else 1
+        error = exc.code if isinstance(exc.code, str) else None
+    except Exception as exc:
+        code = getattr(exc, "code", None)
+        returncode = code if isinstance(code, int) and code else 1
+        error = str(exc) or type(exc).__name__
+    step = {
+        "name": name,
+        "status": "success" if returncode == 0 else "failed",
+        "command": command,
+        "in_process": True,
+        "returncode": returncode,
+        "stderr": stderr.getvalue().strip(),
+    }
+    if returncode != 0:
+        step["error"] = error or step["stderr"] or f"{name} failed"
+        step["metrics"] = meter.metrics(name, {})
+        raise PipelineError(step)
+
+    if not isinstance(output, dict):
+        step["status"] = "failed"
+        step["error"] = "JSON output must be an object"
+        step["metrics"] = meter.metrics(name, {})
+        raise PipelineError(step)
+    step["output_summary"] = summarize_output(name, output)
+    step["metrics"] = meter.metrics(name, output)
+    if step["stderr"]:
+        step["warnings"] = step["stderr"]
+    return step, output
+
+
+StepRunner = Callable[..., tuple[dict[str, Any], dict[str, Any]]]
+
+
 def summarize_output(name: str, output: dict[str, Any]) -> dict[str, Any]:
     if name == "analyze":
         return {
@@ -228,7 +521,15 @@ def simulate_apply(variants: list[dict[str, Any]]) -> tuple[dict[str, Any], dict
     return step, output
 
 
-def archive_variants(variants: list[dict[str, Any]]) -> tuple[dict[str, Any], dict[str, Any]]:
+def time_left(deadline: float | None) -> float | None:
+    return max(0.001, deadline - time.monotonic()) if deadline is not None else None
+
+
+def archive_variants(
+    variants: list[dict[str, Any]],
+    run_step: StepRunner = run_json_step,
+    deadline: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
     if not variants:
         output = {"schema_version": SCHEMA_VERSION, "record_count": 0, "records": []}
         return (
@@ -244,6 +545,7 @@ def archive_variants(variants: list[dict[str, Any]]) -> tuple[dict[str, Any], di
 
     records = []
     commands = []
+    substeps = []
     for variant in variants:
         variant_dir = variant.get("variant_dir")
         if not isinstance(variant_dir, str) or not variant_dir:
@@ -266,8 +568,9 @@ def archive_variants(variants: list[dict[str, Any]]) -> tuple[dict[str, Any], di
             "--no-tag",
             "--json",
         ]
-        step, output = run_json_step("archive", command)
+        step, output = run_step("archive", command, timeout=time_left(deadline))
         commands.append(command)
+        substeps.append(step)
         records.append(output)
 
     output = {
@@ -281,11 +584,17 @@ def archive_variants(variants: list[dict[str, Any]]) -> tuple[dict[str, Any], di
         "command": commands,
         "returncode": 0,
         "output_summary": summarize_output("archive", output),
+        "metrics": combine_metrics("archive", substeps, output),
     }
     return step, output
 
 
-def apply_variants(variants: list[dict[str, Any]], approve: bool) -> tuple[dict[str, Any], dict[str, Any]]:
+def apply_variants(
+    variants: list[dict[str, Any]],
+    approve: bool,
+    run_step: StepRunner = run_json_step,
+    deadline: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
     if not variants:
         output = {"schema_version": SCHEMA_VERSION, "plan_count": 0, "plans": []}
         return (
@@ -301,6 +610,7 @@ def apply_variants(variants: list[dict[str, Any]], approve: bool) -> tuple[dict[
 
     plans = []
     commands = []
+    substeps = []
     for variant in variants:
         variant_dir = variant.get("variant_dir")
         if not isinstance(variant_dir, str) or not variant_dir:
@@ -321,8 +631,9 @@ def apply_variants(variants: list[dict[str, Any]], approve: bool) -> tuple[dict[
         ]
         if approve:
             command.append("--approve")
-        step, output = run_json_step("apply", command)
+        step, output = run_step("apply", command, timeout=time_left(deadline))
         commands.append(command)
+        substeps.append(step)
         plans.append(output)
 
     output = {
@@ -336,11 +647,201 @@ def apply_variants(variants: list[dict[str, Any]], approve: bool) -> tuple[dict[
         "command": commands,
         "returncode": 0,
         "output_summary": summarize_output("apply", output),
+        "metrics": combine_metrics("apply", substeps, output),
     }
     return step, output
 
 
-def build_analyze_command(args: argparse.Namespace, date_range: tuple[str, str]) -> list[str]:
+def json_digest(value: Any) -> str:
+    material = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """Successful stage outputs addressed by a digest of the stage, its command and its input.
+
+    A stage's input is the digest of the upstream output (or, for analyze,
+    of the session files it would read), so a checkpoint is reused only when
+    nothing feeding the stage changed. Checkpoints are only read and recorded
+    when ``resume`` is set, so a plain cycle never pays for the input digests.
+    """
+
+    def __init__(self, root: Path, resume: bool) -> None:
+        self.root = root
+        self.resume = resume
+
+    @staticmethod
+    def key(stage: str, command: Any, input_digest: str) -> str:
+        return json_digest({"schema_version": SCHEMA_VERSION, "stage": stage, "command": command, "input": input_digest})
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / f"{stage}-{key}.json"
+
+    def load(self, stage: str, key: str) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        if not self.resume:
+            return None
+        try:
+            data = json.loads(self.path(stage, key).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            return None
+        step, output = data.get("step"), data.get("output")
+        if not isinstance(step, dict) or not isinstance(output, dict):
+            return None
+        return step, output
+
+    def save(self, stage: str, key: str, step: dict[str, Any], output: dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(stage, key)
+        payload = {
+            "schema_version": SCHEMA_VERSION,
+            "stage": stage,
+            "key": key,
+            "created_at": utc_now_iso(),
+            "step": step,
+            "output": output,
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+        tmp_path.replace(path)
+        stale = sorted(self.root.glob(f"{stage}-*.json"), key=lambda item: item.stat().st_mtime_ns, reverse=True)
+        for old in stale[MAX_STAGE_CHECKPOINTS:]:
+            old.unlink(missing_ok=True)
+
+
+def run_checkpointed(
+    checkpoints: CheckpointStore,
+    stage: str,
+    command: Any,
+    input_digest: Callable[[], str],
+    execute: Callable[[], tuple[dict[str, Any], dict[str, Any]]],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    if not checkpoints.resume:
+        return measured(stage, execute)
+    meter = StepMeter()
+    key = CheckpointStore.key(stage, command, input_digest())
+    cached = checkpoints.load(stage, key)
+    if cached is not None:
+        step, output = cached
+        resumed = {**step, "resumed": True, "checkpoint": str(checkpoints.path(stage, key))}
+        resumed["metrics"] = meter.metrics(stage, output)
+        return resumed, output
+    step, output = measured(stage, execute)
+    # A degraded output is incomplete; a resumed run should redo the stage.
+    if not output.get("degradations"):
+        checkpoints.save(stage, key, step, output)
+    return {**step, "checkpoint": str(checkpoints.path(stage, key))}, output
+
+
+def measured(
+    name: str, execute: Callable[[], tuple[dict[str, Any], dict[str, Any]]]
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Run a stage and give it in-process metrics unless its runner already recorded some."""
+    meter = StepMeter()
+    step, output = execute()
+    if "metrics" not in step:
+        step["metrics"] = meter.metrics(name, output)
+    return step, output
+
+
+def checkpoint_command(command: list[str], temp_dir: str) -> list[str]:
+    """The command minus the interpreter path, the per-run temporary directory and the time budget."""
+    parts = []
+    skip_next = False
+    for part in command[1:]:
+        if skip_next:
+            skip_next = False
+        elif part == "--time-budget":
+            skip_next = True
+        else:
+            parts.append(part.replace(temp_dir, "<tmp>"))
+    return parts
+
+
+def soft_budget(seconds: float) -> list[str]:
+    return ["--time-budget", f"{max(seconds * SOFT_BUDGET_RATIO, 0.1):.1f}"]
+
+
+def analysis_input_digest(command: list[str]) -> str:
+    module = load_step_module("analyze")
+    return module.analysis_inputs_fingerprint(module.parse_args(command[2:]))
+
+
+def repo_head() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def tree_fingerprint(root: Path) -> str:
+    """Digest of the relative path, size and mtime of every file under ``root``."""
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*")):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if path.is_file():
+            digest.update(f"\0{path.relative_to(root)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path) -> list[int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def worktree_fingerprint() -> str | None:
+    """Digest of the tracked files that differ from HEAD, with their sizes and mtimes.
+
+    Commit adoption counts lines of the working tree, so uncommitted edits
+    change score output without moving HEAD.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, check=False
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    digest = hashlib.sha256()
+    for entry in sorted(result.stdout.decode("utf-8", "surrogateescape").split("\0")):
+        if entry:
+            fingerprint = file_fingerprint(REPO_ROOT / entry[3:])
+            digest.update(f"\0{entry}\0{fingerprint}".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def score_input_digest(analysis: dict[str, Any], baseline: str) -> str:
+    """The analysis plus what else score reads: HEAD and the uncommitted
+    working tree for commit adoption, the agent registry and skills
+    metadata, and the baseline file."""
+    return json_digest(
+        {
+            "analysis": json_digest(analysis),
+            "head": repo_head(),
+            "worktree": worktree_fingerprint(),
+            "registry": tree_fingerprint(REPO_ROOT / "agent-registry"),
+            "skills": tree_fingerprint(REPO_ROOT / "skills"),
+            "baseline": file_fingerprint(load_step_module("score").expand_input_path(baseline)),
+        }
+    )
+
+
+def build_analyze_command(
+    args: argparse.Namespace,
+    date_range: tuple[str, str],
+    time_budget: float | None = None,
+) -> list[str]:
     command = [
         sys.executable,
         repo_relative(ANALYZE_SCRIPT),
@@ -351,38 +852,91 @@ def build_analyze_command(args: argparse.Namespace, date_range: tuple[str, str])
         "--min-turns",
         str(args.min_turns),
     ]
+    # A dry run leaves the analysis cache, signal store and header index untouched.
+    if not args.dry_run:
+        command.extend(["--cache", "--store"])
     if args.project:
         command.extend(["--project", args.project])
+        if not args.dry_run:
+            command.append("--header-index")
+    if time_budget is not None:
+        command.extend(soft_budget(time_budget))
     return command
 
 
+def allot_stage(budget: CycleBudget, stage: str) -> float:
+    seconds = budget.allot(stage)
+    if seconds < MIN_STAGE_SECONDS:
+        raise BudgetExhausted(stage, seconds)
+    return seconds
+
+
+def skipped_stages(exc: BudgetExhausted) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Step records and the degradation for a stage that got no budget, and every stage after it."""
+    names = list(STAGE_BUDGET_SHARES)[list(STAGE_BUDGET_SHARES).index(exc.stage) :]
+    steps = [
+        {"name": name, "status": "skipped", "command": None, "returncode": 0, "degraded": True} for name in names
+    ]
+    degradation = {
+        "stage": exc.stage,
+        "kind": "stage_skipped",
+        "detail": f"cycle budget exhausted with {exc.seconds:.2f}s left; skipped {', '.join(names)}",
+        "stages": names,
+    }
+    return steps, degradation
+
+
 def run_pipeline(args: argparse.Namespace) -> dict[str, Any]:
     started_at = utc_now_iso()
     date_range = tuple(args.date_range) if args.date_range else default_date_range()
     steps: list[dict[str, Any]] = []
     outputs: dict[str, Any] = {}
+    degradations: list[dict[str, Any]] = []
+    run_step: StepRunner = run_inprocess_step if args.in_process else run_json_step
+    checkpoints = CheckpointStore(Path(os.path.expanduser(args.checkpoint_dir)), args.resume)
+    budget = CycleBudget(args.timeout)
 
-    score_baseline = args.baseline
+    score_baseline = args.baseline or DEFAULT_BASELINE_PATH
     with tempfile.TemporaryDirectory(prefix="hyperagent-evolve-") as temp_dir:
-        if args.dry_run and score_baseline is None:
+        if args.dry_run and args.baseline is None:
             score_baseline = str(Path(temp_dir) / "baseline.json")
 
         try:
-            analyze_step, analysis = run_json_step("analyze", build_analyze_command(args, date_range))
-            steps.append(analyze_step)
+            seconds = allot_stage(budget, "analyze")
+            analyze_command = build_analyze_command(args, date_range, seconds)
+            analyze_step, analysis = run_checkpointed(
+                checkpoints,
+                "analyze",
+                checkpoint_command(analyze_command, temp_dir),
+                lambda: analysis_input_digest(analyze_command),
+                lambda: run_step("analyze", analyze_command, timeout=seconds),
+            )
+            steps.append({**analyze_step, "budget_seconds": round(seconds, 3)})
             outputs["analysis"] = analysis
+            degradations.extend(analysis.get("degradations") or [])
 
+            seconds = allot_stage(budget, "score")
             score_command = [
                 sys.executable,
                 repo_relative(SCORE_SCRIPT),
                 "--json",
                 "--baseline",
-                score_baseline or "~/.claude/hyperagent/baseline.json",
+                score_baseline,
+                *([] if args.dry_run else ["--blame-cache"]),
+                *soft_budget(seconds),
             ]
-            score_step, scores = run_json_step("score", score_command, input_json=analysis)
-            steps.append(score_step)
+            score_step, scores = run_checkpointed(
+                checkpoints,
+                "score",
+                checkpoint_command(score_command, temp_dir),
+                lambda: score_input_digest(analysis, score_baseline),
+                lambda: run_step("score", score_command, input_json=analysis, timeout=seconds),
+            )
+            steps.append({**score_step, "budget_seconds": round(seconds, 3)})
             outputs["scores"] = scores
+            degradations.extend(scores.get("degradations") or [])
 
+            seconds = allot_stage(budget, "generate")
             generate_command = [
                 sys.executable,
                 repo_relative(GENERATE_SCRIPT),
@@ -392,23 +946,53 @@ def run_pipeline(args: argparse.Namespace) -> dict[str, Any]:
             ]
             if args.dry_run:
                 generate_command.append("--dry-run")
-            generate_step, generated = run_json_step("generate", generate_command, input_json=scores)
-            steps.append(generate_step)
+            generate_step, generated = run_checkpointed(
+                checkpoints,
+                "generate",
+                checkpoint_command(generate_command, temp_dir),
+                lambda: json_digest(scores),
+                lambda: run_step("generate", generate_command, input_json=scores, timeout=seconds),
+            )
+            steps.append({**generate_step, "budget_seconds": round(seconds, 3)})
             outputs["variants"] = generated
 
             variants = variants_from_output(generated)
             if args.dry_run:
-                archive_step, archive_output = simulate_archive(variants)
-                apply_step, apply_output = simulate_apply(variants)
+                archive_step, archive_output = measured("archive", lambda: simulate_archive(variants))
             else:
-                archive_step, archive_output = archive_variants(variants)
-                apply_step, apply_output = apply_variants(variants, args.approve)
-            steps.extend([archive_step, apply_step])
+                archive_deadline = time.monotonic() + allot_stage(budget, "archive")
+                archive_step, archive_output = run_checkpointed(
+                    checkpoints,
+                    "archive",
+                    None,
+                    lambda: json_digest(variants),
+                    lambda: archive_variants(variants, run_step, archive_deadline),
+                )
+            steps.append(archive_step)
             outputs["archive"] = archive_output
+
+            if args.dry_run:
+                apply_step, apply_output = measured("apply", lambda: simulate_apply(variants))
+            else:
+                apply_deadline = time.monotonic() + allot_stage(budget, "apply")
+                apply_step, apply_output = run_checkpointed(
+                    checkpoints,
+                    "apply",
+                    {"approve": args.approve},
+                    lambda: json_digest(variants),
+                    lambda: apply_variants(variants, args.approve, run_step, apply_deadline),
+                )
+            steps.append(apply_step)
             outputs["apply"] = apply_output
 
             status = "success"
             error = None
+        except BudgetExhausted as exc:
+            skipped, degradation = skipped_stages(exc)
+            steps.extend(skipped)
+            degradations.append(degradation)
+            status = "partial"
+            error = None
         except PipelineError as exc:
             steps.append(exc.step)
             status = "failed"
@@ -418,25 +1002,64 @@ def run_pipeline(args: argparse.Namespace) -> dict[str, Any]:
         "schema_version": SCHEMA_VERSION,
         "status": status,
         "dry_run": args.dry_run,
+        "in_process": args.in_process,
+        "resume": args.resume,
         "started_at": started_at,
         "finished_at": utc_now_iso(),
         "date_range": {"start": date_range[0], "end": date_range[1]},
         "project": args.project,
+        "timeout_seconds": budget.total_seconds,
+        "degradations": degradations,
         "pipeline_steps": steps,
         "outputs": outputs,
         "error": error,
     }
 
 
+def metrics_record(result: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "started_at": result["started_at"],
+        "finished_at": result["finished_at"],
+        "status": result["status"],
+        "dry_run": result["dry_run"],
+        "in_process": result["in_process"],
+        "resume": result["resume"],
+        "date_range": result["date_range"],
+        "project": result["project"],
+        "degradations": result["degradations"],
+        "steps": [
+            {
+                "name": step["name"],
+                "status": step["status"],
+                "resumed": step.get("resumed", False),
+                "simulated": step.get("simulated", False),
+                "metrics": step.get("metrics"),
+            }
+            for step in result["pipeline_steps"]
+        ],
+    }
+
+
+def append_metrics_log(path: Path, result: dict[str, Any]) -> None:
+    """Append one line per evolve run so step costs can be tracked across nightly runs."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(metrics_record(result), ensure_ascii=False, sort_keys=True) + "\n")
+
+
 def print_text_report(result: dict[str, Any]) -> None:
     date_range = result["date_range"]
     print(f"HyperAgent evolve: {result['status']}")
     print(f"Date range: {date_range['start']} to {date_range['end']}")
     for step in result["pipeline_steps"]:
-        detail = " (simulated)" if step.get("simulated") else ""
-        print(f"- {step['name']}: {step['status']}{detail}")
+        detail = " (simulated)" if step.get("simulated") else " (resumed)" if step.get("resumed") else ""
+        timing = f" in {step['metrics']['wall_seconds']:.2f}s" if step.get("metrics") else ""
+        print(f"- {step['name']}: {step['status']}{detail}{timing}")
         if step.get("error"):
             print(f"  error: {step['error']}")
+    for degradation in result.get("degradations", []):
+        print(f"Degraded: {degradation['stage']}: {degradation['detail']}")
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -459,6 +1082,35 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--min-turns", type=int, default=3, help="Minimum user turns passed to analyze_sessions.py.")
     parser.add_argument("--baseline", help="Baseline JSON path for score.py. Dry-run defaults to a temporary baseline.")
     parser.add_argument("--approve", action="store_true", help="Pass --approve to apply.py for Tier 3 variants.")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Import the step scripts and pass their outputs as objects instead of running them as subprocesses.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Wall-clock budget for the whole cycle, split across stages. "
+        "Defaults to trigger.cycle_timeout_seconds in policy/hyperagent.toml.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Record stage checkpoints and reuse those whose command and inputs are unchanged since they last "
+        "succeeded. Pass it on every cycle so a rerun after a failure can pick up finished stages.",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=DEFAULT_CHECKPOINT_DIR,
+        help=f"Directory for content-addressed stage checkpoints (default: {DEFAULT_CHECKPOINT_DIR}).",
+    )
+    parser.add_argument(
+        "--metrics-log",
+        default=DEFAULT_METRICS_LOG,
+        help=f"JSONL file that gets one line of per-step metrics per run (default: {DEFAULT_METRICS_LOG}).",
+    )
+    parser.add_argument("--no-metrics-log", action="store_true", help="Do not append this run to the metrics log.")
     parser.add_argument("--json", action="store_true", help="Print structured JSON to stdout.")
     args = parser.parse_args(argv)
     if args.date_range:
@@ -470,17 +1122,24 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         parser.error("--max-variants must be >= 1")
     if args.min_turns < 0:
         parser.error("--min-turns must be >= 0")
+    if args.timeout is None:
+        args.timeout = policy_cycle_timeout()
+    elif args.timeout <= 0:
+        parser.error("--timeout must be > 0")
     return args
 
 
 def run(argv: list[str]) -> int:
     args = parse_args(argv)
     result = run_pipeline(args)
+    if not args.no_metrics_log:
+        append_metrics_log(Path(os.path.expanduser(args.metrics_log)), result)
     if args.json:
         print(json.dumps(result, ensure_ascii=False, indent=2, sort_keys=True))
     else:
         print_text_report(result)
-    return 0 if result["status"] == "success" else 1
+    # A partial cycle ran every stage it had budget for; only a failed stage is an error.
+    return 0 if result["status"] in ("success", "partial") else 1
 
 
 if __name__ == "__main__":
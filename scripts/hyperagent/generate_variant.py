@@ -11,10 +11,18 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+HYPERAGENT_DIR = Path(__file__).resolve().parent
+if str(HYPERAGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(HYPERAGENT_DIR))
+
+from report_io import JSONStreamReader  # noqa: E402
+
 SCHEMA_VERSION = "1"
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "scripts" / "hyperagent" / "variants"
 DEFAULT_PROPOSALS_DIR = REPO_ROOT / "scripts" / "hyperagent" / "proposals"
+# Score report members variant generation reads; the rest is skipped while streaming.
+SCORE_REPORT_KEYS = frozenset({"schema_version", "improvements", "gap_analysis"})
 
 
 @dataclass(frozen=True)
@@ -82,11 +90,33 @@ def sanitize_segment(value: str) -> str:
     return sanitized or "unknown"
 
 
+def read_score_report(handle: Any) -> Any:
+    """Decode a score report member by member, keeping only ``SCORE_REPORT_KEYS``.
+
+    The per-entity ``entities``/``scores`` listings are decoded one member at
+    a time and dropped, so they are never held alongside the improvements.
+    """
+    reader = JSONStreamReader(handle)
+    if reader.peek() != "{":
+        report = reader.value()
+        reader.end()
+        return report
+    report: dict[str, Any] = {}
+    for key in reader.members():
+        if key in SCORE_REPORT_KEYS:
+            report[key] = reader.value()
+        else:
+            reader.value()
+    reader.end()
+    return report
+
+
 def load_score_report(path: str | None) -> tuple[dict[str, Any], str]:
     if path:
         source = expand_input_path(path)
         try:
-            return json.loads(source.read_text(encoding="utf-8")), str(source)
+            with source.open(encoding="utf-8") as handle:
+                return read_score_report(handle), str(source)
         except FileNotFoundError:
             raise SystemExit(f"score report not found: {source}") from None
         except json.JSONDecodeError as exc:
@@ -95,7 +125,7 @@ def load_score_report(path: str | None) -> tuple[dict[str, Any], str]:
     if sys.stdin.isatty():
         raise SystemExit("no score report supplied; use --input PATH or pipe JSON on stdin")
     try:
-        return json.load(sys.stdin), "stdin"
+        return read_score_report(sys.stdin), "stdin"
     except json.JSONDecodeError as exc:
         raise SystemExit(f"invalid score report JSON from stdin: {exc}") from None
 
@@ -372,12 +402,22 @@ def draft_agent_instructions(name: str, row: dict[str, Any], source_instructions
     )
 
 
+def examples_markdown(row: dict[str, Any]) -> str:
+    examples = row.get("examples")
+    if not isinstance(examples, list):
+        return ""
+    lines = [f"- {example}" for example in examples if isinstance(example, str) and example]
+    return "## Example Instructions\n" + "\n".join(lines) + "\n\n" if lines else ""
+
+
 def draft_skill_markdown(name: str, row: dict[str, Any]) -> str:
     pattern = row.get("pattern") or name
+    # Quoted so instruction text carried in the pattern cannot break the frontmatter.
+    description = f"Handles repeated HyperAgent instruction pattern: {pattern}"
     return (
         "---\n"
         f"name: {name}\n"
-        f"description: Handles repeated HyperAgent instruction pattern: {pattern}\n"
+        f"description: {toml_string(description)}\n"
         "---\n\n"
         f"# {name}\n\n"
         f"Use when a session matches `{pattern}`.\n\n"
@@ -385,7 +425,8 @@ def draft_skill_markdown(name: str, row: dict[str, Any]) -> str:
         "1. Identify whether this repeated instruction pattern is present.\n"
         "2. Apply the captured checklist before tool execution.\n"
         "3. Report the exact evidence and stop if the pattern no longer applies.\n\n"
-        "## Evidence Sessions\n"
+        + examples_markdown(row)
+        + "## Evidence Sessions\n"
         + sessions_markdown(row)
         + "\n"
     )
@@ -485,9 +526,18 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     return args
 
 
-def run(argv: list[str]) -> int:
-    args = parse_args(argv)
-    report, score_source = load_score_report(args.input or args.scores)
+def generate_from_scores(
+    args: argparse.Namespace,
+    report: dict[str, Any] | None = None,
+    score_source: str = "in-process",
+) -> dict[str, Any]:
+    """Plan or write variants for a score report and return the generator output.
+
+    ``report`` is an already-loaded score report, such as one handed over
+    in-process by evolve.py; without it the report is read as on the command line.
+    """
+    if report is None:
+        report, score_source = load_score_report(args.input or args.scores)
     validate_score_report(report)
     improvements = load_improvements(report)
     gap_analysis = load_gap_analysis(report)
@@ -511,7 +561,7 @@ def run(argv: list[str]) -> int:
         registry_root,
         args.dry_run,
     )
-    output = {
+    return {
         "schema_version": SCHEMA_VERSION,
         "generated_at": created_at,
         "score_report_source": score_source,
@@ -526,6 +576,10 @@ def run(argv: list[str]) -> int:
         "proposals": proposals,
     }
 
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    output = generate_from_scores(args)
     if args.json:
         print(json.dumps(output, ensure_ascii=False, indent=2, sort_keys=True))
     else:
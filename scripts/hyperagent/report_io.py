@@ -0,0 +1,130 @@
+"""Readers shared by the HyperAgent scripts for reports and the signal store."""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+REPORT_READ_CHUNK = 1 << 16
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that can still follow a decoded number when its text was cut short.
+NUMBER_TAIL = re.compile(r"[-+.eE0-9]*")
+# Values in an instruction ``signature``: analyze_sessions writes them, score bands them.
+MINHASH_PERMUTATIONS = 32
+
+
+def warn(message: str) -> None:
+    print(f"warning: {message}", file=sys.stderr)
+
+
+def iter_store_partition(path: Path, decode: Callable[[bytes], Any] = json.loads) -> Iterator[dict[str, Any]]:
+    """Session rows of one signal store partition in file order; nothing if it does not exist.
+
+    Unparsable lines are skipped with a warning; rows without a ``session_id`` are ignored.
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                row = decode(line)
+            except ValueError as exc:
+                warn(f"{path}:{line_number}: skipped unparsable signal row: {exc}")
+                continue
+            if isinstance(row, dict) and isinstance(row.get("session_id"), str):
+                yield row
+
+
+class JSONStreamReader:
+    """Decode a JSON document from a text stream one value at a time.
+
+    Only the values handed out by ``value`` are held in memory, so a report
+    can be walked member by member and array item by array item without
+    reading it whole.
+    """
+
+    def __init__(self, handle: Any, chunk_size: int = REPORT_READ_CHUNK) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        # Reads grow with the unconsumed buffer so one large value is decoded a bounded number of times.
+        chunk = self.handle.read(max(self.chunk_size, len(self.buffer) - self.position))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the stream."""
+        while True:
+            self.position = JSON_WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.position)
+        self.position += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A value that ends the buffer may continue in the next chunk, and so may a
+            # number cut inside it: "0." + "25" decodes as 0 up to the dangling ".".
+            if NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.position = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Keys of the object at the cursor; the caller consumes each member's value before the next key."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.position)
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self.position += 1
+                return
+            self.expect(",")
+
+    def items(self) -> Iterator[Any]:
+        """Decoded items of the array at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self.position += 1
+                return
+            self.expect(",")
+
+    def end(self) -> None:
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self.buffer, self.position)
@@ -2,17 +2,35 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import math
+import operator
 import os
+import re
 import statistics
+import struct
 import subprocess
 import sys
-from collections import defaultdict
+import time
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+
+try:
+    import numpy
+except ImportError:  # optional: dimension sums fall back to pure Python
+    numpy = None
+
+HYPERAGENT_DIR = Path(__file__).resolve().parent
+if str(HYPERAGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(HYPERAGENT_DIR))
+
+from report_io import MINHASH_PERMUTATIONS, JSONStreamReader, iter_store_partition  # noqa: E402
 
 
 SCHEMA_VERSION = "1"
@@ -20,7 +38,32 @@ DEFAULT_BASELINE_MIN_SESSIONS = 10
 DEFAULT_DECAY_HALF_LIFE_DAYS = 7
 DEFAULT_TREND_THRESHOLD = 0.15
 DEFAULT_BASELINE_PATH = "~/.claude/hyperagent/baseline.json"
+DEFAULT_STORE_PATH = "~/.claude/hyperagent/signals"
+DEFAULT_BLAME_CACHE_PATH = "~/.claude/hyperagent/blame-cache.json"
+DEFAULT_STATE_PATH = "~/.claude/hyperagent/score-state.json"
+# Composites are clamped to [0, 1]; the state's quantile sketch buckets them at this resolution.
+COMPOSITE_SKETCH_BINS = 1000
+HISTORY_QUANTILES = (0.1, 0.5, 0.9)
+# Folded session ids are remembered this long before the watermark; sessions
+# that turn up later than that can no longer be told apart from folded ones.
+STATE_SESSION_RETENTION_DAYS = 30
+DEFAULT_BLAME_WORKERS = 8
+HASH_OBJECT_BATCH = 256
+# Bumped when cached per-file line counts are computed differently.
+BLAME_CACHE_VERSION = "2"
+ADOPTION_ENGINES = ("plumbing", "blame")
+BLAME_HEADER_PATTERN = re.compile(r"(?:[0-9a-f]{40}|[0-9a-f]{64}) \d+ \d+")
+INSTRUCTION_LSH_BANDS = 8
+INSTRUCTION_LSH_ROWS = MINHASH_PERMUTATIONS // INSTRUCTION_LSH_BANDS
+assert INSTRUCTION_LSH_BANDS * INSTRUCTION_LSH_ROWS == MINHASH_PERMUTATIONS
+INSTRUCTION_CLUSTER_SIMILARITY = 0.5
+INSTRUCTION_CLUSTER_MIN_SESSIONS = 3
+INSTRUCTION_CLUSTER_EXAMPLES = 3
 REPO_ROOT = Path(__file__).resolve().parents[2]
+NAN = float("nan")
+
+# Work done by the current scoring run, reported under ``diagnostics``.
+score_counters: Counter[str] = Counter()
 
 
 @dataclass
@@ -56,6 +99,7 @@ class EntityScore:
     baseline: dict[str, Any] | None
     suggestions: list[dict[str, Any]]
     commit_adoption_rate: dict[str, Any]
+    history: dict[str, Any] | None = None
 
 
 def warn(message: str) -> None:
@@ -116,30 +160,81 @@ def decay_weight(timestamp: datetime | None, reference: datetime, half_life_days
     return 2 ** (-days_ago / max(half_life_days, 1))
 
 
-def weighted_average(rows: list[tuple[float, float]]) -> float:
-    total_weight = sum(weight for _, weight in rows)
-    if total_weight <= 0:
-        return 0.0
-    return sum(value * weight for value, weight in rows) / total_weight
+def ordered_sum(values: Iterable[float]) -> float:
+    """Left-to-right float sum, the order ``numpy.bincount`` adds in.
+
+    The builtin ``sum`` compensates float rounding from Python 3.12 on, so it
+    would make the pure-Python and NumPy dimension sums differ in the last bits.
+    """
+    total = 0.0
+    for value in values:
+        total += value
+    return total
 
 
-def load_report(args: argparse.Namespace) -> tuple[dict[str, Any], str]:
+def stream_report(handle: Any, on_session: Callable[[Any], None]) -> Any:
+    """Read an analysis report, passing each ``signals.by_session`` row to ``on_session`` as it is decoded.
+
+    Returns the report with every other member; a streamed ``by_session`` is
+    left as an empty list so the rows are never held together.
+    """
+    reader = JSONStreamReader(handle)
+    if reader.peek() != "{":
+        report = reader.value()
+        reader.end()
+        return report
+    report: dict[str, Any] = {}
+    for key in reader.members():
+        if key != "signals" or reader.peek() != "{":
+            report[key] = reader.value()
+            continue
+        signals: dict[str, Any] = {}
+        for signal_key in reader.members():
+            if signal_key != "by_session" or reader.peek() != "[":
+                signals[signal_key] = reader.value()
+                continue
+            for session in reader.items():
+                on_session(session)
+            signals[signal_key] = []
+        report[key] = signals
+    reader.end()
+    return report
+
+
+def load_report(
+    args: argparse.Namespace,
+    on_session: Callable[[Any], None] | None = None,
+) -> tuple[dict[str, Any], str]:
+    """Read the analysis report named by ``args``, or piped on stdin.
+
+    With ``on_session`` the session rows are streamed to it instead of being
+    collected into ``signals.by_session``.
+    """
+    rows: list[Any] = []
+    callback = on_session or rows.append
     raw_source = args.input or args.report
     if raw_source:
         path = expand_input_path(raw_source)
         try:
-            return json.loads(path.read_text(encoding="utf-8")), str(path)
+            with path.open(encoding="utf-8") as handle:
+                report = stream_report(handle, callback)
         except FileNotFoundError:
             raise SystemExit(f"report not found: {path}") from None
         except json.JSONDecodeError as exc:
             raise SystemExit(f"invalid report JSON: {exc}") from None
-
-    if sys.stdin.isatty():
-        raise SystemExit("no input report supplied; use --input PATH or pipe JSON on stdin")
-    try:
-        return json.load(sys.stdin), "stdin"
-    except json.JSONDecodeError as exc:
-        raise SystemExit(f"invalid report JSON from stdin: {exc}") from None
+        source = str(path)
+    else:
+        if sys.stdin.isatty():
+            raise SystemExit("no input report supplied; use --input PATH or pipe JSON on stdin")
+        try:
+            report = stream_report(sys.stdin, callback)
+        except json.JSONDecodeError as exc:
+            raise SystemExit(f"invalid report JSON from stdin: {exc}") from None
+        source = "stdin"
+    if on_session is None and isinstance(report, dict) and isinstance(report.get("signals"), dict):
+        if report["signals"].get("by_session") == []:
+            report["signals"]["by_session"] = rows
+    return report, source
 
 
 def validate_report(report: dict[str, Any]) -> None:
@@ -152,12 +247,106 @@ def validate_report(report: dict[str, Any]) -> None:
         raise SystemExit("invalid report JSON: missing signals object")
     by_session = signals.get("by_session")
     aggregated = signals.get("aggregated")
-    if not isinstance(by_session, list):
+    store = signals.get("store")
+    if store is not None and by_session is None:
+        if not isinstance(store, dict) or not isinstance(store.get("path"), str) or not isinstance(store.get("partitions"), list):
+            raise SystemExit("invalid report JSON: signals.store must have a path and a partitions list")
+        if "session_ids" in store and not isinstance(store["session_ids"], list):
+            raise SystemExit("invalid report JSON: signals.store.session_ids must be a list")
+    elif not isinstance(by_session, list):
         raise SystemExit("invalid report JSON: signals.by_session must be a list")
     if not isinstance(aggregated, dict):
         raise SystemExit("invalid report JSON: signals.aggregated must be an object")
 
 
+def read_store_partition(path: Path) -> Iterator[dict[str, Any]]:
+    if not path.exists():
+        warn(f"signal store partition not found: {path}")
+    return iter_store_partition(path)
+
+
+def store_partitions_in_range(root: Path, start: date | None, end: date | None) -> list[str]:
+    """Partitions under ``root`` whose day directory falls in [start, end]; all of them without a range."""
+    partitions = []
+    if not root.is_dir():
+        raise SystemExit(f"signal store not found: {root}")
+    for day_dir in sorted(root.iterdir()):
+        if not day_dir.is_dir():
+            continue
+        if start is not None and end is not None:
+            try:
+                day = date.fromisoformat(day_dir.name)
+            except ValueError:
+                continue
+            if not start <= day <= end:
+                continue
+        partitions.extend(f"{day_dir.name}/{path.name}" for path in sorted(day_dir.glob("*.jsonl")))
+    return partitions
+
+
+def store_row_order(row: dict[str, Any]) -> tuple[str, str]:
+    # Same order as an inline report: analyze_sessions sorts by (timestamp, session_id).
+    return str(row.get("timestamp") or ""), str(row.get("session_id") or "")
+
+
+def iter_store_rows(root: Path, partitions: list[str], session_ids: set[str] | None = None) -> Iterator[dict[str, Any]]:
+    """Rows of ``partitions`` in ``store_row_order``; only those in ``session_ids`` when given.
+
+    write_signal_store keeps every partition in that order, so the partitions
+    are merged as they are read and only one row of each is held at a time.
+    """
+    streams = [
+        (row for row in read_store_partition(root / partition) if session_ids is None or row["session_id"] in session_ids)
+        for partition in partitions
+    ]
+    return heapq.merge(*streams, key=store_row_order)
+
+
+def feed_store_rows(rows: Iterator[dict[str, Any]], on_session: Callable[[Any], None] | None) -> tuple[list[dict[str, Any]], int]:
+    """Hand ``rows`` to ``on_session``, or collect them when it is None; returns the collected rows and the row count."""
+    collected: list[dict[str, Any]] = []
+    count = 0
+    for row in rows:
+        count += 1
+        if on_session is None:
+            collected.append(row)
+        else:
+            on_session(row)
+    return collected, count
+
+
+def report_from_store(
+    root: Path, date_range: tuple[date, date] | None, on_session: Callable[[Any], None] | None = None
+) -> dict[str, Any]:
+    """A report over the store's partitions in ``date_range``; with ``on_session`` its rows are streamed, like ``load_report``."""
+    start, end = date_range if date_range else (None, None)
+    rows, count = feed_store_rows(iter_store_rows(root, store_partitions_in_range(root, start, end)), on_session)
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "generated_at": None,
+        "date_range": {"start": start.isoformat(), "end": end.isoformat()} if start and end else None,
+        "sessions_analyzed": count,
+        "sessions_skipped": 0,
+        "signals": {"by_session": rows, "aggregated": {}},
+    }
+
+
+def resolve_store_rows(report: dict[str, Any], on_session: Callable[[Any], None] | None = None) -> None:
+    """Read the partitions a ``--store`` analysis report points at.
+
+    Their rows go to ``on_session`` as they are merged, leaving
+    ``signals.by_session`` empty; without it they are loaded into it.
+    """
+    signals = report["signals"]
+    if isinstance(signals.get("by_session"), list):
+        return
+    store = signals["store"]
+    # Partitions are shared with other analyze runs; a pointer lists the sessions its run produced.
+    session_ids = {str(item) for item in store["session_ids"]} if "session_ids" in store else None
+    rows = iter_store_rows(expand_input_path(store["path"]), [str(item) for item in store["partitions"]], session_ids)
+    signals["by_session"], _ = feed_store_rows(rows, on_session)
+
+
 def validate_metadata_paths(registry: Path, skills: Path) -> None:
     missing = [str(path) for path in (registry, skills) if not path.exists() or not path.is_dir()]
     if missing:
@@ -299,108 +488,283 @@ def orchestration_dimensions(session: dict[str, Any], count: int) -> tuple[dict[
     return dimensions, clamp(composite), adjusted_corrections + adjusted_repeated + adjusted_failures
 
 
-def build_samples(report: dict[str, Any]) -> list[SessionSample]:
-    samples: list[SessionSample] = []
+class SampleStore:
+    """Session samples in parallel columns instead of one ``SessionSample`` each.
+
+    Numeric fields are ``array`` columns indexed by sample. Session ids,
+    timestamps and touched-file sets are stored once per session and
+    referenced through ``session_index``; entity types and ids once per
+    entity through ``entity_index``. Each dimension is one column, NaN where
+    a sample lacks it. Iterating yields ``SessionSample`` views.
+    """
+
+    def __init__(self) -> None:
+        self.session_ids: list[str] = []
+        self.session_timestamps: list[datetime | None] = []
+        self.session_files: list[set[str]] = []
+        self.entity_keys: list[str] = []
+        self.entity_types: list[str] = []
+        self.entity_ids: list[str] = []
+        self.entity_dimensions: list[set[str]] = []
+        self.entity_lookup: dict[str, int] = {}
+        self.session_index = array("q")
+        self.entity_index = array("q")
+        self.counts = array("q")
+        self.turn_counts = array("q")
+        self.complexity_scores = array("d")
+        self.negative_factors = array("d")
+        self.composites = array("d")
+        self.negative_totals = array("d")
+        self.dimensions: dict[str, array[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entity_index)
+
+    def __iter__(self) -> Iterator[SessionSample]:
+        return (self.sample(index) for index in range(len(self)))
+
+    def add_session(self, session_id: str, timestamp: datetime | None, files: set[str]) -> int:
+        self.session_ids.append(sys.intern(session_id))
+        self.session_timestamps.append(timestamp)
+        self.session_files.append(files)
+        return len(self.session_ids) - 1
+
+    def add(
+        self,
+        session: int,
+        entity_type: str,
+        entity_id: str,
+        count: int,
+        turn_count: int,
+        complexity_score: float,
+        negative_factor: float,
+        dimensions: dict[str, float],
+        composite: float,
+        negative_total: float,
+    ) -> None:
+        key = entity_key(entity_type, entity_id)
+        entity = self.entity_lookup.get(key)
+        if entity is None:
+            entity = self.entity_lookup[key] = len(self.entity_keys)
+            self.entity_keys.append(key)
+            self.entity_types.append(sys.intern(entity_type))
+            self.entity_ids.append(sys.intern(entity_id))
+            self.entity_dimensions.append(set())
+        self.entity_dimensions[entity].update(dimensions)
+        for name in dimensions:
+            if name not in self.dimensions:
+                self.dimensions[name] = array("d", [NAN]) * len(self)
+        for name, column in self.dimensions.items():
+            column.append(dimensions.get(name, NAN))
+        self.session_index.append(session)
+        self.entity_index.append(entity)
+        self.counts.append(count)
+        self.turn_counts.append(turn_count)
+        self.complexity_scores.append(complexity_score)
+        self.negative_factors.append(negative_factor)
+        self.composites.append(composite)
+        self.negative_totals.append(negative_total)
+
+    def append(self, sample: SessionSample) -> None:
+        """Add a standalone sample as a session of its own."""
+        self.add(
+            self.add_session(sample.session_id, sample.timestamp, sample.touched_files),
+            entity_type=sample.entity_type,
+            entity_id=sample.entity_id,
+            count=sample.count,
+            turn_count=sample.turn_count,
+            complexity_score=sample.complexity_score,
+            negative_factor=sample.negative_factor,
+            dimensions=sample.dimensions,
+            composite=sample.composite,
+            negative_total=sample.negative_total,
+        )
+
+    def sample(self, index: int) -> SessionSample:
+        entity = self.entity_index[index]
+        session = self.session_index[index]
+        return SessionSample(
+            entity_type=self.entity_types[entity],
+            entity_id=self.entity_ids[entity],
+            session_id=self.session_ids[session],
+            timestamp=self.session_timestamps[session],
+            count=self.counts[index],
+            turn_count=self.turn_counts[index],
+            complexity_score=self.complexity_scores[index],
+            negative_factor=self.negative_factors[index],
+            dimensions={name: column[index] for name, column in self.dimensions.items() if column[index] == column[index]},
+            composite=self.composites[index],
+            negative_total=self.negative_totals[index],
+            touched_files=self.session_files[session],
+        )
+
+    def groups(self) -> dict[str, list[int]]:
+        """Sample indices per entity key, in key order; scoring and baseline establishment share it."""
+        members: list[list[int]] = [[] for _ in self.entity_keys]
+        for index, entity in enumerate(self.entity_index):
+            members[entity].append(index)
+        order = sorted(range(len(self.entity_keys)), key=self.entity_keys.__getitem__)
+        return {self.entity_keys[entity]: members[entity] for entity in order}
+
+    def entity_of(self, indices: list[int]) -> int:
+        return self.entity_index[indices[0]]
+
+    def sessions_of(self, indices: list[int]) -> list[int]:
+        return sorted({self.session_index[index] for index in indices})
+
+
+def build_samples(report: dict[str, Any]) -> SampleStore:
+    store = SampleStore()
     for session in report["signals"]["by_session"]:
-        if not isinstance(session, dict):
-            continue
-        session_id = str(session.get("session_id") or "unknown-session")
-        timestamp = parse_timestamp(session.get("timestamp"))
-        turn_count = max(int(session.get("turn_count") or 0), 0)
-        complexity_score, negative_factor = complexity_values(session)
-        files = touched_files(session)
-
-        for skill, count in entity_rows(session, "skill_invocations", "count"):
-            dimensions, composite, negative_total = skill_dimensions(session, count)
-            samples.append(
-                SessionSample(
-                    entity_type="skill",
-                    entity_id=skill,
-                    session_id=session_id,
-                    timestamp=timestamp,
-                    count=count,
-                    turn_count=turn_count,
-                    complexity_score=complexity_score,
-                    negative_factor=negative_factor,
-                    dimensions=dimensions,
-                    composite=composite,
-                    negative_total=negative_total,
-                    touched_files=files,
-                )
-            )
+        add_session_samples(store, session)
+    return store
+
+
+def add_session_samples(store: SampleStore, session: Any) -> None:
+    """Append one sample per entity the session row used."""
+    if not isinstance(session, dict):
+        return
+    rows: list[tuple[str, str, int, tuple[dict[str, float], float, float]]] = []
+    for skill, count in entity_rows(session, "skill_invocations", "count"):
+        rows.append(("skill", skill, count, skill_dimensions(session, count)))
+    agent_counts = entity_rows(session, "agent_dispatches", "count")
+    for agent, count in agent_counts:
+        rows.append(("agent", agent, count, agent_dimensions(session, count)))
+    if agent_counts:
+        total_dispatches = sum(count for _, count in agent_counts)
+        rows.append(("orchestration", "global", total_dispatches, orchestration_dimensions(session, total_dispatches)))
+    if not rows:
+        return
+
+    turn_count = max(int(session.get("turn_count") or 0), 0)
+    complexity_score, negative_factor = complexity_values(session)
+    index = store.add_session(
+        str(session.get("session_id") or "unknown-session"),
+        parse_timestamp(session.get("timestamp")),
+        touched_files(session),
+    )
+    for entity_type, entity_id, count, (dimensions, composite, negative_total) in rows:
+        store.add(
+            index,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            count=count,
+            turn_count=turn_count,
+            complexity_score=complexity_score,
+            negative_factor=negative_factor,
+            dimensions=dimensions,
+            composite=composite,
+            negative_total=negative_total,
+        )
+
+
+def sample_weights(samples: SampleStore, reference_time: datetime, half_life_days: int) -> list[float]:
+    """``session_weight * decay_weight * count`` of every sample; decay once per session, turn weight once per turn count."""
+    decays = [decay_weight(timestamp, reference_time, half_life_days) for timestamp in samples.session_timestamps]
+    turn_weights = {turn_count: session_weight(turn_count) for turn_count in set(samples.turn_counts)}
+    return [
+        turn_weights[turn_count] * decays[session] * max(count, 1)
+        for turn_count, session, count in zip(samples.turn_counts, samples.session_index, samples.counts)
+    ]
 
-        agent_counts = entity_rows(session, "agent_dispatches", "count")
-        for agent, count in agent_counts:
-            dimensions, composite, negative_total = agent_dimensions(session, count)
-            samples.append(
-                SessionSample(
-                    entity_type="agent",
-                    entity_id=agent,
-                    session_id=session_id,
-                    timestamp=timestamp,
-                    count=count,
-                    turn_count=turn_count,
-                    complexity_score=complexity_score,
-                    negative_factor=negative_factor,
-                    dimensions=dimensions,
-                    composite=composite,
-                    negative_total=negative_total,
-                    touched_files=files,
-                )
-            )
 
-        if agent_counts:
-            total_dispatches = sum(count for _, count in agent_counts)
-            dimensions, composite, negative_total = orchestration_dimensions(session, total_dispatches)
-            samples.append(
-                SessionSample(
-                    entity_type="orchestration",
-                    entity_id="global",
-                    session_id=session_id,
-                    timestamp=timestamp,
-                    count=total_dispatches,
-                    turn_count=turn_count,
-                    complexity_score=complexity_score,
-                    negative_factor=negative_factor,
-                    dimensions=dimensions,
-                    composite=composite,
-                    negative_total=negative_total,
-                    touched_files=files,
-                )
+def dimension_sums(
+    samples: SampleStore,
+    reference_time: datetime,
+    half_life_days: int,
+    grouped: dict[str, list[int]] | None = None,
+) -> dict[str, tuple[float, dict[str, float]]]:
+    """Total sample weight and weighted sum of every dimension, per entity.
+
+    A dimension an entity's sample lacks counts as 0. With NumPy the store's
+    columns are summed for all entities at once with one ``bincount`` per
+    dimension; without it each entity's samples are added in the same index
+    order, so both paths give bit-identical floats.
+    """
+    if grouped is None:
+        grouped = samples.groups()
+    result: dict[str, tuple[float, dict[str, float]]] = {}
+    if numpy is not None and len(samples):
+        turn_counts = numpy.frombuffer(samples.turn_counts, dtype=numpy.int64)
+        distinct_turns, turn_positions = numpy.unique(turn_counts, return_inverse=True)
+        turn_weights = numpy.array([session_weight(int(turn_count)) for turn_count in distinct_turns], dtype=float)
+        decays = numpy.array(
+            [decay_weight(timestamp, reference_time, half_life_days) for timestamp in samples.session_timestamps], dtype=float
+        )
+        counts = numpy.maximum(numpy.frombuffer(samples.counts, dtype=numpy.int64), 1)
+        weights = turn_weights[turn_positions] * decays[numpy.frombuffer(samples.session_index, dtype=numpy.int64)] * counts
+        entity_index = numpy.frombuffer(samples.entity_index, dtype=numpy.int64)
+        entities = len(samples.entity_keys)
+        totals = numpy.bincount(entity_index, weights=weights, minlength=entities).tolist()
+        sums: dict[str, list[float]] = {}
+        for name, column in samples.dimensions.items():
+            values = numpy.frombuffer(column, dtype=float)
+            weighted = numpy.where(numpy.isnan(values), 0.0, values) * weights
+            sums[name] = numpy.bincount(entity_index, weights=weighted, minlength=entities).tolist()
+        for key, indices in grouped.items():
+            entity = samples.entity_of(indices)
+            result[key] = (totals[entity], {name: sums[name][entity] for name in sorted(samples.entity_dimensions[entity])})
+        return result
+
+    weights = sample_weights(samples, reference_time, half_life_days)
+    for key, indices in grouped.items():
+        entity_weights = [weights[index] for index in indices]
+        entity_sums = {}
+        for name in sorted(samples.entity_dimensions[samples.entity_of(indices)]):
+            column = samples.dimensions[name]
+            values = (column[index] for index in indices)
+            entity_sums[name] = ordered_sum(
+                (value if value == value else 0.0) * weight for value, weight in zip(values, entity_weights)
             )
-    return samples
+        result[key] = (ordered_sum(entity_weights), entity_sums)
+    return result
+
+
+def dimension_averages(
+    samples: SampleStore,
+    reference_time: datetime,
+    half_life_days: int,
+    grouped: dict[str, list[int]] | None = None,
+) -> dict[str, dict[str, float]]:
+    """Weighted average of every dimension of every entity, summed in ``ordered_sum`` order."""
+    return {
+        key: {name: value / total if total > 0 else 0.0 for name, value in sums.items()}
+        for key, (total, sums) in dimension_sums(samples, reference_time, half_life_days, grouped).items()
+    }
 
 
 def aggregate_entity_scores(
-    samples: list[SessionSample],
+    samples: SampleStore,
     baseline_data: dict[str, Any],
     reference_time: datetime,
     half_life_days: int,
     trend_threshold: float,
+    adoption: CommitAdoption | None = None,
+    grouped: dict[str, list[int]] | None = None,
+    state: ScoreState | None = None,
 ) -> list[EntityScore]:
-    grouped: defaultdict[str, list[SessionSample]] = defaultdict(list)
-    for sample in samples:
-        grouped[entity_key(sample.entity_type, sample.entity_id)].append(sample)
+    """Score every entity in ``samples``.
+
+    ``grouped`` is ``samples.groups()`` when the caller already has it.
+    Commit adoption comes from ``adoption`` (a fresh uncached one by default);
+    every touched file is measured up front so shared files are blamed once.
+    With a ``state`` that has folded ``samples`` in, dimensions and session
+    counts come from its running history instead of ``samples`` alone.
+    """
+    if grouped is None:
+        grouped = samples.groups()
+    if adoption is None:
+        adoption = CommitAdoption(REPO_ROOT)
+    adoption.prepare(set().union(*samples.session_files))
+    averages = state.averages if state is not None else dimension_averages(samples, reference_time, half_life_days, grouped)
 
     scores: list[EntityScore] = []
     baselines = baseline_data.get("entities") if isinstance(baseline_data.get("entities"), dict) else {}
-    for key, entity_samples in sorted(grouped.items()):
-        entity_type = entity_samples[0].entity_type
-        entity_id = entity_samples[0].entity_id
-        dimension_names = sorted({name for sample in entity_samples for name in sample.dimensions})
-        dimension_values: dict[str, float] = {}
-        for name in dimension_names:
-            dimension_values[name] = weighted_average(
-                [
-                    (
-                        sample.dimensions.get(name, 0.0),
-                        session_weight(sample.turn_count)
-                        * decay_weight(sample.timestamp, reference_time, half_life_days)
-                        * max(sample.count, 1),
-                    )
-                    for sample in entity_samples
-                ]
-            )
+    for key, indices in grouped.items():
+        entity = samples.entity_of(indices)
+        entity_type = samples.entity_types[entity]
+        entity_id = samples.entity_ids[entity]
+        dimension_values = averages[key]
 
         if entity_type == "skill":
             composite = (
@@ -426,12 +790,18 @@ def aggregate_entity_scores(
 
         score = rounded(composite)
         baseline = baseline_for_entity(baselines, key)
-        trend = trend_for_entity(baseline, [sample.composite for sample in entity_samples], trend_threshold)
-        unique_sessions = len({sample.session_id for sample in entity_samples})
-        suggestions = suggestions_for_entity(entity_type, entity_id, score, dimension_values, trend, unique_sessions)
-        evidence_sessions = evidence_for_entity(entity_samples)
-        touched = set().union(*(sample.touched_files for sample in entity_samples)) if entity_samples else set()
-        adoption_rate = compute_commit_adoption_rate(entity_id, touched, REPO_ROOT)
+        composites = [samples.composites[index] for index in indices]
+        sessions = samples.sessions_of(indices)
+        trend = trend_for_entity(baseline, composites, trend_threshold)
+        session_ids = sorted({samples.session_ids[session] for session in sessions})
+        history = state.history(key) if state is not None else None
+        sessions_count = history["sessions"] if history is not None else len(session_ids)
+        suggestions = suggestions_for_entity(entity_type, entity_id, score, dimension_values, trend, sessions_count)
+        evidence_sessions = evidence_for_entity(
+            [(samples.negative_totals[index], samples.session_ids[samples.session_index[index]]) for index in indices]
+        )
+        touched = set().union(*(samples.session_files[session] for session in sessions))
+        adoption_rate = adoption.rate(entity_id, touched)
         scores.append(
             EntityScore(
                 entity_type=entity_type,
@@ -439,16 +809,17 @@ def aggregate_entity_scores(
                 score=score,
                 dimensions={name: rounded(value) for name, value in dimension_values.items()},
                 score_breakdown=score_breakdown(entity_type, dimension_values),
-                sessions=len({sample.session_id for sample in entity_samples}),
-                invocations=sum(sample.count for sample in entity_samples),
+                sessions=sessions_count,
+                invocations=history["invocations"] if history is not None else sum(samples.counts[index] for index in indices),
                 evidence_sessions=evidence_sessions,
-                session_scores=[rounded(sample.composite) for sample in entity_samples],
-                session_ids=sorted({sample.session_id for sample in entity_samples}),
+                session_scores=[rounded(composite) for composite in composites],
+                session_ids=session_ids,
                 touched_files=touched,
                 trend=trend,
                 baseline=baseline,
                 suggestions=suggestions,
                 commit_adoption_rate=adoption_rate,
+                history=history,
             )
         )
     return scores
@@ -483,11 +854,12 @@ def score_breakdown(entity_type: str, dimensions: dict[str, float]) -> dict[str,
     return rows
 
 
-def evidence_for_entity(samples: list[SessionSample]) -> list[str]:
-    ordered = sorted(samples, key=lambda sample: (-sample.negative_total, sample.session_id))
-    evidence = [sample.session_id for sample in ordered if sample.negative_total > 0]
+def evidence_for_entity(rows: list[tuple[float, str]]) -> list[str]:
+    """Evidence session ids from each sample's (negative_total, session_id)."""
+    ordered = sorted(rows, key=lambda row: (-row[0], row[1]))
+    evidence = [session_id for negative_total, session_id in ordered if negative_total > 0]
     if not evidence:
-        evidence = [sample.session_id for sample in ordered[:3]]
+        evidence = [session_id for _, session_id in ordered[:3]]
     return list(dict.fromkeys(evidence))[:5]
 
 
@@ -631,74 +1003,541 @@ def target_for(entity_type: str, entity_id: str) -> str:
     return "orchestration-policy"
 
 
-def compute_commit_adoption_rate(entity_id: str, files: set[str], repo_path: Path) -> dict[str, Any]:
-    if not files:
-        return {
-            "available": False,
-            "rate": None,
-            "method": "git_blame",
-            "reason": "analysis report does not include touched files for this entity",
-        }
+def adoption_skipped(entity_id: str) -> dict[str, Any]:
+    score_counters["commit_adoption_skipped"] += 1
+    return {
+        "available": False,
+        "rate": None,
+        "method": "git_blame",
+        "reason": "skipped: scoring time budget exhausted",
+        "entity_id": entity_id,
+    }
+
+
+def blame_line_counts(porcelain: str) -> tuple[int, int]:
+    """(committed, total) line counts from ``git blame --line-porcelain`` output."""
     committed_lines = 0
     total_lines = 0
-    considered_files: list[str] = []
-    for raw_file in sorted(files):
+    for line in porcelain.splitlines():
+        # Only "<commit> <orig-line> <final-line>" headers count; "committer A B C" must not.
+        if BLAME_HEADER_PATTERN.match(line):
+            total_lines += 1
+            if line[:40] != "0" * 40:
+                committed_lines += 1
+    return committed_lines, total_lines
+
+
+def text_line_count(content: bytes) -> int:
+    """Lines as git blame counts them: a final line without a newline still counts."""
+    return content.count(b"\n") + (1 if content and not content.endswith(b"\n") else 0)
+
+
+class CommitAdoption:
+    """Commit adoption of touched files, measured at most once per file.
+
+    The ``plumbing`` engine derives blame's line counts without blame: a file's
+    committed lines are its HEAD blob lines (``git cat-file --batch``) minus
+    the lines ``git diff HEAD --numstat`` deletes, and its uncommitted lines
+    are the ones numstat adds. Files that cannot be settled that way (binary,
+    not in HEAD, git errors) fall back to ``git blame``, which the ``blame``
+    engine uses for everything.
+
+    ``prepare`` measures every file not seen yet, blaming on a thread pool. With a cache
+    path, per-file line counts persist across runs keyed by HEAD commit,
+    working-tree blob id and path, so an unchanged file at an unchanged HEAD
+    is not blamed again. Entity rates sum the counts of their files.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        cache_path: Path | None = None,
+        workers: int = DEFAULT_BLAME_WORKERS,
+        deadline: float | None = None,
+        engine: str = "plumbing",
+    ) -> None:
+        if engine not in ADOPTION_ENGINES:
+            raise ValueError(f"unknown adoption engine: {engine}")
+        self.repo_path = repo_path
+        self.resolved_root = repo_path.resolve()
+        self.cache_path = cache_path
+        self.workers = workers
+        self.deadline = deadline
+        self.engine = engine
+        # Repo-relative path -> (committed, total) lines, or None when git cannot blame it.
+        self.counts: dict[str, tuple[int, int] | None] = {}
+        self.skipped: set[str] = set()
+        self.relative_paths: dict[str, str | None] = {}
+        self.head: str | None = None
+        self.cache_entries: dict[str, list[int] | None] = {}
+        self.dirty = False
+        if cache_path is None or not cache_path.exists():
+            return
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            warn(f"ignoring unreadable blame cache {cache_path}: {exc}")
+            return
+        if isinstance(data, dict) and data.get("schema_version") == BLAME_CACHE_VERSION and isinstance(data.get("entries"), dict):
+            self.cache_entries = data["entries"]
+
+    def remaining(self) -> float | None:
+        return self.deadline - time.monotonic() if self.deadline is not None else None
+
+    def git_bytes(self, args: list[str], stdin: bytes | None = None) -> bytes | None:
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            return None
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.repo_path,
+                input=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=False,
+                timeout=remaining,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return result.stdout if result.returncode == 0 else None
+
+    def git(self, args: list[str]) -> str | None:
+        output = self.git_bytes(args)
+        return output.decode("utf-8", "replace") if output is not None else None
+
+    def resolve_head(self) -> str | None:
+        if self.head is None:
+            head = self.git(["rev-parse", "HEAD"])
+            if head is not None:
+                self.head = head.strip()
+        return self.head
+
+    def relative(self, raw_file: str) -> str | None:
+        """Repo-relative path of a touched file, or None when it is outside the repo or missing."""
+        if raw_file in self.relative_paths:
+            return self.relative_paths[raw_file]
         path = Path(raw_file)
+        relative: Path | None = path
         if path.is_absolute():
             try:
-                relative = path.resolve().relative_to(repo_path.resolve())
+                relative = path.resolve().relative_to(self.resolved_root)
             except ValueError:
+                relative = None
+        if relative is not None:
+            candidate = self.repo_path / relative
+            if not candidate.exists() or not candidate.is_file():
+                relative = None
+        result = str(relative) if relative is not None else None
+        self.relative_paths[raw_file] = result
+        return result
+
+    def cache_keys(self, paths: list[str]) -> dict[str, str]:
+        if self.cache_path is None or self.resolve_head() is None:
+            return {}
+        keys: dict[str, str] = {}
+        for start in range(0, len(paths), HASH_OBJECT_BATCH):
+            batch = paths[start : start + HASH_OBJECT_BATCH]
+            output = self.git(["hash-object", "--", *batch])
+            blobs = output.split() if output is not None else []
+            if len(blobs) == len(batch):
+                keys.update({path: f"{self.head}:{blob}:{path}" for path, blob in zip(batch, blobs)})
+        return keys
+
+    def head_line_counts(self, paths: list[str]) -> dict[str, int]:
+        """Line counts of the HEAD blobs of ``paths``; paths missing from HEAD or not blobs are left out."""
+        counts: dict[str, int] = {}
+        output = self.git_bytes(["cat-file", "--batch"], "".join(f"{self.head}:{path}\n" for path in paths).encode("utf-8"))
+        if output is None:
+            return counts
+        position = 0
+        for path in paths:
+            end = output.find(b"\n", position)
+            if end < 0:
+                break
+            header = output[position:end].split(b" ")
+            position = end + 1
+            if len(header) != 3 or not header[2].isdigit():
+                # "<object> missing"; the object name is ours, so nothing follows it.
                 continue
-        else:
-            relative = path
-        candidate = repo_path / relative
-        if not candidate.exists() or not candidate.is_file():
-            continue
-        result = subprocess.run(
-            ["git", "blame", "--line-porcelain", "--", str(relative)],
-            cwd=repo_path,
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
+            size = int(header[2])
+            if header[1] == b"blob":
+                counts[path] = text_line_count(output[position : position + size])
+            position += size + 1
+        return counts
+
+    def plumbing_counts(self, paths: list[str]) -> dict[str, tuple[int, int]]:
+        """(committed, total) lines for the ``paths`` plumbing can settle without blame."""
+        if self.resolve_head() is None:
+            return {}
+        results: dict[str, tuple[int, int]] = {}
+        names = [path for path in paths if "\n" not in path]
+        for start in range(0, len(names), HASH_OBJECT_BATCH):
+            batch = names[start : start + HASH_OBJECT_BATCH]
+            head_lines = self.head_line_counts(batch)
+            if not head_lines:
+                continue
+            numstat = self.git_bytes(
+                ["--literal-pathspecs", "diff", "HEAD", "--numstat", "-z", "--no-renames", "--no-ext-diff", "--", *head_lines]
+            )
+            if numstat is None:
+                continue
+            changes: dict[str, tuple[int, int] | None] = {}
+            for record in numstat.split(b"\0"):
+                fields = record.split(b"\t", 2)
+                if len(fields) != 3:
+                    continue
+                path = fields[2].decode("utf-8", "surrogateescape")
+                # Binary files report "-" for both counts; blame still counts their "lines".
+                changes[path] = (int(fields[0]), int(fields[1])) if fields[0].isdigit() and fields[1].isdigit() else None
+            for path, lines in head_lines.items():
+                if path in changes and changes[path] is None:
+                    continue
+                added, deleted = changes.get(path) or (0, 0)
+                results[path] = (lines - deleted, lines - deleted + added)
+        return results
+
+    def blame(self, path: str) -> tuple[str, tuple[int, int] | None]:
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            return "skipped", None
+        try:
+            result = subprocess.run(
+                ["git", "blame", "--line-porcelain", "--", path],
+                cwd=self.repo_path,
+                text=True,
+                errors="replace",
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=False,
+                timeout=remaining,
+            )
+        except subprocess.TimeoutExpired:
+            return "skipped", None
         if result.returncode != 0:
-            continue
-        considered_files.append(str(relative))
-        for line in result.stdout.splitlines():
-            if not line or line.startswith("\t"):
+            return "failed", None
+        return "blamed", blame_line_counts(result.stdout)
+
+    def prepare(self, raw_files: Iterable[str]) -> None:
+        """Measure every touched file not measured yet: cache first, then ``git blame`` on the pool."""
+        relative = {self.relative(raw_file) for raw_file in raw_files}
+        pending = sorted(path for path in relative if path is not None and path not in self.counts and path not in self.skipped)
+        if not pending:
+            return
+        keys = self.cache_keys(pending)
+        misses = []
+        for path in pending:
+            key = keys.get(path)
+            if key is not None and key in self.cache_entries:
+                entry = self.cache_entries[key]
+                self.counts[path] = (entry[0], entry[1]) if entry is not None else None
+                score_counters["blame_cache_hits"] += 1
+            else:
+                misses.append(path)
+        if misses and self.engine == "plumbing":
+            settled = self.plumbing_counts(misses)
+            score_counters["plumbing_files"] += len(settled)
+            for path, counts in settled.items():
+                self.record(path, counts, keys)
+            misses = [path for path in misses if path not in settled]
+        if not misses:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(misses))) as executor:
+            for path, (status, counts) in zip(misses, executor.map(self.blame, misses)):
+                if status == "skipped":
+                    self.skipped.add(path)
+                    continue
+                score_counters["git_blame_calls"] += 1
+                self.record(path, counts, keys)
+
+    def record(self, path: str, counts: tuple[int, int] | None, keys: dict[str, str]) -> None:
+        self.counts[path] = counts
+        if path in keys:
+            self.cache_entries[keys[path]] = list(counts) if counts is not None else None
+            self.dirty = True
+
+    def rate(self, entity_id: str, files: set[str]) -> dict[str, Any]:
+        if not files:
+            return {
+                "available": False,
+                "rate": None,
+                "method": "git_blame",
+                "reason": "analysis report does not include touched files for this entity",
+            }
+        self.prepare(files)
+        committed_lines = 0
+        total_lines = 0
+        considered_files: list[str] = []
+        for raw_file in sorted(files):
+            path = self.relative(raw_file)
+            if path is None:
+                continue
+            if path in self.skipped:
+                return adoption_skipped(entity_id)
+            counts = self.counts.get(path)
+            if counts is None:
                 continue
-            parts = line.split()
-            if len(parts) >= 4 and len(parts[0]) >= 8:
-                total_lines += 1
-                if set(parts[0]) != {"0"}:
-                    committed_lines += 1
-    if total_lines == 0:
+            considered_files.append(path)
+            committed_lines += counts[0]
+            total_lines += counts[1]
+        if total_lines == 0:
+            return {
+                "available": False,
+                "rate": None,
+                "method": "git_blame",
+                "reason": "no blameable lines found for touched files",
+                "files_considered": considered_files,
+                "entity_id": entity_id,
+            }
         return {
-            "available": False,
-            "rate": None,
+            "available": True,
+            "rate": round(committed_lines / total_lines, 4),
             "method": "git_blame",
-            "reason": "no blameable lines found for touched files",
+            "committed_lines": committed_lines,
+            "total_lines": total_lines,
             "files_considered": considered_files,
             "entity_id": entity_id,
         }
-    return {
-        "available": True,
-        "rate": round(committed_lines / total_lines, 4),
-        "method": "git_blame",
-        "committed_lines": committed_lines,
-        "total_lines": total_lines,
-        "files_considered": considered_files,
-        "entity_id": entity_id,
-    }
+
+    def save(self) -> None:
+        """Write entries for the current HEAD only; older HEADs can never match again."""
+        if self.cache_path is None or not self.dirty or self.head is None:
+            return
+        prefix = f"{self.head}:"
+        entries = {key: value for key, value in self.cache_entries.items() if key.startswith(prefix)}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({"schema_version": BLAME_CACHE_VERSION, "entries": entries}) + "\n", encoding="utf-8")
+        tmp_path.replace(self.cache_path)
+        self.dirty = False
+
+
+def compute_commit_adoption_rate(
+    entity_id: str,
+    files: set[str],
+    repo_path: Path,
+    deadline: float | None = None,
+) -> dict[str, Any]:
+    return CommitAdoption(repo_path, deadline=deadline).rate(entity_id, files)
+
+
+class ScoreState:
+    """Running per-entity score history, so a run only folds in sessions it has not seen.
+
+    Per entity it keeps exponentially decayed dimension sums and their total
+    weight as of ``reference_time``. Moving the reference forward multiplies
+    both by one ``decay_weight``, which for exponential decay is the same as
+    re-weighting every folded sample. It also keeps sample, session and
+    invocation counts and a fixed-bin histogram of session composites as a
+    mergeable quantile sketch.
+
+    Sessions are folded once, by id: the state remembers the timestamp and
+    turn count of every session it folded since ``horizon``, so a session
+    discovered late is still folded. Skipped sessions are counted by reason:
+    ``already_folded``; ``grown`` (folded while still running, and their later
+    turns cannot be added without counting the earlier ones twice);
+    ``expired`` (at or before ``horizon``, where folded ids are forgotten);
+    and ``no_timestamp`` (cannot be decayed or expired).
+    """
+
+    def __init__(self, path: Path, half_life_days: int) -> None:
+        self.path = path
+        self.half_life_days = half_life_days
+        self.reference_time: datetime | None = None
+        self.watermark: datetime | None = None
+        self.horizon: datetime | None = None
+        self.sessions: dict[str, tuple[datetime, int]] = {}
+        self.pending: dict[str, tuple[datetime, int]] = {}
+        self.entities: dict[str, dict[str, Any]] = {}
+        self.averages: dict[str, dict[str, float]] = {}
+        self.sessions_folded = 0
+        self.skipped: Counter[str] = Counter()
+        self.reset_reason: str | None = None
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise SystemExit(f"invalid score state JSON: {path}: {exc}") from None
+        if not isinstance(data, dict) or not isinstance(data.get("entities"), dict):
+            raise SystemExit(f"invalid score state JSON: {path}: missing entities object")
+        config = data.get("config") if isinstance(data.get("config"), dict) else {}
+        if data.get("schema_version") != SCHEMA_VERSION or config.get("decay_half_life_days") != half_life_days:
+            # Sums decayed with another half-life cannot be rescaled; start the history over.
+            self.reset_reason = f"state was built with decay_half_life_days={config.get('decay_half_life_days')}"
+            warn(f"{path}: {self.reset_reason}; starting a new score state")
+            return
+        self.reference_time = parse_timestamp(data.get("reference_time"))
+        self.watermark = parse_timestamp(data.get("watermark"))
+        # A state written before session ids were kept only knows its watermark.
+        self.horizon = parse_timestamp(data["horizon"]) if "horizon" in data else self.watermark
+        sessions = data.get("sessions") if isinstance(data.get("sessions"), dict) else {}
+        for session_id, entry in sessions.items():
+            timestamp = parse_timestamp(entry[0]) if isinstance(entry, list) and len(entry) == 2 else None
+            if timestamp is not None:
+                self.sessions[session_id] = (timestamp, int(entry[1]))
+        self.entities = data["entities"]
+
+    def new_sessions(self, rows: list[Any]) -> list[dict[str, Any]]:
+        """Session rows the state has not folded yet."""
+        return [row for row in rows if self.is_new(row)]
+
+    def is_new(self, row: Any) -> bool:
+        """Whether to fold ``row``; a row it accepts counts as seen for the rest of the run."""
+        if not isinstance(row, dict):
+            return False
+        timestamp = parse_timestamp(row.get("timestamp"))
+        session_id = session_id_for(row)
+        turn_count = max(int(row.get("turn_count") or 0), 0)
+        seen = self.sessions.get(session_id) or self.pending.get(session_id)
+        if timestamp is None:
+            reason = "no_timestamp"
+        elif seen is not None:
+            reason = "grown" if turn_count > seen[1] else "already_folded"
+        elif self.horizon is not None and timestamp <= self.horizon:
+            reason = "expired"
+        else:
+            self.pending[session_id] = (timestamp, turn_count)
+            return True
+        self.skipped[reason] += 1
+        return False
+
+    def remember_pending(self) -> None:
+        """Record the sessions accepted this run and forget those past the retention horizon."""
+        self.sessions.update(self.pending)
+        if self.pending:
+            latest = max(timestamp for timestamp, _ in self.pending.values())
+            if self.watermark is None or latest > self.watermark:
+                self.watermark = latest
+        self.pending = {}
+        if self.watermark is not None:
+            horizon = self.watermark - timedelta(days=STATE_SESSION_RETENTION_DAYS)
+            if self.horizon is None or horizon > self.horizon:
+                self.horizon = horizon
+        if self.horizon is not None:
+            self.sessions = {
+                session_id: entry for session_id, entry in self.sessions.items() if entry[0] > self.horizon
+            }
+
+    def fold(self, samples: SampleStore, grouped: dict[str, list[int]], reference_time: datetime) -> None:
+        """Decay the history to ``reference_time`` and add ``samples``; ``averages`` covers their entities."""
+        self.averages = {}
+        self.remember_pending()
+        if not len(samples):
+            return
+        if self.reference_time is not None and self.reference_time > reference_time:
+            reference_time = self.reference_time
+        if self.reference_time is not None and reference_time > self.reference_time:
+            scale = decay_weight(self.reference_time, reference_time, self.half_life_days)
+            for row in self.entities.values():
+                row["weight"] *= scale
+                row["dimension_sums"] = {name: value * scale for name, value in row["dimension_sums"].items()}
+        self.reference_time = reference_time
+
+        for key, (total, sums) in dimension_sums(samples, reference_time, self.half_life_days, grouped).items():
+            indices = grouped[key]
+            entity = samples.entity_of(indices)
+            row = self.entities.setdefault(
+                key,
+                {
+                    "entity_type": samples.entity_types[entity],
+                    "entity_id": samples.entity_ids[entity],
+                    "weight": 0.0,
+                    "dimension_sums": {},
+                    "samples": 0,
+                    "sessions": 0,
+                    "invocations": 0,
+                    "composite_bins": {},
+                },
+            )
+            row["weight"] += total
+            for name, value in sums.items():
+                row["dimension_sums"][name] = row["dimension_sums"].get(name, 0.0) + value
+            row["samples"] += len(indices)
+            row["sessions"] += len({samples.session_ids[session] for session in samples.sessions_of(indices)})
+            row["invocations"] += sum(samples.counts[index] for index in indices)
+            bins = row["composite_bins"]
+            for index in indices:
+                bucket = str(min(int(clamp(samples.composites[index]) * COMPOSITE_SKETCH_BINS), COMPOSITE_SKETCH_BINS - 1))
+                bins[bucket] = bins.get(bucket, 0) + 1
+            weight = row["weight"]
+            self.averages[key] = {
+                name: value / weight if weight > 0 else 0.0 for name, value in sorted(row["dimension_sums"].items())
+            }
+
+        self.sessions_folded += len(samples.session_ids)
+
+    def quantile(self, key: str, fraction: float) -> float | None:
+        """Composite at ``fraction`` of the entity's history, to the sketch's bucket resolution."""
+        row = self.entities.get(key)
+        if not row or not row["composite_bins"]:
+            return None
+        bins = sorted((int(bucket), count) for bucket, count in row["composite_bins"].items())
+        target = fraction * sum(count for _, count in bins)
+        seen = 0
+        for bucket, count in bins:
+            seen += count
+            if seen >= target:
+                return round((bucket + 0.5) / COMPOSITE_SKETCH_BINS, 4)
+        return round((bins[-1][0] + 0.5) / COMPOSITE_SKETCH_BINS, 4)
+
+    def history(self, key: str) -> dict[str, Any] | None:
+        row = self.entities.get(key)
+        if row is None:
+            return None
+        return {
+            "samples": row["samples"],
+            "sessions": row["sessions"],
+            "invocations": row["invocations"],
+            "composite_quantiles": {f"p{round(fraction * 100)}": self.quantile(key, fraction) for fraction in HISTORY_QUANTILES},
+        }
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "reference_time": self.reference_time.isoformat().replace("+00:00", "Z") if self.reference_time else None,
+            "watermark": self.watermark.isoformat().replace("+00:00", "Z") if self.watermark else None,
+            "horizon": self.horizon.isoformat().replace("+00:00", "Z") if self.horizon else None,
+            "entities": len(self.entities),
+            "sessions_tracked": len(self.sessions),
+            "sessions_folded": self.sessions_folded,
+            "sessions_skipped": sum(self.skipped.values()),
+            "skipped_by_reason": dict(sorted(self.skipped.items())),
+            "reset_reason": self.reset_reason,
+        }
+
+    def save(self) -> None:
+        status = self.status()
+        data = {
+            "schema_version": SCHEMA_VERSION,
+            "updated_at": utc_now_iso(),
+            "config": {"decay_half_life_days": self.half_life_days},
+            "reference_time": status["reference_time"],
+            "watermark": status["watermark"],
+            "horizon": status["horizon"],
+            "sessions": {
+                session_id: [timestamp.isoformat().replace("+00:00", "Z"), turn_count]
+                for session_id, (timestamp, turn_count) in sorted(self.sessions.items())
+            },
+            "entities": self.entities,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            warn(f"could not write score state {self.path}: {exc}")
 
 
 def load_or_create_baseline(
     path: Path,
-    samples: list[SessionSample],
+    samples: SampleStore,
     min_sessions: int,
     half_life_days: int,
     trend_threshold: float,
+    grouped: dict[str, list[int]] | None = None,
+    state: ScoreState | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
     path = path.expanduser()
     status: dict[str, Any] = {
@@ -736,7 +1575,7 @@ def load_or_create_baseline(
         status["state"] = "created"
         status["created"] = True
 
-    changed = establish_missing_baselines(data, samples, min_sessions, status)
+    changed = establish_missing_baselines(data, samples, min_sessions, status, grouped, state)
     if status["created"] or changed:
         data["updated_at"] = utc_now_iso()
         data["config"] = {
@@ -759,35 +1598,47 @@ def load_or_create_baseline(
 
 def establish_missing_baselines(
     data: dict[str, Any],
-    samples: list[SessionSample],
+    samples: SampleStore,
     min_sessions: int,
     status: dict[str, Any],
+    grouped: dict[str, list[int]] | None = None,
+    state: ScoreState | None = None,
 ) -> bool:
-    grouped: defaultdict[str, list[SessionSample]] = defaultdict(list)
-    for sample in samples:
-        grouped[entity_key(sample.entity_type, sample.entity_id)].append(sample)
+    """Record a baseline for every entity with enough sessions and none yet.
+
+    The baseline is the median session composite; with a ``state`` both the
+    session count and the median come from its history rather than ``samples``.
+    """
+    if grouped is None:
+        grouped = samples.groups()
 
     changed = False
     baselines: dict[str, Any] = data.setdefault("entities", {})
-    for key, entity_samples in sorted(grouped.items()):
+    for key, indices in grouped.items():
         if key in baselines:
             continue
-        session_ids = sorted({sample.session_id for sample in entity_samples})
-        if len(session_ids) < min_sessions:
+        session_ids = sorted({samples.session_ids[session] for session in samples.sessions_of(indices)})
+        history = state.history(key) if state is not None else None
+        sessions_count = history["sessions"] if history is not None else len(session_ids)
+        if sessions_count < min_sessions:
             status["entities_pending"].append(
                 {
                     "entity_key": key,
-                    "sessions": len(session_ids),
+                    "sessions": sessions_count,
                     "needed": min_sessions,
                 }
             )
             continue
-        baseline_score = statistics.median(sample.composite for sample in entity_samples)
+        if history is not None:
+            baseline_score = history["composite_quantiles"]["p50"]
+        else:
+            baseline_score = statistics.median(samples.composites[index] for index in indices)
+        entity = samples.entity_of(indices)
         baselines[key] = {
-            "entity_type": entity_samples[0].entity_type,
-            "entity_id": entity_samples[0].entity_id,
+            "entity_type": samples.entity_types[entity],
+            "entity_id": samples.entity_ids[entity],
             "baseline_score": round(baseline_score, 4),
-            "baseline_sessions": len(session_ids),
+            "baseline_sessions": sessions_count,
             "established_at": utc_now_iso(),
             "source_session_ids": session_ids,
         }
@@ -886,19 +1737,131 @@ def add_grouped_gap(
     row["frequency"] += max(frequency, 1)
 
 
-def gap_analysis_for_report(report: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
-    sessions = report.get("signals", {}).get("by_session", [])
-    if not isinstance(sessions, list):
-        sessions = []
+INSTRUCTION_SIGNATURE = struct.Struct(f">{INSTRUCTION_LSH_BANDS * INSTRUCTION_LSH_ROWS}I")
+
+
+def instruction_signature_values(signature: Any) -> tuple[int, ...] | None:
+    if not isinstance(signature, str):
+        return None
+    try:
+        return INSTRUCTION_SIGNATURE.unpack(bytes.fromhex(signature))
+    except (ValueError, struct.error):
+        return None
 
-    missing_coverage: dict[str, dict[str, Any]] = {}
-    repeated_patterns: dict[str, dict[str, Any]] = {}
-    agent_totals: defaultdict[str, set[str]] = defaultdict(set)
-    agent_negative: defaultdict[str, set[str]] = defaultdict(set)
 
+class InstructionClusters:
+    """Near-identical user instructions across sessions, grouped with MinHash LSH.
+
+    Session rows are added one at a time and only one member per distinct
+    signature is kept. Each signature is then bucketed under its band keys
+    and merged into the first earlier instruction of a shared bucket whose
+    MinHash values agree often enough, so the work grows with instructions
+    times bands rather than with pairs of instructions.
+    """
+
+    def __init__(self) -> None:
+        self.signatures: dict[str, int] = {}
+        self.values: list[tuple[int, ...]] = []
+        self.members: list[dict[str, Any]] = []
+
+    def add(self, session: Any) -> None:
+        if not isinstance(session, dict) or not isinstance(session.get("instructions"), list):
+            return
+        session_id = session_id_for(session)
+        for instruction in session["instructions"]:
+            if not isinstance(instruction, dict):
+                continue
+            signature = instruction.get("signature")
+            index = self.signatures.get(signature) if isinstance(signature, str) else None
+            if index is None:
+                parsed = instruction_signature_values(signature)
+                if parsed is None:
+                    continue
+                index = self.signatures[signature] = len(self.values)
+                self.values.append(parsed)
+                self.members.append({"sessions": set(), "count": 0, "texts": defaultdict(int)})
+            count = max(int(instruction.get("count") or 1), 1)
+            self.members[index]["sessions"].add(session_id)
+            self.members[index]["count"] += count
+            text = instruction.get("text")
+            if isinstance(text, str) and text.strip():
+                self.members[index]["texts"][" ".join(text.split())] += count
+
+    def rows(self, min_sessions: int = INSTRUCTION_CLUSTER_MIN_SESSIONS) -> list[dict[str, Any]]:
+        values = self.values
+        parent = list(range(len(values)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        needed = INSTRUCTION_CLUSTER_SIMILARITY * INSTRUCTION_LSH_BANDS * INSTRUCTION_LSH_ROWS
+        band_width = 8 * INSTRUCTION_LSH_ROWS
+        buckets: dict[str, int] = {}
+        for signature, index in self.signatures.items():
+            row = values[index]
+            for start in range(0, band_width * INSTRUCTION_LSH_BANDS, band_width):
+                # The offset keeps equal hex runs in different bands apart.
+                first = buckets.setdefault(f"{start}:{signature[start : start + band_width]}", index)
+                if first == index or find(first) == find(index):
+                    continue
+                if sum(map(operator.eq, row, values[first])) >= needed:
+                    parent[find(index)] = find(first)
+
+        clusters: dict[int, dict[str, Any]] = {}
+        for index, member in enumerate(self.members):
+            cluster = clusters.setdefault(find(index), {"sessions": set(), "count": 0, "texts": defaultdict(int), "size": 0})
+            cluster["sessions"] |= member["sessions"]
+            cluster["count"] += member["count"]
+            cluster["size"] += 1
+            for text, count in member["texts"].items():
+                cluster["texts"][text] += count
+
+        rows: list[dict[str, Any]] = []
+        for cluster in clusters.values():
+            if len(cluster["sessions"]) < min_sessions or not cluster["texts"]:
+                continue
+            examples = sorted(cluster["texts"], key=lambda text: (-cluster["texts"][text], text))[:INSTRUCTION_CLUSTER_EXAMPLES]
+            rows.append(
+                {
+                    "pattern": f"여러 세션에서 반복된 지시: {examples[0]}",
+                    "sessions": sorted(cluster["sessions"]),
+                    "frequency": cluster["count"],
+                    "suggestion_type": "new_skill_or_hook",
+                    "examples": examples,
+                    "signatures": cluster["size"],
+                }
+            )
+        rows.sort(key=lambda row: (-len(row["sessions"]), -row["frequency"], row["pattern"]))
+        return rows
+
+
+def cluster_instructions(
+    sessions: Iterable[Any],
+    min_sessions: int = INSTRUCTION_CLUSTER_MIN_SESSIONS,
+) -> list[dict[str, Any]]:
+    """Group near-identical user instructions across sessions with MinHash LSH."""
+    clusters = InstructionClusters()
     for session in sessions:
+        clusters.add(session)
+    return clusters.rows(min_sessions)
+
+
+class GapAnalysis:
+    """Coverage gaps, repeated patterns and misfit agents, accumulated one session row at a time."""
+
+    def __init__(self) -> None:
+        self.missing_coverage: dict[str, dict[str, Any]] = {}
+        self.repeated_patterns: dict[str, dict[str, Any]] = {}
+        self.agent_totals: defaultdict[str, set[str]] = defaultdict(set)
+        self.agent_negative: defaultdict[str, set[str]] = defaultdict(set)
+        self.instructions = InstructionClusters()
+
+    def add(self, session: Any) -> None:
         if not isinstance(session, dict):
-            continue
+            return
         session_id = session_id_for(session)
         agent_counts = entity_rows(session, "agent_dispatches", "count")
         negative_total = negative_signal_total(session)
@@ -907,7 +1870,7 @@ def gap_analysis_for_report(report: dict[str, Any]) -> dict[str, list[dict[str,
 
         if not agent_counts and (negative_total > 0 or turn_count >= 3):
             add_grouped_gap(
-                missing_coverage,
+                self.missing_coverage,
                 coverage_pattern_for(session),
                 session_id,
                 max(negative_total, turn_count, 1),
@@ -919,7 +1882,7 @@ def gap_analysis_for_report(report: dict[str, Any]) -> dict[str, list[dict[str,
             if not session.get("skill_invocations"):
                 repeated_pattern = "반복 지시가 있었지만 스킬 없이 수행된 작업"
             add_grouped_gap(
-                repeated_patterns,
+                self.repeated_patterns,
                 repeated_pattern,
                 session_id,
                 repeated_count,
@@ -927,39 +1890,55 @@ def gap_analysis_for_report(report: dict[str, Any]) -> dict[str, list[dict[str,
             )
 
         for agent, _ in agent_counts:
-            agent_totals[agent].add(session_id)
+            self.agent_totals[agent].add(session_id)
             if negative_total > 0:
-                agent_negative[agent].add(session_id)
+                self.agent_negative[agent].add(session_id)
+        self.instructions.add(session)
+
+    def result(self) -> dict[str, list[dict[str, Any]]]:
+        repeated_patterns = dict(self.repeated_patterns)
+        for row in self.instructions.rows():
+            repeated_patterns.setdefault(row["pattern"], row)
+
+        misfit_agents: list[dict[str, Any]] = []
+        for agent, total_sessions in sorted(self.agent_totals.items()):
+            negative_sessions = sorted(self.agent_negative.get(agent, set()))
+            if not total_sessions or not negative_sessions:
+                continue
+            negative_rate = round(len(negative_sessions) / len(total_sessions), 4)
+            if negative_rate < 0.5:
+                continue
+            misfit_agents.append(
+                {
+                    "agent": agent,
+                    "negative_rate": negative_rate,
+                    "sessions": negative_sessions[:5],
+                    "suggestion_type": "new_specialized_agent",
+                }
+            )
+        misfit_agents.sort(key=lambda row: (-row["negative_rate"], row["agent"]))
 
-    misfit_agents: list[dict[str, Any]] = []
-    for agent, total_sessions in sorted(agent_totals.items()):
-        negative_sessions = sorted(agent_negative.get(agent, set()))
-        if not total_sessions or not negative_sessions:
-            continue
-        negative_rate = round(len(negative_sessions) / len(total_sessions), 4)
-        if negative_rate < 0.5:
-            continue
-        misfit_agents.append(
-            {
-                "agent": agent,
-                "negative_rate": negative_rate,
-                "sessions": negative_sessions[:5],
-                "suggestion_type": "new_specialized_agent",
-            }
-        )
-    misfit_agents.sort(key=lambda row: (-row["negative_rate"], row["agent"]))
+        return {
+            "missing_coverage": sorted(
+                self.missing_coverage.values(),
+                key=lambda row: (-row["frequency"], row["pattern"]),
+            )[:10],
+            "repeated_patterns": sorted(
+                repeated_patterns.values(),
+                key=lambda row: (-row["frequency"], row["pattern"]),
+            )[:10],
+            "misfit_agents": misfit_agents[:10],
+        }
 
-    return {
-        "missing_coverage": sorted(
-            missing_coverage.values(),
-            key=lambda row: (-row["frequency"], row["pattern"]),
-        )[:10],
-        "repeated_patterns": sorted(
-            repeated_patterns.values(),
-            key=lambda row: (-row["frequency"], row["pattern"]),
-        )[:10],
-        "misfit_agents": misfit_agents[:10],
-    }
+
+def gap_analysis_for_report(report: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    sessions = report.get("signals", {}).get("by_session", [])
+    if not isinstance(sessions, list):
+        sessions = []
+    gaps = GapAnalysis()
+    for session in sessions:
+        gaps.add(session)
+    return gaps.result()
 
 
 def entity_to_json(score: EntityScore) -> dict[str, Any]:
@@ -982,6 +1961,7 @@ def entity_to_json(score: EntityScore) -> dict[str, Any]:
         ],
         "commit_adoption_rate": score.commit_adoption_rate,
         "evidence_sessions": score.evidence_sessions,
+        **({"history": score.history} if score.history is not None else {}),
     }
 
 
@@ -991,12 +1971,29 @@ def build_output(
     baseline_data: dict[str, Any],
     baseline_status: dict[str, Any],
     scores: list[EntityScore],
+    samples_built: int = 0,
+    time_budget: float | None = None,
+    state: ScoreState | None = None,
+    gap_analysis: dict[str, list[dict[str, Any]]] | None = None,
 ) -> dict[str, Any]:
     agents = [entity_to_json(score) for score in scores if score.entity_type == "agent"]
     skills = [entity_to_json(score) for score in scores if score.entity_type == "skill"]
     orchestration = [entity_to_json(score) for score in scores if score.entity_type == "orchestration"]
     improvements = improvements_from_scores(scores)
-    gap_analysis = gap_analysis_for_report(report)
+    if gap_analysis is None:
+        gap_analysis = gap_analysis_for_report(report)
+    degradations = []
+    if score_counters["commit_adoption_skipped"]:
+        skipped = score_counters["commit_adoption_skipped"]
+        degradations.append(
+            {
+                "stage": "score",
+                "kind": "commit_adoption_skipped",
+                "detail": f"scoring time budget ran out; commit adoption not measured for {skipped} entities",
+                "entities": skipped,
+                "time_budget_seconds": time_budget,
+            }
+        )
     return {
         "schema_version": SCHEMA_VERSION,
         "generated_at": utc_now_iso(),
@@ -1008,6 +2005,7 @@ def build_output(
             "date_range": report.get("date_range"),
         },
         "baseline_status": baseline_status,
+        **({"state_status": state.status()} if state is not None else {}),
         "entities": {
             "agents": agents,
             "skills": skills,
@@ -1020,6 +2018,7 @@ def build_output(
         },
         "improvements": improvements,
         "gap_analysis": gap_analysis,
+        "degradations": degradations,
         "global_suggestions": [
             {
                 "type": "improvement_candidate",
@@ -1035,6 +2034,11 @@ def build_output(
         "diagnostics": {
             "baseline_entities": len(baseline_data.get("entities", {})) if isinstance(baseline_data.get("entities"), dict) else 0,
             "scored_entities": len(scores),
+            "samples_built": samples_built,
+            "git_blame_calls": score_counters["git_blame_calls"],
+            "blame_cache_hits": score_counters["blame_cache_hits"],
+            "plumbing_files": score_counters["plumbing_files"],
+            "commit_adoption_skipped": score_counters["commit_adoption_skipped"],
             "decay_half_life_days": baseline_status["decay_half_life_days"],
             "trend_threshold": baseline_status["trend_threshold"],
         },
@@ -1058,6 +2062,18 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Score HyperAgent performance from Session Analyzer JSON.")
     parser.add_argument("--input", help="Path to analysis-report.json. Omit to read JSON from stdin.")
     parser.add_argument("--report", help="Alias for --input, kept for API-CONTRACT compatibility.")
+    parser.add_argument(
+        "--store",
+        nargs="?",
+        const=DEFAULT_STORE_PATH,
+        help=f"Read session rows from an analyze_sessions.py --store directory instead of a report. Defaults to {DEFAULT_STORE_PATH}.",
+    )
+    parser.add_argument(
+        "--date-range",
+        nargs=2,
+        metavar=("START", "END"),
+        help="With --store, only read partitions for these inclusive ISO days.",
+    )
     parser.add_argument("--registry", default=str(REPO_ROOT / "agent-registry"), help="Agent registry root.")
     parser.add_argument("--skills", default=str(REPO_ROOT / "skills"), help="Skills directory root.")
     parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON path.")
@@ -1065,33 +2081,125 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--baseline-min-sessions", type=int, default=DEFAULT_BASELINE_MIN_SESSIONS)
     parser.add_argument("--decay-half-life-days", type=int, default=DEFAULT_DECAY_HALF_LIFE_DAYS)
     parser.add_argument("--trend-threshold", type=float, default=DEFAULT_TREND_THRESHOLD)
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Stop measuring git-blame commit adoption after SECONDS; scores are still produced.",
+    )
+    parser.add_argument(
+        "--blame-cache",
+        nargs="?",
+        const=DEFAULT_BLAME_CACHE_PATH,
+        help=f"Reuse per-file git blame line counts across runs. Defaults to {DEFAULT_BLAME_CACHE_PATH} when given without PATH.",
+    )
+    parser.add_argument(
+        "--blame-workers",
+        type=int,
+        default=DEFAULT_BLAME_WORKERS,
+        help="Run git blame for N files at a time.",
+    )
+    parser.add_argument(
+        "--state",
+        nargs="?",
+        const=DEFAULT_STATE_PATH,
+        help=(
+            "Keep decayed per-entity score history and fold in each session once, by id. "
+            f"Defaults to {DEFAULT_STATE_PATH} when given without PATH."
+        ),
+    )
+    parser.add_argument(
+        "--adoption-engine",
+        choices=ADOPTION_ENGINES,
+        default="plumbing",
+        help="Count committed lines from HEAD blobs and git diff --numstat (plumbing), or with git blame for every file.",
+    )
     args = parser.parse_args(argv)
     if args.input and args.report:
         parser.error("--input and --report cannot be used together")
+    if args.store and (args.input or args.report):
+        parser.error("--store cannot be combined with --input/--report")
+    if args.date_range and not args.store:
+        parser.error("--date-range requires --store")
+    args.date_range_dates = None
+    if args.date_range:
+        try:
+            args.date_range_dates = (date.fromisoformat(args.date_range[0]), date.fromisoformat(args.date_range[1]))
+        except ValueError as exc:
+            parser.error(f"invalid --date-range: {exc}")
+        if args.date_range_dates[0] > args.date_range_dates[1]:
+            parser.error("--date-range START must be <= END")
     if args.baseline_min_sessions < 1:
         parser.error("--baseline-min-sessions must be >= 1")
     if args.decay_half_life_days < 1:
         parser.error("--decay-half-life-days must be >= 1")
     if args.trend_threshold < 0:
         parser.error("--trend-threshold must be >= 0")
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be > 0")
+    if args.blame_workers < 1:
+        parser.error("--blame-workers must be >= 1")
     return args
 
 
-def run(argv: list[str]) -> int:
-    args = parse_args(argv)
+def score_report(
+    args: argparse.Namespace,
+    report: dict[str, Any] | None = None,
+    report_source: str = "in-process",
+) -> dict[str, Any]:
+    """Score an analysis report and return the score output.
+
+    ``report`` is an already-loaded analysis report, such as one handed over
+    in-process by evolve.py; without it the report comes from ``args`` like
+    on the command line. A given report is not modified.
+    """
+    deadline = time.monotonic() + args.time_budget if args.time_budget else None
     validate_metadata_paths(expand_input_path(args.registry), expand_input_path(args.skills))
-    report, report_source = load_report(args)
+    score_counters.clear()
+    state = ScoreState(expand_input_path(args.state), args.decay_half_life_days) if args.state else None
+    samples = SampleStore()
+    gaps = GapAnalysis()
+
+    def ingest(session: Any) -> None:
+        if state is not None and not state.is_new(session):
+            return
+        add_session_samples(samples, session)
+        gaps.add(session)
+
+    if report is not None:
+        validate_report(report)
+        report = {**report, "signals": dict(report["signals"])}
+    elif args.store:
+        store_root = expand_input_path(args.store)
+        report, report_source = report_from_store(store_root, args.date_range_dates, ingest), f"store:{store_root}"
+    else:
+        # Session rows are scored as they are decoded and never held together.
+        report, report_source = load_report(args, ingest)
     validate_report(report)
+    resolve_store_rows(report, ingest)
+    for session in report["signals"]["by_session"]:
+        ingest(session)
 
-    samples = build_samples(report)
-    timestamps = [sample.timestamp for sample in samples if sample.timestamp is not None]
+    grouped = samples.groups()
+    timestamps = [timestamp for timestamp in samples.session_timestamps if timestamp is not None]
     reference_time = max(timestamps) if timestamps else datetime.now(timezone.utc)
+    if state is not None:
+        state.fold(samples, grouped, reference_time)
     baseline_data, baseline_status = load_or_create_baseline(
         expand_input_path(args.baseline),
         samples,
         args.baseline_min_sessions,
         args.decay_half_life_days,
         args.trend_threshold,
+        grouped,
+        state,
+    )
+    adoption = CommitAdoption(
+        REPO_ROOT,
+        cache_path=expand_input_path(args.blame_cache) if args.blame_cache else None,
+        workers=args.blame_workers,
+        deadline=deadline,
+        engine=args.adoption_engine,
     )
     scores = aggregate_entity_scores(
         samples,
@@ -1099,8 +2207,29 @@ def run(argv: list[str]) -> int:
         reference_time,
         args.decay_half_life_days,
         args.trend_threshold,
+        adoption,
+        grouped,
+        state,
     )
-    output = build_output(report, report_source, baseline_data, baseline_status, scores)
+    adoption.save()
+    if state is not None:
+        state.save()
+    return build_output(
+        report,
+        report_source,
+        baseline_data,
+        baseline_status,
+        scores,
+        len(samples),
+        args.time_budget,
+        state,
+        gaps.result(),
+    )
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    output = score_report(args)
     if args.json:
         print(json.dumps(output, ensure_ascii=False, indent=2, sort_keys=True))
     else:
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
+import os
+import re
+import subprocess
+import sys
 import tempfile
 import tomllib
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from unittest.mock import patch
 
@@ -75,6 +81,12 @@ class HyperAgentTests(RepoTestCase):
             "status": "staged",
         }
 
+    def _weighted_average(self, rows: list[tuple[float, float]]) -> float:
+        total_weight = score.ordered_sum(weight for _, weight in rows)
+        if total_weight <= 0:
+            return 0.0
+        return score.ordered_sum(value * weight for value, weight in rows) / total_weight
+
     def test_hyperagent_policy_matches_nfr_caps(self) -> None:
         policy = tomllib.loads((REPO_ROOT / "policy" / "hyperagent.toml").read_text(encoding="utf-8"))
 
@@ -164,6 +176,374 @@ class HyperAgentTests(RepoTestCase):
         self.assertEqual(analysis.skill_invocations["commit"], 1)
         self.assertEqual(analysis.tool_failures["Bash"], 1)
 
+    def test_analyze_cache_resumes_grown_session_from_offset(self) -> None:
+        rows = [
+            {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:00:00Z", "message": {"content": "fix scripts/a.py"}},
+            {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:01:00Z", "message": {"content": "틀렸어 fix scripts/a.py"}},
+            {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:02:00Z", "message": {"content": "좋아 thanks"}},
+            {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:03:00Z", "message": {"content": "원래대로 되돌려줘"}},
+        ]
+        lines = [json.dumps(row, ensure_ascii=False) + "\n" for row in rows]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_path = Path(tmpdir) / "project" / "session.jsonl"
+            self._write_text(session_path, "".join(lines[:2]))
+            cache = analyze_sessions.AnalysisCache(Path(tmpdir) / "cache.json")
+            analyze_sessions.collect_session_state(session_path, "claude", cache)
+            cache.save()
+
+            with session_path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(lines[2:]))
+            resumed_cache = analyze_sessions.AnalysisCache(Path(tmpdir) / "cache.json")
+            state, skipped, _ = analyze_sessions.collect_session_state(session_path, "claude", resumed_cache)
+            cached = analyze_sessions.finalize_session(state, session_path)
+            analyze_sessions.collect_session_state(session_path, "claude", resumed_cache)
+
+            messages, _ = analyze_sessions.parse_jsonl(session_path)
+            full = analyze_sessions.analyze_session(session_path, messages)
+
+        self.assertEqual(skipped, 0)
+        self.assertEqual((resumed_cache.resumed, resumed_cache.hits, resumed_cache.misses), (1, 1, 0))
+        self.assertEqual(cached, full)
+
+    def test_analyze_workers_match_serial_results(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jobs = []
+            for index in range(4):
+                session_path = Path(tmpdir) / "project" / f"session-{index}.jsonl"
+                rows = [
+                    {"type": "user", "sessionId": f"s{index}", "timestamp": f"2026-04-1{index}T00:00:00Z", "message": {"content": "왜 자꾸 에러 나"}},
+                    {"type": "user", "sessionId": f"s{index}", "timestamp": f"2026-04-1{index}T00:01:00Z", "message": {"content": "좋아"}},
+                ]
+                body = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n"
+                self._write_text(session_path, body if index != 2 else body + "{broken\n")
+                jobs.append((session_path, "claude"))
+            jobs.append((Path(tmpdir) / "project" / "empty.jsonl", "claude"))
+            self._write_text(jobs[-1][0], "")
+
+            serial = list(analyze_sessions.iter_session_file_analyses(jobs, workers=1))
+            parallel = list(analyze_sessions.iter_session_file_analyses(jobs, workers=2))
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([skipped for _, skipped in parallel], [0, 0, 1, 0, 0])
+        self.assertIsNone(parallel[-1][0])
+
+    def test_analyze_stream_mode_reorders_within_window(self) -> None:
+        texts = ["fix scripts/a.py", "feature/x 브랜치로 가자", "틀렸어 fix scripts/a.py", "좋아 thanks", "원래대로 되돌려줘", "다시 해줘"]
+        rows = [
+            {
+                "type": "user",
+                "sessionId": "s1",
+                "timestamp": f"2026-04-13T00:0{index}:00Z",
+                "gitBranch": "main" if index % 2 else "feature/x",
+                "message": {"content": text},
+            }
+            for index, text in enumerate(texts)
+        ]
+        shuffled = [rows[1], rows[2], rows[0], rows[4], rows[5], rows[3]]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_path = Path(tmpdir) / "project" / "session.jsonl"
+            self._write_text(session_path, "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in shuffled))
+            sorted_state, _, _ = analyze_sessions.collect_session_state(session_path, "claude")
+            streamed_state, _, _ = analyze_sessions.collect_session_state(session_path, "claude", reorder_window=2)
+            arrival_state, _, _ = analyze_sessions.collect_session_state(session_path, "claude", reorder_window=1)
+
+        self.assertEqual(streamed_state, sorted_state)
+        self.assertNotEqual(arrival_state.branch_switches, sorted_state.branch_switches)
+
+    def test_codex_prescreen_only_drops_rows_normalization_ignores(self) -> None:
+        ignorable = [
+            b'{"timestamp":"2026-04-13T00:00:00Z","type":"event_msg","payload":{"type":"token_count","info":null}}',
+            b'{"timestamp": "2026-04-13T00:00:00Z", "type": "response_item", "payload": {"type": "reasoning", "summary": []}}',
+        ]
+        decoded = [
+            b'{"timestamp":"2026-04-13T00:00:00Z","type":"session_meta","payload":{"id":"c1"}}',
+            b'{"timestamp":"2026-04-13T00:00:00Z","type":"response_item","payload":{"type":"message","role":"user"}}',
+            b'{"timestamp":"2026-04-13T00:00:00Z","type":"event_msg","payload":{"type":"token_count"',
+            b'{"type":"event_msg","timestamp":"2026-04-13T00:00:00Z"}',
+        ]
+        for line in ignorable:
+            self.assertTrue(analyze_sessions.codex_row_is_ignorable(line), line)
+        for line in decoded:
+            self.assertFalse(analyze_sessions.codex_row_is_ignorable(line), line)
+
+    def test_repeat_window_catches_instructions_repeated_turns_later(self) -> None:
+        texts = [
+            "rename the parser module to scripts/parser.py",
+            "what does the lint job check?",
+            "also update the changelog entry",
+            "rename the parser module to scripts/parser.py please",
+        ]
+        messages = [
+            analyze_sessions.StructuredMessage(
+                uuid=str(index), parent_uuid=None, timestamp=None, session_id="s", msg_type="user", content_text=text
+            )
+            for index, text in enumerate(texts)
+        ]
+        state = analyze_sessions.fold_messages(analyze_sessions.SessionState(), messages)
+        restored = analyze_sessions.state_from_json(analyze_sessions.state_to_json(state))
+
+        self.assertEqual(restored, state)
+        self.assertEqual({size: state.repeated_instructions(size) for size in (1, 2, 3)}, {1: 0, 2: 0, 3: 1})
+
+    def test_session_index_applies_the_query_repeat_window(self) -> None:
+        texts = [
+            "rename the parser module to scripts/parser.py",
+            "what does the lint job check?",
+            "also update the changelog entry",
+            "rename the parser module to scripts/parser.py please",
+        ]
+        rows = [
+            {"type": "user", "sessionId": "s1", "timestamp": f"2026-04-10T00:0{index}:00Z", "message": {"content": text}}
+            for index, text in enumerate(texts)
+        ]
+        previous = analyze_sessions.repeat_window
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claude = Path(tmpdir) / "claude"
+            self._write_text(claude / "projects" / "-repo-a" / "s1.jsonl", "".join(json.dumps(row) + "\n" for row in rows))
+            index_path = Path(tmpdir) / "index.sqlite"
+            argv = ["--date-range", "2026-04-10", "2026-04-10", "--min-turns", "0"]
+            counts = {}
+            try:
+                with patch.dict(os.environ, {"CLAUDE_HOME": str(claude), "CODEX_HOME": str(Path(tmpdir) / "codex")}):
+                    analyze_sessions.run_ingest(["--index", str(index_path), "--repeat-window", "1", "--json"])
+                    for window in ("1", "3"):
+                        for extra in ([], ["--index", str(index_path)]):
+                            args = analyze_sessions.parse_args([*argv, "--repeat-window", window, *extra])
+                            report = analyze_sessions.build_analysis_report(args)
+                            counts[(window, bool(extra))] = report["signals"]["by_session"][0]["repeated_instructions"]
+            finally:
+                analyze_sessions.set_repeat_window(previous)
+
+        self.assertEqual(counts, {("1", False): 0, ("1", True): 0, ("3", False): 1, ("3", True): 1})
+
+    def test_json_backends_decode_rows_identically(self) -> None:
+        previous = analyze_sessions.json_backend
+        rows = [b'{"value": NaN, "big": 123456789012345678901234567890}', '{"text": "한글"}'.encode("utf-8")]
+        try:
+            analyze_sessions.set_json_backend("json")
+            expected = [repr(analyze_sessions.decode_row(row)) for row in rows]
+            if analyze_sessions.orjson is not None:
+                analyze_sessions.set_json_backend("orjson")
+                self.assertEqual([repr(analyze_sessions.decode_row(row)) for row in rows], expected)
+            with self.assertRaises(ValueError):
+                analyze_sessions.decode_row(b'{"broken"')
+        finally:
+            analyze_sessions.set_json_backend(previous)
+
+    def test_tool_results_keep_only_classification(self) -> None:
+        log = "scripts/hyperagent/score.py: " + "x" * 10_000 + "\nlib/late.py: Permission denied"
+        content = [
+            {"type": "tool_result", "tool_use_id": "t1", "content": log},
+            {"type": "tool_result", "tool_use_id": "t2", "content": "ok", "is_error": True},
+            {"type": "tool_result", "tool_use_id": "t3", "content": "x" * 10_000},
+        ]
+        results = analyze_sessions.parse_tool_results(content)
+        message = analyze_sessions.normalize_message(
+            {"type": "user", "sessionId": "s1", "message": {"content": [*content, {"type": "text", "text": "see below"}]}}
+        )
+        state = analyze_sessions.fold_messages(analyze_sessions.SessionState(), [message])
+
+        self.assertEqual([result.error_pattern for result in results], [r"(?i)permission denied", "is_error", None])
+        self.assertEqual(results[0].paths, frozenset({"scripts/hyperagent/score.py"}))
+        self.assertEqual(results[2], analyze_sessions.ToolResult(tool_use_id="t3", is_error=False))
+        self.assertEqual(message.content_text, "see below")
+        self.assertEqual(state.files_touched, {"scripts/hyperagent/score.py"})
+
+    def test_extract_call_paths_prefers_path_keys_and_skips_bodies(self) -> None:
+        write = {"file_path": "/repo/src/app.py", "content": "see docs/guide.md and lib/util.py"}
+        patch = {"raw": "*** Begin Patch\n*** Update File: src/a.py\n@@\n-from lib/old.py\n*** Add File: src/b.py\n*** End Patch"}
+        command = {"command": "pytest tests/test_x.py " + "x" * 100 + " tests/test_late.py"}
+
+        self.assertEqual(analyze_sessions.extract_call_paths(write), {"/repo/src/app.py"})
+        self.assertEqual(analyze_sessions.extract_call_paths(patch), {"src/a.py", "src/b.py"})
+        self.assertEqual(analyze_sessions.extract_call_paths(command, budget=64), {"tests/test_x.py"})
+        self.assertEqual(
+            analyze_sessions.extract_file_paths("edit scripts/hyperagent/score.py and /Users/me/app.py"),
+            {"scripts/hyperagent/score.py", "/Users/me/app.py"},
+        )
+
+    def test_session_index_ingests_incrementally_and_answers_queries(self) -> None:
+        def row(day: str, minute: int, text: str) -> str:
+            payload = {"type": "user", "sessionId": f"s-{day}", "timestamp": f"{day}T00:0{minute}:00Z", "message": {"content": text}}
+            return json.dumps(payload, ensure_ascii=False) + "\n"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claude = Path(tmpdir) / "claude"
+            first = claude / "projects" / "-repo-a" / "first.jsonl"
+            second = claude / "projects" / "-repo-b" / "second.jsonl"
+            self._write_text(first, row("2026-04-10", 0, "fix scripts/a.py") + row("2026-04-10", 1, "틀렸어"))
+            self._write_text(second, row("2026-04-12", 0, "좋아"))
+
+            with patch.dict(os.environ, {"CLAUDE_HOME": str(claude), "CODEX_HOME": str(Path(tmpdir) / "codex")}):
+                index = analyze_sessions.SessionIndex(Path(tmpdir) / "index.sqlite")
+                initial = analyze_sessions.ingest_sessions(index, analyze_sessions.discover_all_session_files())
+                with first.open("a", encoding="utf-8") as handle:
+                    handle.write(row("2026-04-10", 2, "다시 해줘"))
+                second.unlink()
+                refreshed = analyze_sessions.ingest_sessions(index, analyze_sessions.discover_all_session_files())
+                start, end = datetime(2026, 4, 10).date(), datetime(2026, 4, 12).date()
+                queried = [analysis for analysis, _ in index.query(start, end, "-repo-a")]
+                index.close()
+            messages, _ = analyze_sessions.parse_jsonl(first)
+            expected = analyze_sessions.analyze_session(first, messages)
+
+        self.assertEqual((initial["updated"], initial["indexed"]), (2, 2))
+        self.assertEqual((refreshed["resumed"], refreshed["removed"], refreshed["indexed"]), (1, 1, 1))
+        self.assertEqual(queried, [expected])
+
+    def test_session_index_queries_refuse_stale_index_without_wiping_it(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claude = Path(tmpdir) / "claude"
+            payload = {"type": "user", "sessionId": "s1", "timestamp": "2026-04-10T00:00:00Z", "message": {"content": "fix a.py"}}
+            self._write_text(claude / "projects" / "-repo-a" / "s1.jsonl", json.dumps(payload) + "\n")
+            index_path = Path(tmpdir) / "index.sqlite"
+            argv = ["--date-range", "2026-04-10", "2026-04-10", "--min-turns", "0", "--index", str(index_path)]
+            with patch.dict(os.environ, {"CLAUDE_HOME": str(claude), "CODEX_HOME": str(Path(tmpdir) / "codex")}):
+                with self.assertRaises(SystemExit) as missing, patch("sys.stderr"):
+                    analyze_sessions.build_analysis_report(analyze_sessions.parse_args(argv))
+                self.assertFalse(index_path.exists())
+                index = analyze_sessions.SessionIndex(index_path)
+                analyze_sessions.ingest_sessions(index, analyze_sessions.discover_all_session_files())
+                index.close()
+                with patch.object(analyze_sessions, "analysis_signature", return_value="other"):
+                    with self.assertRaises(SystemExit) as stale, patch("sys.stderr"):
+                        analyze_sessions.build_analysis_report(analyze_sessions.parse_args(argv))
+                report = analyze_sessions.build_analysis_report(analyze_sessions.parse_args(argv))
+            for extra in (["--cache"], ["--workers", "2"]):
+                with self.assertRaises(SystemExit), patch("sys.stderr"):
+                    analyze_sessions.parse_args([*argv, *extra])
+
+        self.assertEqual((missing.exception.code, stale.exception.code), (2, 2))
+        self.assertEqual(report["sessions_analyzed"], 1)
+
+    def test_codex_header_index_filters_without_reopening_rollouts(self) -> None:
+        rows = [
+            {"timestamp": "2026-04-13T00:00:00Z", "type": "session_meta", "payload": {"id": "c1", "cwd": "/work/repo-a"}},
+            {
+                "timestamp": "2026-04-13T00:00:01Z",
+                "type": "response_item",
+                "payload": {"type": "message", "role": "user", "content": [{"type": "input_text", "text": "틀렸어"}]},
+            },
+            {"timestamp": "2026-04-13T00:00:02Z", "type": "session_meta", "payload": {"id": "late", "cwd": "/elsewhere"}},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rollout = Path(tmpdir) / "rollout-c1.jsonl"
+            self._write_text(rollout, "".join(json.dumps(row) + "\n" for row in rows))
+            index_path = Path(tmpdir) / "headers.json"
+            headers = analyze_sessions.CodexHeaderIndex(index_path)
+            self.assertTrue(analyze_sessions._codex_match_project(rollout, "repo-a", headers))
+            headers.save()
+
+            reloaded = analyze_sessions.CodexHeaderIndex(index_path)
+            with patch.object(analyze_sessions, "read_codex_header", side_effect=AssertionError("reopened")):
+                self.assertTrue(analyze_sessions._codex_match_project(rollout, "repo-a", reloaded))
+                self.assertFalse(analyze_sessions._codex_match_project(rollout, "repo-b", reloaded))
+            plain = analyze_sessions.analyze_session_file(rollout, "codex")
+            seeded = analyze_sessions.analyze_session_file(rollout, "codex", header=reloaded.cached(rollout))
+
+            # A rollout rewritten under the same path is read again, and the
+            # save after a run keeps only the paths that run consulted.
+            rows[0]["payload"]["cwd"] = "/work/other"
+            self._write_text(rollout, "".join(json.dumps(row) + "\n" for row in rows))
+            rewritten = analyze_sessions.CodexHeaderIndex(index_path)
+            rewritten.entries["/gone/rollout.jsonl"] = dict(rewritten.entries[os.path.abspath(rollout)])
+            self.assertIsNone(rewritten.cached(rollout))
+            self.assertTrue(analyze_sessions._codex_match_project(rollout, "other", rewritten))
+            rewritten.save()
+            saved = json.loads(index_path.read_text(encoding="utf-8"))["entries"]
+
+        self.assertEqual(seeded, plain)
+        self.assertEqual((plain[0].session_id, plain[0].project), ("c1", "repo-a"))
+        self.assertEqual(list(saved), [os.path.abspath(rollout)])
+        self.assertEqual(saved[os.path.abspath(rollout)]["cwd"], "/work/other")
+
+    def test_codex_discovery_prunes_directories_before_listing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            codex = Path(tmpdir) / "codex"
+            day = codex / "sessions" / "2026" / "04" / "13"
+            kept = [
+                day / "rollout-2026-04-13T01-00-00-a.jsonl",
+                codex / "archived_sessions" / "2026-04" / "rollout-2026-04-12T09-00-00-b.jsonl",
+            ]
+            outside = [
+                codex / "sessions" / "2026" / "04" / "15" / "rollout-2026-04-15T01-00-00-c.jsonl",
+                codex / "archived_sessions" / "2026-04" / "rollout-2026-03-30T01-00-00-d.jsonl",
+            ]
+            # Archived dirs cannot hold rollouts newer than their name or mtime, so these are never listed.
+            pruned = [
+                codex / "archived_sessions" / "2025-12" / "rollout-2026-04-13T02-00-00-e.jsonl",
+                codex / "archived_sessions" / "misc" / "rollout-2026-04-13T03-00-00-f.jsonl",
+            ]
+            for path in kept + outside + pruned:
+                self._write_text(path, "")
+            old = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+            os.utime(codex / "archived_sessions" / "misc", (old, old))
+
+            start, end = datetime(2026, 4, 10).date(), datetime(2026, 4, 13).date()
+            with patch.dict(os.environ, {"CODEX_HOME": str(codex)}):
+                found = {
+                    threads: analyze_sessions._codex_active_paths_for_range(start, end, threads)
+                    + analyze_sessions._codex_archived_paths_for_range(start, end, threads)
+                    for threads in (1, 4)
+                }
+
+        self.assertEqual(found[1], kept)
+        self.assertEqual(found[4], kept)
+
+    def test_analyze_date_prefilter_rejects_files_that_cannot_overlap(self) -> None:
+        def row(timestamp: str) -> str:
+            return json.dumps({"type": "user", "sessionId": "s", "timestamp": timestamp, "message": {"content": "hi"}}) + "\n"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = Path(tmpdir) / "claude" / "projects" / "-repo"
+            started_before = project / "before.jsonl"
+            in_range = project / "in-range.jsonl"
+            stale = project / "stale.jsonl"
+            self._write_text(started_before, '{"type": "summary"}\n' + row("2026-04-09T23:00:00Z") + row("2026-04-10T01:00:00Z"))
+            self._write_text(in_range, row("2026-04-10T01:00:00Z"))
+            self._write_text(stale, row("2026-04-10T01:00:00Z"))
+            stale_mtime = datetime(2026, 4, 1, tzinfo=timezone.utc).timestamp()
+            os.utime(stale, (stale_mtime, stale_mtime))
+
+            start = datetime(2026, 4, 10).date()
+            self.assertFalse(analyze_sessions.session_file_may_overlap(started_before, start))
+            self.assertTrue(analyze_sessions.session_file_may_overlap(in_range, start))
+            self.assertFalse(analyze_sessions.session_file_may_overlap(stale, start))
+            with patch.dict(os.environ, {"CLAUDE_HOME": str(Path(tmpdir) / "claude"), "CODEX_HOME": str(Path(tmpdir) / "codex")}):
+                args = analyze_sessions.parse_args(["--date-range", "2026-04-10", "2026-04-10", "--min-turns", "0"])
+                report = analyze_sessions.build_analysis_report(args)
+
+        self.assertEqual((report["diagnostics"]["files_prefiltered"], report["diagnostics"]["files_scanned"]), (2, 1))
+
+    def test_signal_matcher_reports_first_pattern_in_list_order(self) -> None:
+        texts = [
+            "command failed with error code 1",
+            "Permission denied while writing",
+            "REDIRECT DETECTED",
+            "git reset --hard 하고 롤백해줘",
+            "아니 그게 아니라 다시 해줘",
+            "좋아 완벽해",
+            "all checks passed",
+            "",
+            "ok\n" * 200 + "Permission denied",
+        ]
+        pattern_lists = [
+            analyze_sessions.TOOL_ERROR_PATTERNS,
+            analyze_sessions.ROLLBACK_PATTERNS,
+            analyze_sessions.CORRECTION_PATTERNS,
+            analyze_sessions.PRAISE_PATTERNS,
+        ]
+        for patterns in pattern_lists:
+            matcher = analyze_sessions.signal_matcher(tuple(patterns))
+            for text in texts:
+                expected = next((pattern for pattern in patterns if re.search(pattern, text)), None)
+                self.assertEqual(matcher.search(text), expected, (patterns[0], text))
+                self.assertEqual(matcher.matches(text), expected is not None)
+
+        self.assertEqual(analyze_sessions.TOOL_ERROR_MATCHER.search("failed: error"), r"(?i)error")
+
     def test_analyze_report_aggregates_entity_breakdowns(self) -> None:
         analysis = analyze_sessions.SessionAnalysis(
             session_id="s1",
@@ -193,6 +573,66 @@ class HyperAgentTests(RepoTestCase):
         self.assertEqual(aggregated["top_agents_by_dispatch"][0]["agent"], "verification-worker")
         self.assertEqual(aggregated["by_skill"][0]["correction_rate"], 0.5)
 
+    def test_signal_store_round_trips_partitions_into_score(self) -> None:
+        def analysis(session_id: str, day: str, corrections: int) -> analyze_sessions.SessionAnalysis:
+            state = analyze_sessions.SessionState(
+                message_count=1,
+                session_id=session_id,
+                first_ts=datetime.fromisoformat(f"{day}T00:00:00+00:00"),
+                turn_count=3,
+                user_corrections=corrections,
+            )
+            return analyze_sessions.finalize_session(state, Path("project") / f"{session_id}.jsonl")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "signals"
+            earlier = [analysis("a", "2026-04-10", 1), analysis("b", "2026-04-11", 0), analysis("c", "2026-04-10", 0)]
+            analyze_sessions.write_signal_store(root, earlier)
+            partitions = analyze_sessions.write_signal_store(root, [analysis("a", "2026-04-10", 2)])
+            pointer = {"path": str(root), "partitions": partitions, "sessions": 1, "session_ids": ["a"]}
+            report = analyze_sessions.build_report([], 0, None, pointer)
+            score.validate_report(report)
+            score.resolve_store_rows(report)
+            unfiltered = analyze_sessions.build_report([], 0, None, {key: value for key, value in pointer.items() if key != "session_ids"})
+            score.resolve_store_rows(unfiltered)
+            ranged = score.report_from_store(root, (datetime(2026, 4, 11).date(), datetime(2026, 4, 11).date()))
+            streamed: list[dict[str, object]] = []
+            merged = score.report_from_store(root, None, streamed.append)
+            pointed: list[dict[str, object]] = []
+            pointer_report = analyze_sessions.build_report([], 0, None, pointer)
+            score.resolve_store_rows(pointer_report, pointed.append)
+
+        self.assertEqual(partitions, ["2026-04-10/project.jsonl"])
+        self.assertEqual([(row["session_id"], row["user_corrections"]) for row in report["signals"]["by_session"]], [("a", 2)])
+        self.assertEqual([row["session_id"] for row in unfiltered["signals"]["by_session"]], ["a", "c"])
+        self.assertEqual([row["session_id"] for row in ranged["signals"]["by_session"]], ["b"])
+        self.assertEqual([row["session_id"] for row in streamed], ["a", "c", "b"])
+        self.assertEqual((merged["sessions_analyzed"], merged["signals"]["by_session"]), (3, []))
+        self.assertEqual((pointed, pointer_report["signals"]["by_session"]), (report["signals"]["by_session"], []))
+
+    def test_signal_store_moves_a_session_that_changes_partition(self) -> None:
+        def analysis(session_id: str, day: str | None) -> analyze_sessions.SessionAnalysis:
+            state = analyze_sessions.SessionState(
+                message_count=1,
+                session_id=session_id,
+                first_ts=datetime.fromisoformat(f"{day}T00:00:00+00:00") if day else None,
+                turn_count=3,
+            )
+            return analyze_sessions.finalize_session(state, Path("project") / f"{session_id}.jsonl")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "signals"
+            analyze_sessions.write_signal_store(root, [analysis("x", None), analysis("y", None)])
+            (root / analyze_sessions.STORE_SESSION_INDEX).unlink()
+            analyze_sessions.write_signal_store(root, [analysis("x", "2026-04-10")])
+            rows = score.report_from_store(root, None)["signals"]["by_session"]
+            undated = analyze_sessions.read_store_partition(root / "undated" / "project.jsonl")
+            index = json.loads((root / analyze_sessions.STORE_SESSION_INDEX).read_text(encoding="utf-8"))
+
+        self.assertEqual([row["session_id"] for row in rows], ["y", "x"])
+        self.assertEqual([row["session_id"] for row in undated], ["y"])
+        self.assertEqual(index, {"x": "2026-04-10/project.jsonl", "y": "undated/project.jsonl"})
+
     def test_score_builds_samples_for_skill_agent_and_orchestration(self) -> None:
         report = self._sample_analysis_report()
         samples = score.build_samples(report)
@@ -202,6 +642,66 @@ class HyperAgentTests(RepoTestCase):
         self.assertIn(("agent", "verification-worker"), sample_keys)
         self.assertIn(("orchestration", "global"), sample_keys)
 
+    def test_sample_store_shares_session_data_across_entity_samples(self) -> None:
+        report = self._sample_analysis_report()
+        report["signals"]["by_session"].append({"session_id": "s-idle", "files_touched": ["idle.py"]})
+        samples = score.build_samples(report)
+        rows = list(samples)
+
+        self.assertEqual(len(rows), len(samples))
+        self.assertNotIn("s-idle", samples.session_ids)
+        self.assertEqual(len(samples.session_files), len({row.session_id for row in rows}))
+        for session_id in samples.session_ids:
+            files = [row.touched_files for row in rows if row.session_id == session_id]
+            self.assertTrue(all(item is files[0] for item in files))
+        for key, indices in samples.groups().items():
+            self.assertEqual({score.entity_key(rows[index].entity_type, rows[index].entity_id) for index in indices}, {key})
+
+        copied = score.SampleStore()
+        for row in rows:
+            copied.append(row)
+        reference = datetime(2026, 4, 13, tzinfo=timezone.utc)
+        self.assertEqual(
+            score.aggregate_entity_scores(samples, {"entities": {}}, reference, 7, 0.15),
+            score.aggregate_entity_scores(copied, {"entities": {}}, reference, 7, 0.15),
+        )
+
+    def test_score_clusters_instructions_repeated_across_sessions(self) -> None:
+        variants = [
+            "always run ruff and the unit tests before you commit scripts/hyperagent changes",
+            "always run ruff and the unit tests before you commit scripts/hyperagent edits",
+            "please always run ruff and the unit tests before you commit scripts/hyperagent changes",
+        ]
+        report = self._sample_analysis_report()
+        sessions = report["signals"]["by_session"]
+        for index, text in enumerate(variants):
+            state = analyze_sessions.fold_messages(
+                analyze_sessions.SessionState(),
+                [
+                    analyze_sessions.StructuredMessage(
+                        uuid=str(index),
+                        parent_uuid=None,
+                        timestamp=None,
+                        session_id=f"s{index}",
+                        msg_type="user",
+                        content_text=text,
+                    )
+                ],
+            )
+            analysis = analyze_sessions.finalize_session(state, Path(f"s{index}.jsonl"))
+            assert analysis is not None
+            sessions.append(analyze_sessions.session_to_json(analysis))
+        sessions[-1]["instructions"].append({"signature": "not-hex", "count": 1, "text": "ignored"})
+
+        clusters = score.cluster_instructions(sessions)
+        gaps = score.gap_analysis_for_report(report)["repeated_patterns"]
+
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual((clusters[0]["sessions"], clusters[0]["frequency"]), (["s0", "s1", "s2"], 3))
+        self.assertEqual(len(clusters[0]["examples"]), 3)
+        self.assertIn(clusters[0], gaps)
+        self.assertEqual(score.cluster_instructions(sessions, min_sessions=4), [])
+
     def test_score_generates_improvement_for_weak_entity(self) -> None:
         report = self._sample_analysis_report()
         samples = score.build_samples(report)
@@ -219,6 +719,49 @@ class HyperAgentTests(RepoTestCase):
         self.assertIn(improvements[0]["entity_type"], {"agent", "skill", "orchestration"})
         self.assertIn("evidence_sessions", improvements[0])
 
+    def test_dimension_averages_match_per_dimension_weighted_average(self) -> None:
+        samples = score.build_samples(self._sample_analysis_report())
+        partial = samples.sample(0)
+        samples.append(
+            score.SessionSample(
+                entity_type=partial.entity_type,
+                entity_id=partial.entity_id,
+                session_id="s-partial",
+                timestamp=None,
+                count=3,
+                turn_count=0,
+                complexity_score=0.0,
+                negative_factor=1.0,
+                dimensions={next(iter(partial.dimensions)): 0.25},
+                composite=0.25,
+                negative_total=0.0,
+            )
+        )
+        reference = datetime(2026, 4, 13, tzinfo=timezone.utc)
+        grouped = {key: [samples.sample(index) for index in indices] for key, indices in samples.groups().items()}
+        expected = {
+            key: {
+                name: self._weighted_average(
+                    [
+                        (
+                            sample.dimensions.get(name, 0.0),
+                            score.session_weight(sample.turn_count) * score.decay_weight(sample.timestamp, reference, 7) * max(sample.count, 1),
+                        )
+                        for sample in entity_samples
+                    ]
+                )
+                for name in sorted({name for sample in entity_samples for name in sample.dimensions})
+            }
+            for key, entity_samples in grouped.items()
+        }
+
+        self.assertEqual(list(grouped), sorted(grouped))
+        with patch.object(score, "numpy", None):
+            self.assertEqual(score.dimension_averages(samples, reference, 7), expected)
+        if score.numpy is not None:
+            self.assertEqual(score.dimension_averages(samples, reference, 7), expected)
+        self.assertEqual(score.ordered_sum([1e16, 1.0, -1e16]), 0.0)
+
     def test_score_creates_baseline_after_minimum_sessions(self) -> None:
         report = self._sample_analysis_report()
         sessions = report["signals"]["by_session"]
@@ -242,6 +785,102 @@ class HyperAgentTests(RepoTestCase):
             self.assertTrue(status["created"])
             self.assertIn("skill:commit", data["entities"])
 
+    def test_score_state_folds_only_new_sessions_and_matches_full_history(self) -> None:
+        report = self._sample_analysis_report()
+        base = report["signals"]["by_session"]
+        sessions = [
+            {**base[index % len(base)], "session_id": f"s-{day}-{index}", "timestamp": f"2026-04-{day:02d}T0{index}:00:00Z"}
+            for day in (1, 2, 3)
+            for index in range(4)
+        ]
+
+        def entities(output: dict[str, object]) -> dict[str, tuple[object, ...]]:
+            return {
+                row["entity_id"]: (row["score"], row["dimensions"], row["sessions"], row["invocations"])
+                for kind in ("agents", "skills", "orchestration")
+                for row in output["scores"][kind]
+            }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+
+            def run(rows: list[dict[str, object]], *extra: str) -> dict[str, object]:
+                args = score.parse_args(["--baseline", str(root / "baseline.json"), "--baseline-min-sessions", "100", *extra])
+                return score.score_report(args, {**report, "signals": {**report["signals"], "by_session": rows}})
+
+            full = run(sessions)
+            state_args = ("--state", str(root / "state.json"))
+            for day in ("01", "02", "03"):
+                incremental = run([row for row in sessions if row["timestamp"].startswith(f"2026-04-{day}")], *state_args)
+            repeated = run(sessions, *state_args)
+            late = [
+                {**sessions[0], "session_id": "s-late"},
+                {**sessions[-1], "turn_count": sessions[-1]["turn_count"] + 2},
+                {**sessions[1], "session_id": "s-undated", "timestamp": None},
+                {**sessions[2], "session_id": "s-ancient", "timestamp": "2026-02-01T00:00:00Z"},
+            ]
+            stragglers = run(late, *state_args)
+            saved = json.loads((root / "state.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(entities(incremental), entities(full))
+        self.assertEqual(incremental["state_status"]["sessions_folded"], 4)
+        self.assertEqual(incremental["state_status"]["watermark"], "2026-04-03T03:00:00Z")
+        self.assertEqual(incremental["state_status"]["horizon"], "2026-03-04T03:00:00Z")
+        history = incremental["scores"]["skills"][0]["history"]
+        self.assertEqual(history["sessions"], full["scores"]["skills"][0]["sessions"])
+        self.assertEqual(set(history["composite_quantiles"]), {"p10", "p50", "p90"})
+        self.assertEqual((repeated["state_status"]["sessions_folded"], repeated["state_status"]["sessions_skipped"]), (0, 12))
+        self.assertEqual(repeated["state_status"]["skipped_by_reason"], {"already_folded": 12})
+        self.assertEqual(entities(repeated), {})
+        self.assertEqual(stragglers["state_status"]["sessions_folded"], 1)
+        self.assertEqual(stragglers["state_status"]["skipped_by_reason"], {"expired": 1, "grown": 1, "no_timestamp": 1})
+        self.assertEqual(saved["sessions"]["s-late"], ["2026-04-01T00:00:00Z", 4])
+        self.assertEqual(len(saved["sessions"]), 13)
+        self.assertNotIn("state_status", full)
+
+    def test_score_streams_report_rows_and_matches_loaded_report(self) -> None:
+        report = self._sample_analysis_report()
+        report["signals"]["by_session"].extend(
+            {**row, "session_id": f"{row['session_id']}-{index}", "repeated_instructions": index}
+            for index in range(3)
+            for row in self._sample_analysis_report()["signals"]["by_session"]
+        )
+
+        def comparable(output: dict[str, object]) -> dict[str, object]:
+            return {key: value for key, value in output.items() if key not in {"generated_at", "report_source"}}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            report_path = root / "analysis-report.json"
+            report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+            argv = ["--baseline", str(root / "baseline.json"), "--baseline-min-sessions", "100"]
+            loaded = score.score_report(score.parse_args(argv), json.loads(report_path.read_text(encoding="utf-8")))
+            (root / "baseline.json").unlink()
+            rows: list[object] = []
+            with patch.object(score, "JSONStreamReader", partial(score.JSONStreamReader, chunk_size=7)):
+                streamed = score.score_report(score.parse_args([*argv, "--input", str(report_path)]))
+                header, _ = score.load_report(score.parse_args(["--input", str(report_path)]), rows.append)
+                collected, _ = score.load_report(score.parse_args(["--input", str(report_path)]))
+            score_path = root / "score-report.json"
+            score_path.write_text(json.dumps(streamed), encoding="utf-8")
+            score_report, _ = generate_variant.load_score_report(str(score_path))
+
+        self.assertEqual(comparable(streamed), comparable(loaded))
+        self.assertEqual(rows, report["signals"]["by_session"])
+        self.assertEqual(header["signals"], {"aggregated": report["signals"]["aggregated"], "by_session": []})
+        self.assertEqual(collected, report)
+        self.assertEqual(set(score_report), {"schema_version", "improvements", "gap_analysis"})
+        self.assertEqual(score_report["gap_analysis"], streamed["gap_analysis"])
+
+    def test_json_stream_reader_rejoins_numbers_split_across_chunks(self) -> None:
+        document = '{"x": 0.25, "y": [1e-3, -12, 3.5E+2], "z": true}'
+        for chunk_size in range(1, len(document) + 1):
+            reader = score.JSONStreamReader(io.StringIO(document), chunk_size=chunk_size)
+            decoded = {key: list(reader.items()) if key == "y" else reader.value() for key in reader.members()}
+            reader.end()
+            self.assertEqual(decoded, json.loads(document), chunk_size)
+        self.assertIs(score.JSONStreamReader, generate_variant.JSONStreamReader)
+
     def test_generate_variant_writes_payload_and_meta(self) -> None:
         improvement = generate_variant.Improvement(
             entity_type="agent",
@@ -389,6 +1028,239 @@ class HyperAgentTests(RepoTestCase):
         with self.assertRaises(evolve.PipelineError):
             evolve.parse_json_output("score", "[]")
 
+    def test_evolve_in_process_steps_match_subprocess_steps(self) -> None:
+        row = {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:00:00Z", "message": {"content": "fix scripts/a.py"}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session = Path(tmpdir) / "project" / "session.jsonl"
+            self._write_text(session, json.dumps(row) + "\n")
+            script = "scripts/hyperagent/analyze_sessions.py"
+            command = [sys.executable, script, "--sessions", str(session), "--json", "--min-turns", "0"]
+            _, expected = evolve.run_json_step("analyze", command)
+            step, analysis = evolve.run_inprocess_step("analyze", command)
+
+            baseline = str(Path(tmpdir) / "baseline.json")
+            score_command = [sys.executable, "scripts/hyperagent/score.py", "--json", "--baseline", baseline]
+            with self.assertRaises(evolve.PipelineError) as failure:
+                evolve.run_inprocess_step("score", score_command, input_json={"schema_version": "1", "signals": []})
+
+        expected.pop("generated_at")
+        analysis.pop("generated_at")
+        self.assertEqual(analysis, expected)
+        self.assertTrue(step["in_process"])
+        self.assertEqual(step["output_summary"]["sessions_analyzed"], 1)
+        self.assertEqual(failure.exception.step["returncode"], 1)
+        self.assertIn("signals", failure.exception.step["error"])
+
+    def test_evolve_resume_reuses_checkpoints_until_sessions_change(self) -> None:
+        rows = [
+            {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:00:00Z", "message": {"content": "fix scripts/a.py"}},
+            {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:01:00Z", "message": {"content": "틀렸어 다시 해줘"}},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            session = root / "claude" / "projects" / "-repo" / "s1.jsonl"
+            self._write_text(session, "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+            env = {"HOME": str(root / "home"), "CLAUDE_HOME": str(root / "claude"), "CODEX_HOME": str(root / "codex")}
+            argv = ["--dry-run", "--in-process", "--date-range", "2026-04-13", "2026-04-13", "--min-turns", "0"]
+            argv += ["--checkpoint-dir", str(root / "checkpoints")]
+            with patch.dict(os.environ, env):
+                with patch.object(analyze_sessions, "analysis_inputs_fingerprint", side_effect=AssertionError("digested")):
+                    plain = evolve.run_pipeline(evolve.parse_args(argv))
+                self.assertFalse((root / "checkpoints").exists())
+                self.assertFalse((root / "claude" / "hyperagent").exists())
+                first = evolve.run_pipeline(evolve.parse_args([*argv, "--resume"]))
+                with patch.object(analyze_sessions, "build_analysis_report", side_effect=AssertionError("re-analyzed")):
+                    resumed = evolve.run_pipeline(evolve.parse_args([*argv, "--resume"]))
+                with patch.object(evolve, "repo_head", return_value="0" * 40):
+                    moved = evolve.run_pipeline(evolve.parse_args([*argv, "--resume"]))
+                with patch.object(evolve, "worktree_fingerprint", return_value="0" * 64):
+                    edited = evolve.run_pipeline(evolve.parse_args([*argv, "--resume"]))
+                baseline = root / "claude" / "hyperagent" / "baseline.json"
+                self._write_text(baseline, "{}")
+                digests = [evolve.score_input_digest(first["outputs"]["analysis"], evolve.DEFAULT_BASELINE_PATH)]
+                self._write_text(baseline, '{"scores": {}}')
+                digests.append(evolve.score_input_digest(first["outputs"]["analysis"], evolve.DEFAULT_BASELINE_PATH))
+                baseline.unlink()
+                with session.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps({**rows[0], "timestamp": "2026-04-13T00:02:00Z"}) + "\n")
+                changed = evolve.run_pipeline(evolve.parse_args([*argv, "--resume"]))
+
+        self.assertEqual(plain["status"], "success")
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(resumed["status"], "success")
+        self.assertEqual(resumed["outputs"], first["outputs"])
+        self.assertEqual([step.get("resumed", False) for step in resumed["pipeline_steps"][:3]], [True, True, True])
+        self.assertEqual([step.get("resumed", False) for step in moved["pipeline_steps"][:2]], [True, False])
+        self.assertEqual([step.get("resumed", False) for step in edited["pipeline_steps"][:2]], [True, False])
+        self.assertNotEqual(digests[0], digests[1])
+        self.assertEqual(changed["status"], "success")
+        self.assertNotIn("resumed", changed["pipeline_steps"][0])
+        aggregated = [run["outputs"]["analysis"]["signals"]["aggregated"] for run in (first, changed)]
+        self.assertNotEqual(aggregated[0], aggregated[1])
+
+    def test_benchmark_subcommands_run_at_tiny_sizes(self) -> None:
+        script = REPO_ROOT / "scripts" / "hyperagent" / "benchmark.py"
+        tiny = {
+            "signal-matcher": ["--messages", "50"],
+            "scaling": ["--sizes", "40"],
+            "stream": ["--rows", "50", "--output-bytes", "64"],
+            "json-backend": ["--rows", "50", "--output-bytes", "64"],
+            "repeats": ["--messages", "50", "--windows", "1", "5"],
+            "discovery": ["--files", "20", "--threads", "1", "2"],
+            "blame": ["--sessions", "3", "--workers", "1"],
+            "adoption": ["--files", "2", "--lines", "20", "--commits", "1", "--workers", "1"],
+            "aggregate": ["--samples", "200", "--entities", "3"],
+            "samples": ["--sessions", "50"],
+            "report-stream": ["--sessions", "20"],
+            "evolve": ["--sessions", "2", "--turns", "2"],
+        }
+        usage = subprocess.run([sys.executable, str(script), "--help"], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(set(re.search(r"\{([\w,-]+)\}", usage).group(1).split(",")), set(tiny))
+        for name, argv in tiny.items():
+            result = subprocess.run(
+                [sys.executable, str(script), "--repeat", "1", "--json", name, *argv], capture_output=True, text=True
+            )
+            # run() exits 1 when a benchmark's results_match is false.
+            self.assertEqual(result.returncode, 0, f"{name}: {result.stderr[-2000:]}")
+
+    def test_evolve_steps_record_metrics_and_append_log(self) -> None:
+        row = {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:00:00Z", "message": {"content": "fix scripts/a.py"}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session = Path(tmpdir) / "project" / "session.jsonl"
+            self._write_text(session, json.dumps(row) + "\n" + json.dumps(row) + "\n")
+            script = "scripts/hyperagent/analyze_sessions.py"
+            command = [sys.executable, script, "--sessions", str(session), "--json", "--min-turns", "0"]
+            step, _ = evolve.run_json_step("analyze", command)
+            inprocess_step, _ = evolve.run_inprocess_step("analyze", command)
+
+            log_path = Path(tmpdir) / "metrics.jsonl"
+            result = {
+                "started_at": "2026-04-13T00:00:00Z",
+                "finished_at": "2026-04-13T00:00:01Z",
+                "status": "success",
+                "dry_run": True,
+                "in_process": False,
+                "resume": False,
+                "date_range": {"start": "2026-04-13", "end": "2026-04-13"},
+                "project": None,
+                "degradations": [],
+                "pipeline_steps": [step],
+            }
+            evolve.append_metrics_log(log_path, result)
+            evolve.append_metrics_log(log_path, result)
+            records = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+
+        metrics = step["metrics"]
+        self.assertGreater(metrics["wall_seconds"], 0)
+        self.assertGreater(metrics["peak_rss_bytes"], 0)
+        self.assertEqual(metrics["input_bytes"], 0)
+        self.assertGreater(metrics["output_bytes"], 0)
+        self.assertEqual(metrics["counters"]["files_scanned"], 1)
+        self.assertEqual(metrics["counters"]["rows_parsed"], 2)
+        self.assertEqual(inprocess_step["metrics"]["counters"], metrics["counters"])
+        self.assertIsNone(inprocess_step["metrics"]["output_bytes"])
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["steps"][0]["metrics"], metrics)
+
+    def test_evolve_cycle_budget_times_out_and_degrades_stages(self) -> None:
+        self.assertEqual(evolve.policy_cycle_timeout(), 600)
+        with self.assertRaises(evolve.PipelineError) as failure:
+            evolve.run_json_step("analyze", [sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.2)
+        self.assertTrue(failure.exception.step["timed_out"])
+        self.assertIn("timed out", failure.exception.step["error"])
+
+        skipped = score.compute_commit_adoption_rate("commit", {"README.md"}, REPO_ROOT, deadline=0.0)
+        self.assertFalse(skipped["available"])
+        self.assertIn("time budget", skipped["reason"])
+
+        row = {"type": "user", "sessionId": "s1", "timestamp": "2026-04-13T00:00:00Z", "message": {"content": "fix scripts/a.py"}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session = Path(tmpdir) / "project" / "session.jsonl"
+            self._write_text(session, json.dumps(row) + "\n")
+            args = analyze_sessions.parse_args(["--sessions", str(session), "--min-turns", "0", "--time-budget", "1e-9"])
+            report = analyze_sessions.build_analysis_report(args)
+
+            argv = ["--dry-run", "--timeout", "0.5", "--date-range", "2026-04-13", "2026-04-13"]
+            argv += ["--checkpoint-dir", str(Path(tmpdir) / "checkpoints")]
+            result = evolve.run_pipeline(evolve.parse_args(argv))
+
+        self.assertEqual(report["sessions_analyzed"], 0)
+        self.assertEqual(report["degradations"][0]["kind"], "session_cap")
+        self.assertEqual(report["degradations"][0]["files_total"], 1)
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual([step["status"] for step in result["pipeline_steps"]], ["skipped"] * 5)
+        self.assertEqual(result["degradations"][0]["kind"], "stage_skipped")
+        self.assertEqual(result["degradations"][0]["stages"], list(evolve.STAGE_BUDGET_SHARES))
+
+    def test_commit_adoption_blames_each_file_once_and_reuses_cache(self) -> None:
+        entity_files = {
+            "commit": {"README.md", "CONTRIBUTING.md"},
+            "review": {"README.md", str(REPO_ROOT / "CONTRIBUTING.md"), "does/not/exist.md"},
+        }
+        expected = {
+            entity_id: score.compute_commit_adoption_rate(entity_id, files, REPO_ROOT)
+            for entity_id, files in entity_files.items()
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "blame-cache.json"
+            score.score_counters.clear()
+            adoption = score.CommitAdoption(REPO_ROOT, cache_path, workers=2, engine="blame")
+            adoption.prepare(path for files in entity_files.values() for path in files)
+            rates = {entity_id: adoption.rate(entity_id, files) for entity_id, files in entity_files.items()}
+            adoption.save()
+            self.assertEqual(rates, expected)
+            self.assertEqual(score.score_counters["git_blame_calls"], 2)
+            self.assertTrue(cache_path.exists())
+
+            score.score_counters.clear()
+            cached = score.CommitAdoption(REPO_ROOT, cache_path)
+            rates = {entity_id: cached.rate(entity_id, files) for entity_id, files in entity_files.items()}
+            self.assertEqual(rates, expected)
+            self.assertEqual(score.score_counters["git_blame_calls"], 0)
+            self.assertEqual(score.score_counters["blame_cache_hits"], 2)
+
+    def test_commit_adoption_plumbing_engine_matches_blame(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            env = {
+                **os.environ,
+                "GIT_AUTHOR_NAME": "Three Word Name",
+                "GIT_AUTHOR_EMAIL": "dev@example.invalid",
+                "GIT_COMMITTER_NAME": "Three Word Name",
+                "GIT_COMMITTER_EMAIL": "dev@example.invalid",
+            }
+
+            def git(*args: str) -> None:
+                subprocess.run(["git", *args], cwd=repo, env=env, check=True, capture_output=True)
+
+            git("init", "-q")
+            self._write_text(repo / "edited.py", "".join(f"line {index}\n" for index in range(10)))
+            self._write_text(repo / "clean.py", "a\nb\nc")
+            self._write_text(repo / "has space.md", "one\ntwo\n")
+            git("add", "-A")
+            git("commit", "-q", "-m", "initial")
+            self._write_text(repo / "edited.py", "line 0\nchanged\n" + "".join(f"line {index}\n" for index in range(5, 10)) + "extra\n")
+            self._write_text(repo / "has space.md", "one\n")
+            self._write_text(repo / "staged.py", "new\n")
+            git("add", "staged.py")
+            self._write_text(repo / "untracked.py", "scratch\n")
+            files = {"edited.py", "clean.py", "has space.md", "staged.py", "untracked.py"}
+
+            blame = score.CommitAdoption(repo, engine="blame")
+            blame.prepare(files)
+            score.score_counters.clear()
+            plumbing = score.CommitAdoption(repo)
+            plumbing.prepare(files)
+
+            self.assertEqual(plumbing.counts, blame.counts)
+            self.assertEqual(plumbing.counts["edited.py"], (6, 8))
+            self.assertEqual(plumbing.counts["clean.py"], (3, 3))
+            self.assertEqual(plumbing.counts["has space.md"], (1, 1))
+            self.assertEqual(plumbing.counts["staged.py"], (0, 1))
+            self.assertIsNone(plumbing.counts["untracked.py"])
+            self.assertEqual(score.score_counters["plumbing_files"], 3)
+            self.assertEqual(score.score_counters["git_blame_calls"], 2)
+
     def test_validate_workflow_contracts_checks_hyperagent_surface_when_present(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             repo_root = Path(tmpdir)